@@ -105,7 +105,6 @@ compute error metrics for the cross validation results::
 
 # site packages
 import numpy as np
-from scipy.spatial import cKDTree
 from scipy.stats import linregress
 
 # wradlib modules
@@ -176,6 +175,10 @@ class AdjustBase(ipol.IpolBase):
 
     """
 
+    # the adjustment at a target only depends on the interpolated error fields
+    # and can thus be computed for all locations of xvalidate at once
+    _vectorized_xvalidate = True
+
     def __init__(self, obs_coords, raw_coords,
                  nnear_raws=9, stat='median', mingages=5, minval=0.,
                  mfb_args=None, Ipclass=ipol.Idw, **ipargs):
@@ -239,7 +242,8 @@ class AdjustBase(ipol.IpolBase):
             These are the indices of observation points with valid
             observation-radar pairs
         targets : array of floats of shape (number of target points, 2)
-            Target coordinates for the interpolation
+            Target coordinates for the interpolation, or an instance of
+            wradlib.ipol.IpolBase which is returned as is
 
         Returns
         -------
@@ -252,6 +256,9 @@ class AdjustBase(ipol.IpolBase):
         if targets is None:
             targets = self.raw_coords
             targets_default = True
+        elif isinstance(targets, ipol.IpolBase):
+            # interpolator passed from self.xvalidate
+            return targets
         # second, compute inverse distance neighbours
         if (not len(ix) == len(self.obs_coords)) or (not targets_default):
             return self.Ipclass(self.obs_coords[ix], targets, **self.ipargs)
@@ -275,7 +282,8 @@ class AdjustBase(ipol.IpolBase):
             Array of floats. Coordinate pairs for locations on which the final
             adjustment product is interpolated
             Defaults to None. In this case, the output locations will be
-            identical to the radar coordinates
+            identical to the radar coordinates. May also be an interpolator
+            instance which is used as is (from AdjustBase.xvalidate)
         rawatobs : (INTERNAL - DO NOT USE)
             Array of floats. For internal use from AdjustBase.xvalidate only
             (defaults to None)
@@ -305,6 +313,62 @@ class AdjustBase(ipol.IpolBase):
                             util._idvalid(rawatobs, minval=self.minval))
         return rawatobs, ix
 
+    def batch(self, obs, raw, out=None, chunksize=None):
+        """Returns the *raw* fields of a series of time steps, adjusted by the
+        corresponding *obs*.
+
+        Time steps with the same set of valid observation-radar pairs share
+        one instance of the interpolator and are adjusted at once, with the
+        time steps processed along the trailing dimension of the
+        ``__call__`` method.
+
+        .. versionadded:: 0.11.0
+
+        Parameters
+        ----------
+        obs : array of floats with shape (num time steps, num gauges)
+            gage observations of each time step
+        raw : array of floats with shape (num time steps, num radar cells)
+            raw (unadjusted) radar rainfall values of each time step
+        out : array of floats with shape (num time steps, num radar cells)
+            Defaults to None. Array for the adjusted values, e.g. a
+            :class:`numpy:numpy.memmap`
+        chunksize : integer
+            Defaults to None. Maximum number of time steps with the same
+            valid observation-radar pairs which are adjusted at once. If
+            given, the interpolator is created for each chunk.
+
+        Returns
+        -------
+        output : array of adjusted radar values with shape
+            (num time steps, num radar cells)
+
+        """
+        obs = np.asanyarray(obs)
+        raw = np.asanyarray(raw)
+        if out is None:
+            out = np.empty(raw.shape)
+        # radar values at gage locations for all time steps
+        if self.stat == 'best' or self.nnear_raws == 1:
+            rawatobs = np.array([self.get_raw_at_obs(r, o)
+                                 for r, o in zip(raw, obs)])
+        else:
+            rawatobs = self.get_raw_at_obs(raw.T, obs.T).T
+        # check where both gage and radar observations are valid
+        valid = (util._isvalid(obs, minval=self.minval) &
+                 util._isvalid(rawatobs, minval=self.minval))
+        patterns, inverse = np.unique(valid, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        for i, pattern in enumerate(patterns):
+            ix = np.flatnonzero(pattern)
+            times = np.flatnonzero(inverse == i)
+            step = len(times) if chunksize is None else chunksize
+            for start in range(0, len(times), step):
+                t = times[start:start + step]
+                out[t] = self.__call__(obs[t].T, raw[t].T,
+                                       rawatobs=rawatobs[t].T, ix=ix).T
+        return out
+
     def xvalidate(self, obs, raw):
         """Leave-One-Out Cross Validation, applicable to all gage adjustment
         classes.
@@ -343,7 +407,17 @@ class AdjustBase(ipol.IpolBase):
         if len(ix) <= (self.mingages - 1):
             # not enough gages for cross validation: return empty arrays
             return obs, estatobs
-        # Now iterate over valid pairs
+        # Leave-one-out interpolator which estimates the values at all valid
+        # observation locations from the respective other locations at once
+        ip = None
+        if self._vectorized_xvalidate and len(ix) > self.mingages:
+            ip = ipol._leave_one_out(self.Ipclass, self.obs_coords[ix],
+                                     **self.ipargs)
+        if ip is not None:
+            estatobs[ix] = self.__call__(obs, raws_directly_at_obs[ix], ip,
+                                         rawatobs, ix)
+            return obs, estatobs
+        # Otherwise iterate over valid pairs
         for i in ix:
             # Pass all valid pairs except ONE which you pass as target
             ix_adjust = np.setdiff1d(ix, [i])
@@ -391,7 +465,7 @@ class AdjustAdd(AdjustBase):
 
         """
         # ----------------GENERIC PART FOR MOST __call__ methods---------------
-        if None in [ix, rawatobs]:
+        if ix is None or rawatobs is None:
             # Check for valid observation-radar pairs in case this method has
             # not been called from self.xvalidate
             rawatobs, ix = self._get_valid_pairs(obs, raw)
@@ -448,7 +522,7 @@ class AdjustMultiply(AdjustBase):
 
         """
         # ----------------GENERIC PART FOR MOST __call__ methods---------------
-        if None in [ix, rawatobs]:
+        if ix is None or rawatobs is None:
             # Check for valid observation-radar pairs in case this method has
             # not been called from self.xvalidate
             rawatobs, ix = self._get_valid_pairs(obs, raw)
@@ -528,7 +602,7 @@ class AdjustMixed(AdjustBase):
 
         """
         # ----------------GENERIC PART FOR MOST __call__ methods---------------
-        if None in [ix, rawatobs]:
+        if ix is None or rawatobs is None:
             # Check for valid observation-radar pairs in case this method has
             # not been called from self.xvalidate
             rawatobs, ix = self._get_valid_pairs(obs, raw)
@@ -574,6 +648,8 @@ class AdjustMFB(AdjustBase):
     output : array of adjusted radar values
 
     """
+    # the correction factor depends on all valid gages
+    _vectorized_xvalidate = False
 
     def __call__(self, obs, raw, targets=None, rawatobs=None, ix=None):
         """Returns an array of *raw* values that are adjusted by *obs*.
@@ -584,7 +660,7 @@ class AdjustMFB(AdjustBase):
 
         """
         # ----------------GENERIC PART FOR MOST __call__ methods---------------
-        if None in [ix, rawatobs]:
+        if ix is None or rawatobs is None:
             # Check for valid observation-radar pairs in case this method has
             # not been called from self.xvalidate
             rawatobs, ix = self._get_valid_pairs(obs, raw)
@@ -595,11 +671,22 @@ class AdjustMFB(AdjustBase):
         # ip = self._checkip(ix, targets)
 
         # -----------------THIS IS THE ACTUAL ADJUSTMENT APPROACH--------------
+        if np.ndim(raw) > 1:
+            # time steps along the trailing dimension (from self.batch)
+            corrfact = np.array([self._get_corrfact(o, r) for o, r in
+                                 zip(obs[ix].T, rawatobs[ix].T)])
+            return corrfact * raw
+        return self._get_corrfact(obs[ix], rawatobs.ravel()[ix]) * raw
+
+    def _get_corrfact(self, obs, rawatobs):
+        """INTERNAL: Returns the mean field bias correction factor of valid
+        pairs of observation and radar values
+        """
         # compute ratios for each valid observation point
-        ratios = np.ma.masked_invalid(obs[ix] / rawatobs.ravel()[ix])
+        ratios = np.ma.masked_invalid(obs / rawatobs)
         if len(np.where(np.logical_not(ratios.mask))[0]) < self.mingages:
             # Not enough valid pairs of raw and obs
-            return raw
+            return 1.
         if self.mfb_args["method"] == "mean":
             corrfact = np.mean(ratios)
         elif self.mfb_args["method"] == "median":
@@ -607,8 +694,8 @@ class AdjustMFB(AdjustBase):
         elif self.mfb_args["method"] == "linregr":
             corrfact = 1.
             ix_ = np.where(np.logical_not(ratios.mask))[0]
-            x = obs[ix][ix_]
-            y = rawatobs[ix][ix_]
+            x = obs[ix_]
+            y = rawatobs[ix_]
             # check whether we should adjust or not
             try:
                 slope, intercept, r, p, stderr = linregress(x, y)
@@ -627,7 +714,7 @@ class AdjustMFB(AdjustBase):
                     pass
         if type(corrfact) == np.ma.core.MaskedConstant:
             corrfact = 1.
-        return corrfact * raw
+        return corrfact
 
 
 class AdjustNone(AdjustBase):
@@ -661,7 +748,7 @@ class AdjustNone(AdjustBase):
 
         """
         # ----------------GENERIC PART FOR MOST __call__ methods---------------
-        if None in [ix, rawatobs]:
+        if ix is None or rawatobs is None:
             # Check for valid observation-radar pairs in case this method has
             # not been called from self.xvalidate
             rawatobs, ix = self._get_valid_pairs(obs, raw)
@@ -709,7 +796,7 @@ class GageOnly(AdjustBase):
 
         """
         # ----------------GENERIC PART FOR MOST __call__ methods---------------
-        if None in [ix, rawatobs]:
+        if ix is None or rawatobs is None:
             # Check for valid observation-radar pairs in case this method has
             # not been called from self.xvalidate
             rawatobs, ix = self._get_valid_pairs(obs, raw)
@@ -744,7 +831,8 @@ class Raw_at_obs():
 
     def __init__(self, obs_coords, raw_coords, nnear=9, stat='median'):
         self.statfunc = _get_statfunc(stat)
-        self.raw_ix = _get_neighbours_ix(obs_coords, raw_coords, nnear)
+        self.raw_ix = _get_neighbours_ix(obs_coords, raw_coords, nnear,
+                                         owner=self)
 
     def __call__(self, raw, obs=None):
         """
@@ -768,7 +856,7 @@ class Raw_at_obs():
             return raw_neighbs
 
 
-def _get_neighbours_ix(obs_coords, raw_coords, nnear):
+def _get_neighbours_ix(obs_coords, raw_coords, nnear, owner=None):
     """
     Returns <nnear> neighbour indices per <obs_coords> coordinate pair
 
@@ -780,12 +868,15 @@ def _get_neighbours_ix(obs_coords, raw_coords, nnear):
         from these coordinate pairs the neighbours are selected
     nnear : integer
         number of neighbours to be selected per coordinate pair of obs_coords
+    owner : object
+        keeps the tree of raw_coords in :data:`wradlib.util.tree_registry`
+        as long as owner is alive
 
     """
-    # plant a tree
-    tree = cKDTree(raw_coords)
+    # get a (shared) tree
+    tree = util.get_tree(raw_coords, owner=owner)
     # return nearest neighbour indices
-    return tree.query(obs_coords, k=nnear)[1]
+    return util.query_tree(tree, obs_coords, k=nnear)[1]
 
 
 def _get_neighbours(obs_coords, raw_coords, raw, nnear):
@@ -805,9 +896,9 @@ def _get_neighbours(obs_coords, raw_coords, raw, nnear):
 
     """
     # plant a tree
-    tree = cKDTree(raw_coords)
+    tree = util.get_tree(raw_coords)
     # retrieve nearest neighbour indices
-    ix = tree.query(obs_coords, k=nnear)[1]
+    ix = util.query_tree(tree, obs_coords, k=nnear)[1]
     # return the values of the nearest neighbours
     return raw[ix]
 
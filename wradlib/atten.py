@@ -17,12 +17,14 @@ Attenuation Correction
     constraint_dBZ
     constraint_pia
     correctAttenuationConstrained2
+    correctAttenuationVolume
     correctRadomeAttenuationEmpirical
     pia_from_kdp
 
 """
 
 import logging
+import multiprocessing
 import numpy as np
 import scipy.ndimage
 import scipy.interpolate
@@ -43,7 +45,7 @@ class AttenuationIterationError(Exception):
 
 def correctAttenuationHB(gateset, coefficients=dict(a=1.67e-4, b=0.7, l=1.0),
                          mode='except',
-                         thrs=59.0):
+                         thrs=59.0, engine='loop'):
     """Gate-by-Gate attenuation correction according to
     :cite:`Hitschfeld1954`
 
@@ -79,6 +81,12 @@ def correctAttenuationHB(gateset, coefficients=dict(a=1.67e-4, b=0.7, l=1.0),
     thrs : float
         threshold, for the sum of attenuation and signal, which is deemed
         unplausible.
+    engine : string
+        'loop' (default) iterates gate by gate, 'analytic' evaluates the
+        closed-form solution of the recursion with a cumulative sum along
+        the range gates, see :func:`calc_attenuation_forward`.
+
+        .. versionadded:: 0.11.0
 
     Returns
     -------
@@ -107,6 +115,24 @@ Hitschfeld-and-Bordan`.
     b = _coefficients['b']
     l = _coefficients['l']
 
+    if engine == 'analytic':
+        pia = _calc_attenuation_analytic(gateset, a, b, l)
+        with np.errstate(invalid='ignore'):
+            overflow = (gateset[..., 1:] + pia[..., 1:]) > thrs
+        if np.any(overflow):
+            if mode == 'warn':
+                logger.warning(
+                    'corrected signal over threshold (%3.1f)' % thrs)
+            elif mode == 'nan':
+                pia[..., 1:][overflow] = np.nan
+            elif mode == 'zero':
+                pia[..., 1:][overflow] = 0.0
+            else:
+                raise AttenuationOverflowError
+        return pia
+    elif engine != 'loop':
+        raise ValueError("Unknown engine '%s'." % engine)
+
     pia = np.empty(gateset.shape)
     pia[..., 0] = 0.
     ksum = 0.
@@ -220,33 +246,15 @@ def correctAttenuationKraemer(gateset, a_max=1.67e-4, a_min=2.33e-5,
         da = (a_max - a_min) / (n - 1)
     else:
         da = 0.
-    pia = np.zeros(gateset.shape)
-    pia[..., 0] = 0.0
-    # indexing all rows of last dimension (radarbeams)
-    beams2correct = np.where(np.max(pia, axis=pia.ndim - 1) > (-1.))
-    # iterate over possible a-parameters
-    for i in range(n):
-        ai = a_max - i * da
-        # subset of beams that have to be corrected and corresponding
-        # attenuations
-        sub_gateset = gateset[beams2correct]
-        sub_pia = pia[beams2correct]
-        for gate in range(gateset.shape[-1] - 1):
-            k = ai * (10.0 ** ((sub_gateset[..., gate] + sub_pia[
-                ..., gate]) / 10.0)) ** b * 2.0 * l
-            sub_pia[..., gate + 1] = sub_pia[..., gate] + k
-        # integration of the calculated attenuation subset to the whole
-        # attenuation matrix
-        pia[beams2correct] = sub_pia
-        # indexing the rows of the last dimension (radarbeam), if any corrected
-        # values exceed the threshold
-        beams2correct = np.where(
-            np.max(gateset + pia, axis=pia.ndim - 1) > thrs_dBZ)
-        # if there is no beam left for correction, the iteration
-        # can be interrupted prematurely
-        if len(pia[beams2correct]) == 0:
-            break
-    if len(pia[beams2correct]) > 0:
+    # all beams are corrected with the first a-parameter, which keeps the
+    # corrected signal below the threshold
+    a = a_max - np.arange(n) * da
+    pia, first = _first_admissible(gateset.reshape((-1, gateset.shape[-1])),
+                                   a, np.repeat(b, n), l,
+                                   [constraint_dBZ], [[thrs_dBZ]])
+    pia = pia.reshape(gateset.shape)
+    beams2correct = (first == n).reshape(gateset.shape[:-1])
+    if np.any(beams2correct):
         if mode == 'warn':
             logger.warning('dB-sum over threshold (%3.1f)' % thrs_dBZ)
         elif mode == 'nan':
@@ -351,39 +359,26 @@ def correctAttenuationHJ(gateset, a_max=1.67e-4, a_min=2.33e-5, b=0.7,
         da = (a_max - a_min) / (n - 1)
     else:
         da = 0.
+    a = a_max - np.arange(n) * da
     # initialize an attenuation array with the same shape as the gateset,
-    # filled with zeros, except that NaNs occuring in the gateset will cause a
-    # initialization with Nans for the ENTIRE corresponding attenuation beam
-    pia = np.where(np.isnan(gateset), np.nan, 0.)
-    pia[np.where(np.isnan(pia))[:-1]] = np.nan
-    # indexing all rows of last dimension (radarbeams)
-    # except rows including NaNs
-    beams2correct = np.where(np.max(pia, axis=-1) > (-1.))
-    # iterate over possible a-parameters
-    for i in range(n):
-        ai = a_max - i * da
-        # subset of beams that have to be corrected
-        # and corresponding attenuations
-        sub_gateset = gateset[beams2correct]
-        sub_pia = pia[beams2correct]
-        for gate in range(gateset.shape[-1] - 1):
-            k = ai * (10.0 ** ((sub_gateset[..., gate] + sub_pia[
-                ..., gate]) / 10.0)) ** b * 2.0 * l
-            sub_pia[..., gate + 1] = sub_pia[..., gate] + k
-        # integration of the calculated attenuation subset
-        # to the whole attenuation matrix
-        pia[beams2correct] = sub_pia
-        # indexing the rows of the last dimension (radarbeam),
-        # if any corrected values exceed the thresholds
-        # of corrected attenuation or PIA or NaNs are occuring
-        beams2correct = np.where(
-            np.logical_or(np.max(gateset + pia, axis=-1) > thrs_dBZ,
-                          np.max(pia, axis=-1) > max_PIA))
-        # if there is no beam left for correction,
-        # the iteration can be interrupted prematurely
-        if len(pia[beams2correct]) == 0:
-            break
-    if len(pia[beams2correct]) > 0:
+    # NaNs occuring in the gateset will cause a initialization with Nans for
+    # the ENTIRE corresponding attenuation beam
+    tmp_gateset = gateset.reshape((-1, gateset.shape[-1]))
+    valid = ~np.any(np.isnan(tmp_gateset), axis=-1)
+    pia = np.full(tmp_gateset.shape, np.nan)
+    beams2correct = np.zeros(valid.shape, dtype=bool)
+    if np.any(valid):
+        # correct the beams with the first a-parameter, which keeps both the
+        # corrected signal and the PIA below their thresholds
+        pia[valid], first = _first_admissible(tmp_gateset[valid], a,
+                                              np.repeat(b, n), l,
+                                              [constraint_dBZ,
+                                               constraint_pia],
+                                              [[thrs_dBZ], [max_PIA]])
+        beams2correct[valid] = first == n
+    pia = pia.reshape(gateset.shape)
+    beams2correct = beams2correct.reshape(gateset.shape[:-1])
+    if np.any(beams2correct):
         if mode == 'warn':
             logger.warning(
                 'threshold exceeded (corrected dBZ or PIA) even for lowest a')
@@ -514,54 +509,26 @@ def correctAttenuationConstrained(gateset, a_max=1.67e-4, a_min=2.33e-5,
     if constr_args is None:
         constr_args = []
 
-    a_used = np.empty(gateset.shape[:-1])
-    b_used = np.empty(gateset.shape[:-1])
-
     if na != 1:
         da = (a_max - a_min) / (na - 1)
     else:
         da = 0.
-    k = np.zeros(gateset.shape)
     if nb != 1:
         db = (b_max - b_min) / (nb - 1)
     else:
         db = 0.
 
-    # indexing all rows of last dimension (radarbeams)
-    beams2correct = np.where(np.max(k, axis=-1) > (-1.))
-    # iterate over possible a-parameters
-    for j in range(nb):
-        bi = b_max - db * j
-        for i in range(na):
-            ai = a_max - da * i
-            # subset of beams that have to be corrected
-            # and corresponding attenuations
-            sub_gateset = gateset[beams2correct]
-            sub_k = k[beams2correct]
-            for gate in range(gateset.shape[-1] - 1):
-                kn = ai * (10.0 ** ((sub_gateset[..., gate] + sub_k[
-                    ..., gate]) / 10.0)) ** bi * 2.0 * l
-                sub_k[..., gate + 1] = sub_k[..., gate] + kn
-            # integration of the calculated attenuation subset
-            # to the whole attenuation matrix
-            k[beams2correct] = sub_k
-            a_used[beams2correct] = ai
-            b_used[beams2correct] = bi
-            # indexing the rows of the last dimension (radarbeam),
-            # if any corrected values exceed the threshold
-            incorrectbeams = np.zeros(gateset.shape[:-1], dtype=np.bool)
-            for constraint, constr_arg in zip(constraints, constr_args):
-                incorrectbeams |= constraint(gateset, k, *constr_arg)
-            beams2correct = np.where(
-                incorrectbeams)
-            # np.where(np.max(gateset + k, axis = k.ndim - 1) > thrs_dBZ)
-            # if there is no beam left for correction,
-            # the iteration can be interrupted prematurely
-            if len(k[beams2correct]) == 0:
-                break
-        if len(k[beams2correct]) == 0:
-            break
-    if len(k[beams2correct]) > 0:
+    # possible parameters, a varies fastest
+    a = np.tile(a_max - da * np.arange(na), nb)
+    b = np.repeat(b_max - db * np.arange(nb), na)
+    k, first = _first_admissible(gateset.reshape((-1, gateset.shape[-1])),
+                                 a, b, l, constraints, constr_args)
+    k = k.reshape(gateset.shape)
+    used = np.minimum(first, na * nb - 1).reshape(gateset.shape[:-1])
+    a_used = a[used]
+    b_used = b[used]
+    beams2correct = (first == na * nb).reshape(gateset.shape[:-1])
+    if np.any(beams2correct):
         if mode == 'warn':
             logger.warning(
                 'correction did not fulfill constraints within given '
@@ -595,41 +562,188 @@ def constraint_pia(gateset, pia, thrs_pia):
     return np.max(pia, axis=-1) > thrs_pia
 
 
+def _first_admissible(gateset, a, b, l, constraints, constraint_args,
+                      chunksize=None):
+    """Forward attenuation with the first admissible k-Z coefficients.
+
+    The candidate coefficients are tried in their given order. Instead of
+    one forward pass per candidate, blocks of doubling size are calculated
+    at once along a new leading axis, for the beams which are still
+    unresolved. The beams are processed in chunks of at most ``chunksize``
+    elements per block.
+
+    Parameters
+    ----------
+    gateset : array
+        Reflectivities [dBZ] of shape (beams, gates).
+    a : array
+        Linear coefficients of the candidates.
+    b : array
+        Exponential coefficients of the candidates.
+    l : float
+        length of a range gate [km].
+    constraints : list
+        List of beam-wise constraint functions.
+    constraint_args : list
+        List of lists of the constraint function arguments.
+
+    Keyword Arguments
+    -----------------
+    chunksize : int
+        Maximum number of elements per block, defaults to 2 ** 22.
+
+    Returns
+    -------
+    pia : array
+        Attenuation [dB] of shape (beams, gates) calculated with the first
+        admissible, or else the last candidate.
+    first : array
+        Index of the first admissible candidate per beam, ``len(a)`` if no
+        candidate is admissible.
+    """
+    if chunksize is None:
+        chunksize = 2 ** 22
+    nbeams, ngates = gateset.shape
+    npar = len(a)
+    pia = np.zeros(gateset.shape)
+    first = np.repeat(npar, nbeams)
+    todo = np.arange(nbeams)
+    start = 0
+    size = 1
+    while start < npar and len(todo):
+        stop = min(start + size, npar)
+        sub_a = np.asarray(a[start:stop])[:, None]
+        sub_b = np.asarray(b[start:stop])[:, None]
+        step = max(1, chunksize // ((stop - start) * ngates))
+        for i in range(0, len(todo), step):
+            ix = todo[i:i + step]
+            sub_gateset = np.broadcast_to(gateset[ix],
+                                          (stop - start,) + (len(ix), ngates))
+            sub_pia = calc_attenuation_forward(sub_gateset, sub_a, sub_b, l)
+            incorrect = np.zeros(sub_pia.shape[:-1], dtype=bool)
+            for constraint, constraint_arg in zip(constraints,
+                                                  constraint_args):
+                incorrect |= constraint(sub_gateset, sub_pia, *constraint_arg)
+            hit = ~np.all(incorrect, axis=0)
+            sel = np.where(hit, np.argmin(incorrect, axis=0), stop - start - 1)
+            pia[ix] = sub_pia[sel, np.arange(len(ix))]
+            first[ix[hit]] = start + sel[hit]
+        todo = todo[first[todo] == npar]
+        start = stop
+        size *= 2
+    return pia, first
+
+
 # -----------------------------------------------------------------------------
 # new implementation of Kraemer algorithm
 # -----------------------------------------------------------------------------
-def calc_attenuation_forward(gateset, a=1.67e-4, b=0.7, l=1.):
+def calc_attenuation_forward(gateset, a=1.67e-4, b=0.7, l=1.,
+                             engine='loop', dtype=None):
     """Gate-by-Gate forward correction as described in
-    :cite:`Kraemer2008`"""
-    pia = np.zeros(gateset.shape)
+    :cite:`Kraemer2008`
+
+    With ``engine='analytic'`` the recursion is replaced by the closed-form
+    solution of :cite:`Hitschfeld1954`
+
+    .. math::
+
+        PIA_n = -\\frac{10}{b} \\log_{10}\\left(1 - \\frac{\\ln 10}{10}
+        \\, b \\sum_{i<n} 2 \\, l \\, a \\, Z_i^{b}\\right)
+
+    which needs a single cumulative sum along the range gates. It is the
+    exact solution for piecewise constant measured reflectivities, whereas
+    the gate-by-gate recursion is its first order approximation. Both agree
+    closely for moderate attenuation, towards the singularity (the
+    argument of the logarithm approaching zero) the analytic solution grows
+    faster. Beyond the singularity the pia is set to inf, NaN gates
+    propagate to the remaining gates of the beam as in the recursion.
+
+    The pia is returned as float64 unless another ``dtype`` is given.
+
+    .. versionadded:: 0.11.0
+       Keywords `engine` and `dtype`.
+    """
+    if engine == 'analytic':
+        return _calc_attenuation_analytic(gateset, a, b, l, dtype=dtype)
+    elif engine != 'loop':
+        raise ValueError("Unknown engine '%s'." % engine)
+    pia = np.zeros(gateset.shape, dtype=dtype)
     for gate in range(gateset.shape[-1] - 1):
         k = a * idecibel(gateset[..., gate] + pia[..., gate]) ** b * 2.0 * l
         pia[..., gate + 1] = pia[..., gate] + k
     return pia
 
 
-def calc_attenuation_backward(gateset, a, b, l, a_ref, tdiff, maxiter):
+def _calc_attenuation_analytic(gateset, a, b, l, dtype=None):
+    """Closed-form solution of the gate-by-gate forward correction.
+
+    ``a`` and ``b`` may be arrays which broadcast against ``gateset``.
+    """
+    gateset = np.asanyarray(gateset, dtype=np.float64)
+    pia = np.zeros(gateset.shape, dtype=dtype)
+    if gateset.shape[-1] < 2:
+        return pia
+    # two-way attenuation of the measured signal, accumulated along the beam,
+    # Z**b evaluated as exp(0.1 * ln(10) * b * dBZ)
+    c = 0.1 * np.log(10.) * b
+    with np.errstate(over='ignore'):
+        k = np.exp(gateset[..., :-1] * c)
+    k *= a * 2.0 * l
+    u = np.cumsum(k, axis=-1, out=k)
+    u *= -c
+    u += 1.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # argument of the logarithm zero or negative: attenuation singularity
+        singular = u <= 0.
+        np.log10(u, out=u)
+        u *= -10. / b
+    u[singular] = np.inf
+    pia[..., 1:] = u
+    return pia
+
+
+def calc_attenuation_backward(gateset, a, b, l, a_ref, tdiff, maxiter,
+                              diagnostics={}):
     """Gate-by-Gate backward correction as described in
-    :cite:`Kraemer2008`"""
+    :cite:`Kraemer2008`
+
+    For each gate the fixed point iteration is carried out for all beams at
+    once, converged beams are dropped from the iteration. The number of
+    iterations per gate and beam is returned in ``diagnostics['iterations']``
+    if this key is present.
+
+    .. versionadded:: 0.11.0
+       Keyword `diagnostics`.
+    """
     k = np.zeros(gateset.shape)
     k[..., -1] = a_ref
-    for gate in range(gateset.shape[-1] - 2, 0, -1):
-        kright = np.zeros(gateset.shape[:-1]) + a_ref / gateset.shape[-1]
-        toprocess = np.ones(gateset.shape[:-1], dtype=np.bool)
+    n_rng = gateset.shape[-1]
+    tmp_gateset = gateset.reshape((-1, n_rng))
+    tmp_k = k.reshape((-1, n_rng))
+    kstart = np.broadcast_to(a_ref / n_rng, gateset.shape[:-1]).ravel()
+    iterations = np.zeros(tmp_k.shape, dtype=int)
+    for gate in range(n_rng - 2, 0, -1):
+        kright = kstart.copy()
+        # indices of the beams which did not yet converge
+        active = np.arange(len(kright))
         for j in range(maxiter):
-            kleft = a * (idecibel(gateset[..., gate][toprocess] +
-                                  k[..., gate + 1][toprocess] -
-                                  kright[toprocess])) ** b * 2.0 * l
-            diff = np.abs(kleft - kright)
-            kright[toprocess] = kleft
-            toprocess[diff < tdiff] = False
-            if ~np.any(toprocess):
+            kleft = a * (idecibel(tmp_gateset[active, gate] +
+                                  tmp_k[active, gate + 1] -
+                                  kright[active])) ** b * 2.0 * l
+            diff = np.abs(kleft - kright[active])
+            kright[active] = kleft
+            iterations[active, gate] += 1
+            active = active[~(diff < tdiff)]
+            if not len(active):
                 break
 
-        if j == maxiter - 1:
+        if len(active):
             raise AttenuationIterationError
 
-        k[..., gate] = k[..., gate + 1] - kright
+        tmp_k[:, gate] = tmp_k[:, gate + 1] - kright
+
+    if 'iterations' in diagnostics:
+        diagnostics['iterations'] = iterations.reshape(gateset.shape)
     # k = np.cumsum(k, axis=-1)
     return k
 
@@ -642,7 +756,9 @@ def bisectReferenceAttenuation(gateset,
                                l=1.0,
                                mode='difference',
                                thrs=0.25,
-                               max_iterations=10):
+                               max_iterations=10,
+                               dtype=np.float64,
+                               diagnostics={}):
     """Find the optimal attenuation coefficients for a gateset to achieve a
     given reference attenuation using a the forward correction algorithm in
     combination with the bisection method.
@@ -697,6 +813,24 @@ def bisectReferenceAttenuation(gateset,
         the k-Z relation will be decreased and the bisection starts again.
 
         Per default set to 10.
+    dtype : numpy dtype
+        Floating point precision of the calculation, np.float32 roughly
+        halves memory and the number of bisection steps.
+
+        Per default set to np.float64.
+
+        .. versionadded:: 0.11.0
+    diagnostics : dictionary
+        Dictionary of variables, which are usually not returned by the
+        function. Currently implemented diagnostics:
+
+            - 'iterations' - number of bisection steps until the bounds of
+              the linear coefficient collapsed, for each beam.
+            - 'hit' - True for beams, which reached the reference pia within
+              the given tolerance.
+            - 'niter' - total number of bisection steps.
+
+        .. versionadded:: 0.11.0
 
     Returns
     -------
@@ -710,42 +844,67 @@ def bisectReferenceAttenuation(gateset,
         Array with the same shape as ``pia_ref`` containing the finally used
         exponential k-Z relation coefficient b for successful pia calculation.
     """
+    if mode not in ['difference', 'ratio']:
+        raise Exception('Unknown mode type ' + mode + '.')
+    # Work on beams along the first dimension.
+    n_rng = gateset.shape[-1]
+    tmp_gateset = gateset.reshape((-1, n_rng)).astype(dtype)
+    tmp_ref = np.asarray(pia_ref, dtype=dtype).reshape(-1)
     # Prepare arrays of initial k-Z relation coefficients for each beam.
-    a_hi = np.repeat(a_max, pia_ref.shape)
-    a_lo = np.repeat(a_min, pia_ref.shape)
-    b = np.repeat(b_start, pia_ref.shape)
-    pia = np.empty_like(gateset)
+    a_hi = np.repeat(a_max, len(tmp_ref)).astype(dtype)
+    a_lo = np.repeat(a_min, len(tmp_ref)).astype(dtype)
+    b = np.repeat(b_start, len(tmp_ref)).astype(dtype)
+    a_mid = np.empty_like(a_hi)
+    pia = np.empty(tmp_gateset.shape, dtype=dtype)
+    iterations = np.zeros(len(tmp_ref), dtype=int)
+    hits = np.zeros(len(tmp_ref), dtype=bool)
+    # Indices of beams, for which the bisection did not converge so far.
+    active = np.arange(len(tmp_ref))
     iteration_count = 0
 
     # Iterate until upper and lower bounds of linear k-Z relation coefficients
     # for pia calculation are the same.
-    while not np.all(a_hi == a_lo):
-        a_mid = (a_hi + a_lo) / 2
-        pia = calc_attenuation_forward(gateset, a_mid, b, l)
+    while len(active):
+        sub_a_mid = (a_hi[active] + a_lo[active]) / 2
+        sub_pia = calc_attenuation_forward(tmp_gateset[active], sub_a_mid,
+                                           b[active], l, dtype=dtype)
+        sub_ref = tmp_ref[active]
         # Find indices where calculated and reference pia match sufficient.
         if mode == 'difference':
-            overshoot = (pia[..., -1] - pia_ref) > thrs
-            undershoot = (pia[..., -1] - pia_ref) < -thrs
-            hit = (np.abs(pia[..., -1] - pia_ref)) < thrs
-        elif mode == 'ratio':
-            overshoot = ((pia[..., -1] - pia_ref) / pia_ref) > thrs
-            undershoot = ((pia[..., -1] - pia_ref) / pia_ref) < -thrs
-            hit = (np.abs(pia[..., -1] - pia_ref) / pia_ref) < thrs
+            overshoot = (sub_pia[..., -1] - sub_ref) > thrs
+            undershoot = (sub_pia[..., -1] - sub_ref) < -thrs
+            hit = (np.abs(sub_pia[..., -1] - sub_ref)) < thrs
         else:
-            raise Exception('Unknown mode type ' + mode + '.')
+            overshoot = ((sub_pia[..., -1] - sub_ref) / sub_ref) > thrs
+            undershoot = ((sub_pia[..., -1] - sub_ref) / sub_ref) < -thrs
+            hit = (np.abs(sub_pia[..., -1] - sub_ref) / sub_ref) < thrs
+        a_mid[active] = sub_a_mid
+        pia[active] = sub_pia
+        hits[active] = hit
         # Define new bounds of linear k-Z relation coefficient for over- and
         # undershooting pia calculations.
-        a_hi[overshoot] = a_mid[overshoot]
-        a_lo[undershoot] = a_mid[undershoot]
-        a_hi[hit] = a_mid[hit]
-        a_lo[hit] = a_mid[hit]
+        a_hi[active[overshoot]] = sub_a_mid[overshoot]
+        a_lo[active[undershoot]] = sub_a_mid[undershoot]
+        a_hi[active[hit]] = sub_a_mid[hit]
+        a_lo[active[hit]] = sub_a_mid[hit]
         iteration_count += 1
+        iterations[active] = iteration_count
+        converged = a_hi[active] == a_lo[active]
         # Change exponential k-Z relation coefficient in case of maximum
         # iterations for linear k-Z relation coefficient are reached.
         if iteration_count > max_iterations:
-            b[overshoot] -= 0.01
-            b[undershoot] += 0.01
-    return pia, a_mid, b
+            b[active[overshoot & ~converged]] -= 0.01
+            b[active[undershoot & ~converged]] += 0.01
+        active = active[~converged]
+
+    if 'iterations' in diagnostics:
+        diagnostics['iterations'] = iterations.reshape(pia_ref.shape)
+    if 'hit' in diagnostics:
+        diagnostics['hit'] = hits.reshape(pia_ref.shape)
+    if 'niter' in diagnostics:
+        diagnostics['niter'] = iteration_count
+    return (pia.reshape(gateset.shape), a_mid.reshape(pia_ref.shape),
+            b.reshape(pia_ref.shape))
 
 
 def _sector_filter(mask, min_sector_size):
@@ -947,16 +1106,6 @@ def correctAttenuationConstrained2(gateset, a_max=1.67e-4, a_min=2.33e-5,
     n_rng = gateset.shape[-1]
     tmp_gateset = gateset.reshape((-1, n_az, n_rng))
 
-    pia = np.zeros_like(tmp_gateset)
-
-    a_used = np.empty(tmp_gateset.shape[:-1])
-    b_used = np.empty(tmp_gateset.shape[:-1])
-
-    # Calculate attenuation forward.
-    # Indexing all rows of last dimension (radarbeams).
-    beams2correct = np.where(np.ones(tmp_gateset.shape[:-1], dtype=np.bool))
-    small_sectors = np.zeros(tmp_gateset.shape[:-1], dtype=np.bool)
-
     if n_a != 1:
         delta_a = (a_max - a_min) / (n_a - 1)
     else:
@@ -966,35 +1115,41 @@ def correctAttenuationConstrained2(gateset, a_max=1.67e-4, a_min=2.33e-5,
     else:
         delta_b = 0.
 
-    # Iterate over possible b-parameters.
-    for j in range(n_b):
-        b = b_max - delta_b * j
-        # Iterate over possible a-parameters.
-        for i in range(n_a):
-            a = a_max - delta_a * i
-            # Generate subset of beams that have to be corrected.
-            sub_gateset = tmp_gateset[beams2correct]
-            sub_pia = calc_attenuation_forward(sub_gateset, a, b, l)
-            pia[beams2correct] = sub_pia
-            a_used[beams2correct] = a
-            b_used[beams2correct] = b
-            # Indexing threshold exceeding beams.
-            incorrectbeams = np.zeros(tmp_gateset.shape[:-1], dtype=np.bool)
-            for constraint, constraint_arg in zip(constraints,
-                                                  constraint_args):
-                incorrectbeams = np.logical_or(incorrectbeams,
-                                               constraint(tmp_gateset, pia,
-                                                          *constraint_arg))
-            # Determine incorrect sectors larger than sector_thr.
-            large_sectors = _sector_filter(incorrectbeams, sector_thr)
-            # Determine incorrect sectors smaller than sector_thr.
-            small_sectors = np.logical_or(small_sectors,
-                                          (incorrectbeams & ~large_sectors))
-            beams2correct = np.where(large_sectors)
-            if len(pia[beams2correct]) == 0:
-                break
-        if len(pia[beams2correct]) == 0:
+    # Possible parameters, a varies fastest.
+    a = np.tile(a_max - delta_a * np.arange(n_a), n_b)
+    b = np.repeat(b_max - delta_b * np.arange(n_b), n_a)
+    n_par = len(a)
+
+    # Calculate attenuation forward for the first admissible parameters of
+    # each beam. Beams only advance to the next parameters while they
+    # breach the constraints, so this determines the constraint breaching
+    # beams for every step of the iteration below.
+    pia, first = _first_admissible(tmp_gateset.reshape((-1, n_rng)), a, b, l,
+                                   constraints, constraint_args)
+    pia = pia.reshape(tmp_gateset.shape)
+    first = first.reshape(tmp_gateset.shape[:-1])
+
+    # Iterate over possible parameters, only large sectors are recalculated.
+    used = np.zeros(tmp_gateset.shape[:-1], dtype=int)
+    beams2correct = np.ones(tmp_gateset.shape[:-1], dtype=bool)
+    small_sectors = np.zeros(tmp_gateset.shape[:-1], dtype=bool)
+    for i in range(n_par):
+        used[beams2correct] = i
+        # Indexing threshold exceeding beams.
+        incorrectbeams = used < first
+        # Determine incorrect sectors larger than sector_thr.
+        large_sectors = _sector_filter(incorrectbeams, sector_thr)
+        # Determine incorrect sectors smaller than sector_thr.
+        small_sectors = np.logical_or(small_sectors,
+                                      (incorrectbeams & ~large_sectors))
+        beams2correct = large_sectors.astype(bool)
+        if not np.any(beams2correct):
             break
+    # Beams stopped before their first admissible parameters are part of
+    # small sectors, which are recalculated below.
+    a_used = a[used]
+    b_used = b[used]
+
     if np.any(small_sectors):
         # Interpolate reference pia of most distant
         # rangebin of invalid sectors.
@@ -1018,6 +1173,120 @@ def correctAttenuationConstrained2(gateset, a_max=1.67e-4, a_min=2.33e-5,
     return pia.reshape(gateset.shape)
 
 
+# shared buffers of the worker processes of correctAttenuationVolume
+_volume = {}
+
+
+def _init_volume_worker(gateset, pia, shape):
+    _volume['gateset'] = np.frombuffer(gateset).reshape(shape)
+    _volume['pia'] = np.frombuffer(pia).reshape(shape)
+
+
+def _correct_volume_piece(args):
+    ix, correct, kwargs = args
+    _volume['pia'][ix] = correct(_volume['gateset'][ix], **kwargs)
+
+
+def correctAttenuationVolume(gateset, correct=correctAttenuationConstrained2,
+                             by='sweep', nsectors=None, processes=None,
+                             **kwargs):
+    """Attenuation correction of a radar volume in parallel processes.
+
+    The volume is split into sweeps or azimuth sectors, which are corrected
+    by ``correct`` in a pool of worker processes. Gateset and pia are kept
+    in shared memory buffers, so the pieces are neither copied to the
+    workers nor back, and each worker only holds the intermediate arrays of
+    its current piece.
+
+    .. versionadded:: 0.11.0
+
+    Parameters
+    ----------
+    gateset : array
+        Reflectivities [dBZ] of shape (..., azimuths, range gates), e.g.
+        (sweeps, azimuths, range gates).
+    correct : function
+        Attenuation correction function, one of
+        :func:`correctAttenuationHB`, :func:`correctAttenuationKraemer`,
+        :func:`correctAttenuationHJ` or
+        :func:`correctAttenuationConstrained2` (default). Must be picklable.
+    by : string
+        'sweep' (default) distributes groups of complete sweeps among the
+        processes. 'sector' splits each
+        sweep into ``nsectors`` azimuth sectors, which is only valid for
+        corrections treating each beam independently.
+        :func:`correctAttenuationConstrained2` needs the complete azimuth
+        circle to determine and interpolate constraint breaching sectors.
+    nsectors : int
+        Number of azimuth sectors per sweep for ``by='sector'``, defaults to
+        the number of processes.
+    processes : int
+        Number of worker processes, defaults to the number of cpus. With
+        ``processes=1`` the volume is corrected at once in the calling
+        process.
+
+    Keyword Arguments
+    -----------------
+    **kwargs :
+        Passed to ``correct``. Diagnostics are not returned from the worker
+        processes.
+
+    Returns
+    -------
+    pia : array
+        Array with the same shape as ``gateset`` containing the calculated
+        path integrated attenuation [dB] for each range gate.
+
+    Examples
+    --------
+    ::
+
+        pia = correctAttenuationVolume(volume, processes=4,
+                                       constraints=[constraint_dBZ,
+                                                    constraint_pia],
+                                       constraint_args=[[59.0], [20.0]])
+    """
+    if by not in ['sweep', 'sector']:
+        raise ValueError("Unknown split '%s'." % by)
+    if by == 'sector' and correct is correctAttenuationConstrained2:
+        raise ValueError("correctAttenuationConstrained2 can only be split "
+                         "by sweep.")
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    if nsectors is None:
+        nsectors = processes
+
+    shape = gateset.shape
+    nsweeps = int(np.prod(shape[:-2]))
+    tmp_shape = (nsweeps,) + shape[-2:]
+    if processes == 1:
+        return correct(gateset, **kwargs)
+    if by == 'sweep':
+        bounds = np.linspace(0, nsweeps, min(processes, nsweeps) + 1)
+        bounds = bounds.astype(int)
+        pieces = [(slice(start, stop),)
+                  for start, stop in zip(bounds[:-1], bounds[1:])]
+    else:
+        bounds = np.linspace(0, shape[-2], min(nsectors, shape[-2]) + 1)
+        bounds = bounds.astype(int)
+        pieces = [(i, slice(start, stop)) for i in range(nsweeps)
+                  for start, stop in zip(bounds[:-1], bounds[1:])]
+    tasks = [(ix, correct, kwargs) for ix in pieces]
+
+    gateset_buffer = multiprocessing.RawArray('d', int(np.prod(shape)))
+    pia_buffer = multiprocessing.RawArray('d', int(np.prod(shape)))
+    np.frombuffer(gateset_buffer).reshape(shape)[:] = gateset
+    pool = multiprocessing.Pool(processes, initializer=_init_volume_worker,
+                                initargs=(gateset_buffer, pia_buffer,
+                                          tmp_shape))
+    try:
+        pool.map(_correct_volume_piece, tasks, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+    return np.frombuffer(pia_buffer).reshape(shape)
+
+
 def correctRadomeAttenuationEmpirical(gateset, frequency=5.64,
                                       hydrophobicity=0.165, n_r=2,
                                       stat=np.mean):
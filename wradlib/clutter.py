@@ -35,7 +35,9 @@ def filter_gabella_a(img, wsize, tr1, cartesian=False, radial=False):
     Parameters
     ----------
     img : array_like
-        radar image to which the filter is to be applied
+        radar image to which the filter is to be applied, the last two
+        dimensions represent the image (e.g. stacked sweeps of shape
+        (..., n azimuth, n range))
     wsize : int
         Size of the window surrounding the central pixel
     tr1 : float
@@ -61,25 +63,83 @@ def filter_gabella_a(img, wsize, tr1, cartesian=False, radial=False):
     See :ref:`notebooks/classify/wradlib_clutter_gabella_example.ipynb`.
 
     """
+    img = np.asanyarray(img)
     nn = wsize // 2
-    count = -np.ones(img.shape, dtype=int)
-    range_shift = range(-nn, nn + 1)
-    azimuth_shift = range(-nn, nn + 1)
-    if radial:
-        azimuth_shift = [0]
-    for sa in azimuth_shift:
-        refa = np.roll(img, sa, axis=0)
-        for sr in range_shift:
-            refr = np.roll(refa, sr, axis=1)
-            count += (img - refr < tr1)
-    count[:, 0:nn] = wsize ** 2
-    count[:, -nn:] = wsize ** 2
+    na = 0 if radial else nn
+    # the window wraps around both axes
+    count = _count_similar(img, tr1, na, nn, wrap_range=True) - 1
+    count[..., 0:nn] = wsize ** 2
+    count[..., -nn:] = wsize ** 2
     if cartesian:
-        count[0:nn, :] = wsize ** 2
-        count[-nn:, :] = wsize ** 2
+        count[..., 0:nn, :] = wsize ** 2
+        count[..., -nn:, :] = wsize ** 2
     return count
 
 
+def _count_similar(img, tr1, na, nr, wrap_range=False):
+    """Counts for each pixel of img (..., n azimuth, n range) the neighbours
+    whose values are by less than tr1 smaller than the central pixel, i.e.
+    ``img[center] - img[neighbour] < tr1``.
+
+    The window of range bin j covers ``2 * na[j] + 1`` azimuths (wrapping
+    around, na must not increase with range) and ``2 * nr + 1`` range bins.
+    Neighbours beyond the first and last range bin are not counted, unless
+    wrap_range is True. Just like for shifted copies of the image, shifts
+    wrapping around an axis more than once count repeatedly.
+    """
+    naz, nbins = img.shape[-2:]
+    na = np.zeros(nbins, dtype=int) + na
+    amax = int(na.max()) if nbins else 0
+    # average number of neighbours of a pixel, an integral image costs
+    # about as much as 16 shifted comparisons
+    nshifts = np.mean(2 * na + 1) * (2 * nr + 1)
+    levels = []
+    if nshifts > 16:
+        levels = np.unique(img[~np.isnan(img)])
+
+    # pad azimuths by wrapping around, range bins by wrapping or with
+    # values which never count
+    pad = [(0, 0)] * (img.ndim - 2)
+    if 0 < len(levels) * 16 < nshifts:
+        # few distinct values (e.g. quantized data): count with an integral
+        # image of the relation for each value of the central pixel
+        def padded(mask):
+            mask = np.pad(mask, pad + [(amax, amax), (0, 0)], mode='wrap')
+            if wrap_range:
+                return np.pad(mask, pad + [(0, 0), (nr, nr)], mode='wrap')
+            return np.pad(mask, pad + [(0, 0), (nr, nr)], mode='constant')
+
+        count = np.zeros(img.shape, dtype=int)
+        satshape = img.shape[:-2] + (naz + 2 * amax + 1, nbins + 2 * nr + 1)
+        for value in levels:
+            center = np.nonzero(img == value)
+            lead, i, j = center[:-2], center[-2] + amax, center[-1]
+            sat = np.zeros(satshape, dtype=np.int32)
+            csum = padded(value - img < tr1).cumsum(axis=-2, dtype=np.int32)
+            csum.cumsum(axis=-1, out=sat[..., 1:, 1:])
+            lo, hi = i - na[j], i + na[j] + 1
+            count[center] = (sat[lead + (hi, j + 2 * nr + 1)] -
+                             sat[lead + (lo, j + 2 * nr + 1)] -
+                             sat[lead + (hi, j)] + sat[lead + (lo, j)])
+        return count
+
+    # otherwise compare with each neighbour, using views of the padded image
+    ref = np.pad(img, pad + [(amax, amax), (0, 0)], mode='wrap')
+    if wrap_range:
+        ref = np.pad(ref, pad + [(0, 0), (nr, nr)], mode='wrap')
+    else:
+        ref = np.pad(ref, pad + [(0, 0), (nr, nr)], mode='constant',
+                     constant_values=np.nan)
+    count = np.zeros(img.shape, dtype=np.int32)
+    for sa in range(-amax, amax + 1):
+        # the window covers this azimuth shift for the first imax range bins
+        imax = np.count_nonzero(na >= abs(sa))
+        for sr in range(-nr, nr + 1):
+            refr = ref[..., amax - sa:amax - sa + naz, nr - sr:nr - sr + imax]
+            count[..., :imax] += img[..., :imax] - refr < tr1
+    return count.astype(int)
+
+
 def filter_gabella_b(img, thrs=0.):
     r"""Second part of the Gabella filter comparing area to circumference of
     contiguous echo regions.
@@ -500,7 +560,8 @@ def filter_window_distance(img, rscale, fsize=1500, tr1=7):
     Parameters
     ----------
     img : array_like
-        2d polar data to which the filter is to be applied
+        polar data of shape (..., n azimuth, n range) to which the filter
+        is to be applied
     rscale : float
         range [m] scale of the polar grid
     fsize : int
@@ -519,41 +580,33 @@ def filter_window_distance(img, rscale, fsize=1500, tr1=7):
     filter_gabella_b : filter using a echo area
 
     """
-    ascale = 2 * np.pi / img.shape[0]
-    count = np.ones(img.shape, dtype=int)
-    similar = np.zeros(img.shape, dtype=float)
-    good = np.ones(img.shape, dtype=float)
+    img = np.asanyarray(img)
+    ascale = 2 * np.pi / img.shape[-2]
     valid = (~np.isnan(img))
     hole = np.sum(~valid) > 0
     nr = int(round(fsize / rscale))
-    range_shift = range(-nr, nr + 1)
-    r = np.arange(img.shape[1]) * rscale + rscale / 2
+    r = np.arange(img.shape[-1]) * rscale + rscale / 2
     adist = r * ascale
     na = np.around(fsize / adist).astype(int)
-    max_na = img.shape[0] / 10
-    sa = 0
-    while sa < max_na:
-        imax = np.where(na >= sa)[0][-1] + 1
-        refa1 = util.roll2d_polar(img, sa, axis=0)
-        refa2 = util.roll2d_polar(img, -sa, axis=0)
-        for sr in range_shift:
-            refr1 = util.roll2d_polar(refa1, sr, axis=1)
-            similar[:, 0: imax] += (img[:, 0: imax] - refr1[:, 0: imax] < tr1)
-            if sa > 0:
-                refr2 = util.roll2d_polar(refa2, sr, axis=1)
-                similar[:, 0: imax] += (img[:, 0: imax] -
-                                        refr2[:, 0: imax] < tr1)
-        count[:, 0:imax] = 2 * sa + 1
-        sa += 1
+    max_na = img.shape[-2] / 10
+    # azimuth half size of the window, limited by max_na
+    na = np.minimum(na, int(np.ceil(max_na)) - 1)
+    # compare in double precision, shifted range bins outside the image
+    # never count
+    similar = _count_similar(img.astype(float), tr1, na, nr).astype(float)
+    count = np.ones(img.shape, dtype=int) * (2 * na + 1)
     similar[~valid] = np.nan
     count[~valid] = -1
-    count[:, nr:-nr] = count[:, nr:-nr] * (2 * nr + 1)
+    count[..., nr:-nr] = count[..., nr:-nr] * (2 * nr + 1)
     for i in range(0, nr):
-        count[:, i] = count[:, i] * (nr + 1 + i)
-        count[:, -i - 1] = count[:, -i - 1] * (nr + 1 + i)
+        count[..., i] = count[..., i] * (nr + 1 + i)
+        count[..., -i - 1] = count[..., -i - 1] * (nr + 1 + i)
     if hole:
-        good = util.filter_window_polar(valid.astype(float),
-                                        fsize, "uniform", rscale)
+        good = np.empty(img.shape)
+        sweeps = valid.reshape((-1,) + img.shape[-2:])
+        for i, sweep in enumerate(sweeps):
+            good.reshape(sweeps.shape)[i] = util.filter_window_polar(
+                sweep.astype(float), fsize, "uniform", rscale)
         count = count * good
         count[count == 0] = 1
     similar -= 1
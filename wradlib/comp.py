@@ -97,6 +97,12 @@ def togrid(src, trg, radius, center, data, interpol, *args, **kwargs):
 
     Keyword Arguments
     -----------------
+    chunksize : int
+        if given, the composite grid points within the radar circle are
+        interpolated in chunks of this size to limit memory usage
+    out : ndarray of float
+        optional output array of shape (len(trg),) + data.shape[1:], e.g. a
+        :class:`numpy:numpy.memmap`, into which the chunks are written
     **kwargs : keyword arguments of Interpolator (see class documentation)
 
     Returns
@@ -110,18 +116,25 @@ def togrid(src, trg, radius, center, data, interpol, *args, **kwargs):
     See :ref:`notebooks/basics/wradlib_workflow.ipynb#Gridding`.
 
     """
+    chunksize = kwargs.pop('chunksize', None)
+    compose_grid = kwargs.pop('out', None)
     # get indices to select the subgrid from the composite grid
     ix = extract_circle(center, radius, trg)
-    # interpolate on subgrid
-    ip = interpol(src, trg[ix], *args, **kwargs)
-    data_on_subgrid = ip(data).reshape((len(ix)))
+    if chunksize is None:
+        chunksize = max(len(ix), 1)
     # create container for entire grid
     composegridshape = [len(trg)]
     composegridshape.extend(data.shape[1:])
-    compose_grid = np.repeat(np.nan, len(trg) *
-                             np.prod(data.shape[1:])).reshape(composegridshape)
-    # push subgrid results into the large grid
-    compose_grid[ix] = data_on_subgrid
+    if compose_grid is None:
+        compose_grid = np.empty(composegridshape)
+    compose_grid[:] = np.nan
+    for start in range(0, len(ix), chunksize):
+        subix = ix[start:start + chunksize]
+        # interpolate on subgrid
+        ip = interpol(src, trg[subix], *args, **kwargs)
+        data_on_subgrid = ip(data).reshape((len(subix),) + data.shape[1:])
+        # push subgrid results into the large grid
+        compose_grid[subix] = data_on_subgrid
     return compose_grid
 
 
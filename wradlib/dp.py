@@ -55,7 +55,10 @@ all input arrays.
 
 """
 
+import warnings
+
 import numpy as np
+from numpy.lib.stride_tricks import as_strided
 from scipy.interpolate import interp1d
 from scipy.signal import medfilt
 from scipy.stats import linregress
@@ -64,7 +67,7 @@ from . import util as util
 
 
 def process_raw_phidp_vulpiani(phidp, dr, N_despeckle=5, L=7,
-                               niter=2, copy=False):
+                               niter=2, copy=False, executor=None):
     """Establish consistent :math:`Phi_{DP}` profiles from raw data.
 
     This approach is based on :cite:`Vulpiani2012` and involves a
@@ -79,10 +82,16 @@ def process_raw_phidp_vulpiani(phidp, dr, N_despeckle=5, L=7,
         - :math:`Phi_{DP}` reconstruction using iterative estimation
           of :math:`K_{DP}`
 
+    The processing works on whole volumes, i.e. arrays of shape
+    (..., n azimuth angles, n range gates). It is carried out in the
+    floating point precision of the input (e.g. float32) and reuses its
+    work buffers during the iterations, so that peak memory stays at a
+    small multiple of the input size.
+
     Parameters
     ----------
     phidp : array
-        array of shape (n azimuth angles, n range gates)
+        array of shape (..., n azimuth angles, n range gates)
     dr : gate length in km
     N_despeckle : integer
         *N* parameter of function dp.linear_despeckle
@@ -94,11 +103,22 @@ def process_raw_phidp_vulpiani(phidp, dr, N_despeckle=5, L=7,
     copy : boolean
         if True, the original phidp array will remain unchanged
 
+    Keyword Arguments
+    -----------------
+    executor : object
+        Any object providing a ``map(func, iterable)`` method, e.g.
+        :py:class:`concurrent.futures.ThreadPoolExecutor` or
+        :py:class:`multiprocessing.pool.Pool`. If given, the sweeps of a
+        volume (all but the last two dimensions) are processed in parallel
+        using ``executor.map``. Defaults to None (serial processing).
+
+        .. versionadded:: 0.11.0
+
     Returns
     -------
-    phidp : array of shape (n azimuth angles, n range gates)
+    phidp : array of shape (..., n azimuth angles, n range gates)
         reconstructed phidp
-    kdp : array of shape (n azimuth angles, n range gates)
+    kdp : array of shape (..., n azimuth angles, n range gates)
         kdp estimate corresponding to phidp output
 
     Examples
@@ -110,6 +130,37 @@ def process_raw_phidp_vulpiani(phidp, dr, N_despeckle=5, L=7,
     if copy:
         phidp = phidp.copy()
 
+    if executor is None or phidp.ndim < 3:
+        return _process_raw_phidp_vulpiani(phidp, dr, N_despeckle, L, niter)
+
+    shape = phidp.shape
+    sweeps = phidp.reshape((-1,) + shape[-2:])
+    kdp = np.empty_like(sweeps)
+    results = executor.map(_process_raw_phidp_vulpiani_sweep,
+                           [(sweep, dr, N_despeckle, L, niter)
+                            for sweep in sweeps])
+    # thread based executors work on views of the output, process based
+    # executors return copies which need to be written back
+    for i, (sweep_phidp, sweep_kdp) in enumerate(results):
+        sweeps[i] = sweep_phidp
+        kdp[i] = sweep_kdp
+
+    return sweeps.reshape(shape), kdp.reshape(shape)
+
+
+def _process_raw_phidp_vulpiani_sweep(args):
+    """Unpacks the arguments of a single sweep for ``executor.map``.
+    """
+    return _process_raw_phidp_vulpiani(*args)
+
+
+def _process_raw_phidp_vulpiani(phidp, dr, N_despeckle, L, niter):
+    """Vulpiani processing of raw phidp, see
+    :meth:`~wradlib.dp.process_raw_phidp_vulpiani`.
+
+    Works in place on ``phidp``, which is reused as the phidp buffer of the
+    iteration, along with a single kdp buffer.
+    """
     # despeckle
     phidp = linear_despeckle(phidp, N_despeckle)
     # kdp retrieval first guess
@@ -125,7 +176,7 @@ def process_raw_phidp_vulpiani(phidp, dr, N_despeckle=5, L=7,
     phidp[phidp > 360] = np.nan
 
     # kdp retrieval second guess
-    kdp = kdp_from_phidp_convolution(phidp, dr=dr, L=L)
+    kdp = kdp_from_phidp_convolution(phidp, dr=dr, L=L, out=kdp)
     kdp = _fill_sweep(kdp)
 
     # remove remaining extreme values
@@ -135,9 +186,11 @@ def process_raw_phidp_vulpiani(phidp, dr, N_despeckle=5, L=7,
     # start the actual phidp/kdp iteration
     for i in range(niter):
         # phidp from kdp through integration
-        phidp = 2 * np.cumsum(kdp, axis=-1) * dr
+        np.cumsum(kdp, axis=-1, out=phidp)
+        phidp *= 2
+        phidp *= dr
         # kdp from phidp by convolution
-        kdp = kdp_from_phidp_convolution(phidp, dr=dr, L=L)
+        kdp = kdp_from_phidp_convolution(phidp, dr=dr, L=L, out=kdp)
         # convert all NaNs to zeros (normally, this line can be assumed
         # to be redundant)
         kdp = _fill_sweep(kdp)
@@ -157,20 +210,12 @@ def unfold_phi_vulpiani(phidp, kdp):
     kdp : array of floats
 
     """
-    # unfold phidp
-    shape = phidp.shape
-    phidp = phidp.reshape((-1, shape[-1]))
-    kdp = kdp.reshape((-1, shape[-1]))
-
-    for beam in range(len(phidp)):
-        below_th3 = kdp[beam] < -20
-        try:
-            idx1 = np.where(below_th3)[0][2]
-            phidp[beam, idx1:] += 360
-        except Exception:
-            pass
+    # unfold phidp from the third gate with kdp below -20 onwards, all
+    # beams at once
+    unfold = np.cumsum(kdp < -20, axis=-1, dtype=np.int32) > 2
+    np.add(phidp, 360, out=phidp, where=unfold)
 
-    return phidp.reshape(shape)
+    return phidp
 
 
 def _fill_sweep(dat, kind="nan_to_num", fill_value=0.):
@@ -179,6 +224,7 @@ def _fill_sweep(dat, kind="nan_to_num", fill_value=0.):
     Parameters
     ----------
     dat : array of shape (n azimuth angles, n range gates)
+        filled in place
     kind : string
         Defines how the filling is done.
     fill_value : float
@@ -186,7 +232,10 @@ def _fill_sweep(dat, kind="nan_to_num", fill_value=0.):
 
     """
     if kind == "nan_to_num":
-        return np.nan_to_num(dat)
+        invalid = ~np.isfinite(dat)
+        if np.any(invalid):
+            dat[invalid] = np.nan_to_num(dat[invalid])
+        return dat
 
     if not np.any(np.isnan(dat)):
         return dat
@@ -297,36 +346,71 @@ def kdp_from_phidp_linregress(phidp, L=7, dr=1.):
 
     # Make really sure L is an integer
     L = int(L)
-
-    x = np.arange(phidp.shape[-1])
-    valids = ~np.isnan(phidp)
-    kdp = np.zeros(phidp.shape) * np.nan
-
-    for beam in range(len(phidp)):
-        for r in range(int(L / 2), phidp.shape[-1] - int(L / 2)):
-            # iterate over gates
-            ix = np.arange(r - L / 2, r + L / 2 + 1, dtype=np.int)
-            if np.sum(valids[beam, ix]) < L / 2:
-                # not enough valid values inside our window
-                continue
-            kdp[beam, r] = linregress(x[ix][valids[beam, ix]],
-                                      phidp[beam, ix[valids[beam, ix]]])[0]
-        # take care of the start and end of the beam
-        #   start
-        ix = np.arange(0, L)
-        if np.sum(valids[beam, ix]) >= L / 2:
-            kdp[beam, ix] = linregress(x[ix][valids[beam, ix]],
-                                       phidp[beam, ix[valids[beam, ix]]])[0]
-        # end
-        ix = np.arange(shape[-1] - L, shape[-1])
-        if np.sum(valids[beam, ix]) >= L / 2:
-            kdp[beam, ix] = linregress(x[ix][valids[beam, ix]],
-                                       phidp[beam, ix[valids[beam, ix]]])[0]
+    n = phidp.shape[-1]
+    h = int(L / 2)
+
+    sums = _regression_sums(phidp)
+    # iterate over gates: all windows at once, requires more than L / 2 valid
+    # values inside the window
+    gates = np.arange(n)
+    slope, nvalid = _window_slope(sums, np.maximum(gates - h, 0),
+                                  np.minimum(gates + h + 1, n))
+    kdp = np.where(nvalid > L / 2., slope, np.nan)
+    kdp[:, :h] = np.nan
+    kdp[:, n - h:] = np.nan
+    # take care of the start and end of the beam
+    #   start
+    slope, nvalid = _window_slope(sums, 0, L)
+    ok = nvalid > L / 2.
+    kdp[ok, :L] = slope[ok, None]
+    # end
+    slope, nvalid = _window_slope(sums, n - L, n)
+    ok = nvalid > L / 2.
+    kdp[ok, n - L:] = slope[ok, None]
 
     # accounting for forward/backward propagation AND gate length
     return kdp.reshape(shape) / 2. / dr
 
 
+def _regression_sums(y):
+    """Cumulative sums along the last axis for moving window least squares.
+
+    Returns an array of shape (5,) + y.shape[:-1] + (y.shape[-1] + 1,)
+    holding the running number of valid values and the running sums of x,
+    x**2, y and x*y over the valid values, x being the gate index. Sums over
+    gates ``lo`` to ``hi - 1`` are ``sums[..., hi] - sums[..., lo]``.
+    """
+    valid = ~np.isnan(y)
+    # slopes do not depend on the origin of x and y, shifting both reduces
+    # the magnitude of the sums
+    x = np.arange(y.shape[-1]) - y.shape[-1] // 2
+    with np.errstate(invalid='ignore'):
+        y0 = np.nanmean(y, axis=-1)[..., None]
+    y0[np.isnan(y0)] = 0.
+    y = np.where(valid, y - y0, 0.)
+    sums = np.zeros((5,) + y.shape[:-1] + (y.shape[-1] + 1,))
+    np.cumsum(valid, axis=-1, out=sums[0, ..., 1:])
+    np.cumsum(x * valid, axis=-1, out=sums[1, ..., 1:])
+    np.cumsum(x * x * valid, axis=-1, out=sums[2, ..., 1:])
+    np.cumsum(y, axis=-1, out=sums[3, ..., 1:])
+    np.cumsum(x * y, axis=-1, out=sums[4, ..., 1:])
+    return sums
+
+
+def _window_slope(sums, lo, hi):
+    """Least squares slopes over the valid values of gates ``lo`` to
+    ``hi - 1`` from :func:`_regression_sums`.
+
+    Returns the slopes and the numbers of valid values, slopes of windows
+    with less than two valid values are NaN.
+    """
+    n, sx, sxx, sy, sxy = sums[..., hi] - sums[..., lo]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+    slope[n < 2] = np.nan
+    return slope, n
+
+
 def kdp_from_phidp_sobel(phidp, L=7, dr=1.):
     """Alternative :math:`K_{DP}` from :math:`Phi_{DP}` by applying a sobel
     filter where possible and linear regression otherwise.
@@ -453,7 +537,7 @@ def sobel(x, window_len=7):
             (window_len / 3.0))
 
 
-def kdp_from_phidp_convolution(phidp, L=7, dr=1.):
+def kdp_from_phidp_convolution(phidp, L=7, dr=1., out=None):
     """Alternative :math:`K_{DP}` from :math:`Phi_{DP}` by applying a
     convolution filter where possible and linear regression otherwise.
 
@@ -489,6 +573,15 @@ def kdp_from_phidp_convolution(phidp, L=7, dr=1.):
         Width of the window (as number of range gates)
     dr : gate length in km
 
+    Keyword Arguments
+    -----------------
+    out : array
+        C-contiguous array of the same shape and floating point type as
+        *phidp* in which the result is placed. Defaults to None (a new
+        array is allocated).
+
+        .. versionadded:: 0.11.0
+
     Examples
     --------
 
@@ -522,55 +615,57 @@ def kdp_from_phidp_convolution(phidp, L=7, dr=1.):
     window = 2. * np.arange(L) / (L - 1.0) - 1.0
     window = window / (abs(window).sum())
     window = window[::-1]
-    kdp = convolve1d(phidp, window, axis=1) / (len(window) / 3.0)
+    if out is None:
+        kdp = np.empty(phidp.shape, dtype=phidp.dtype)
+    else:
+        kdp = out.reshape(phidp.shape)
+    convolve1d(phidp, window, axis=1, output=kdp)
+    kdp /= len(window) / 3.0
 
     # find remaining NaN values with valid neighbours
     invalidkdp = np.isnan(kdp)
-    if not np.any(invalidkdp.ravel()):
-        # No NaN? Return KdP
-        return kdp.reshape(shape) / 2. / dr
-
-    # Otherwise continue
-    x = np.arange(phidp.shape[-1])
-    validphidp = ~np.isnan(phidp)
-    kernel = np.ones(L, dtype="i4")
-    # and do the slow moving window linear regression
-    for beam in range(len(phidp)):
-        # number of valid neighbours around one gate
-        nvalid = np.convolve(validphidp[beam], kernel, "same") > L / 2
-        # find those gates which have invalid Kdp AND enough valid neighbours
-        nangates = np.where(invalidkdp[beam] & nvalid)[0]
-        # now iterate over those
-        for r in nangates:
-            ix = np.arange(max(0, r - int(L / 2)),
-                           min(r + int(L / 2) + 1, shape[-1]))
-            # check again (just to make sure...)
-            if np.sum(validphidp[beam, ix]) < L / 2:
-                # not enough valid values inside our window
-                continue
-            kdp[beam, r] = linregress(x[ix][validphidp[beam, ix]],
-                                      phidp[beam, ix[validphidp[beam, ix]]])[0]
-        # take care of the start and end of the beam
-        #   start
-        ix = np.arange(0, L)
-        if np.sum(validphidp[beam, ix]) >= 2:
-            kdp[beam, 0:int(L / 2)] = linregress(x[ix][validphidp[beam, ix]],
-                                                 phidp[beam,
-                                                       ix[validphidp[beam,
-                                                                     ix]]])[0]
-        # end
-        ix = np.arange(shape[-1] - L, shape[-1])
-        if np.sum(validphidp[beam, ix]) >= 2:
-            kdp[beam, -int(L / 2):] = linregress(x[ix][validphidp[beam, ix]],
-                                                 phidp[beam,
-                                                       ix[validphidp[beam,
-                                                                     ix]]])[0]
+    if np.any(invalidkdp.ravel()):
+        _kdp_nan_regression(kdp, phidp, invalidkdp, L)
 
     # accounting for forward/backward propagation AND gate length
-    return kdp.reshape(shape) / 2. / dr
+    kdp /= 2.
+    kdp /= dr
+    return kdp.reshape(shape)
 
 
-def unfold_phi(phidp, rho, width=5, copy=False):
+def _kdp_nan_regression(kdp, phidp, invalidkdp, L, chunksize=2 ** 16):
+    """Fills invalid convolution kdp (2-D arrays) in place by moving window
+    linear regression, see :meth:`~wradlib.dp.kdp_from_phidp_convolution`.
+
+    Only beams containing invalid gates are processed, in chunks of about
+    ``chunksize`` gates to bound the memory of the regression sums.
+    """
+    n = phidp.shape[-1]
+    h = int(L / 2)
+    # do the moving window linear regression for those gates which have
+    # invalid Kdp AND enough valid neighbours
+    beams = np.flatnonzero(invalidkdp.any(axis=-1))
+    gates = np.arange(n)
+    lo = np.maximum(gates - h, 0)
+    hi = np.minimum(gates + h + 1, n)
+    step = max(1, chunksize // n)
+    for i in range(0, len(beams), step):
+        idx = beams[i:i + step]
+        slope, nvalid = _window_slope(_regression_sums(phidp[idx]), lo, hi)
+        nangates = invalidkdp[idx] & (nvalid > L / 2.)
+        kdp[idx] = np.where(nangates, slope, kdp[idx])
+    # take care of the start and end of the beam
+    #   start
+    slope, nvalid = _window_slope(_regression_sums(phidp[:, :L]), 0, L)
+    ok = nvalid >= 2
+    kdp[ok, 0:h] = slope[ok, None]
+    # end
+    slope, nvalid = _window_slope(_regression_sums(phidp[:, n - L:]), 0, L)
+    ok = nvalid >= 2
+    kdp[ok, n - h:] = slope[ok, None]
+
+
+def unfold_phi(phidp, rho, width=5, copy=False, method='auto'):
     """
     Unfolds differential phase by adjusting values that exceeded maximum
     ambiguous range.
@@ -578,7 +673,9 @@ def unfold_phi(phidp, rho, width=5, copy=False):
     Accepts arbitrarily dimensioned arrays, but THE LAST DIMENSION MUST BE
     THE RANGE.
 
-    This is the fast Fortran-based implementation (RECOMMENDED).
+    This is the fast implementation (RECOMMENDED), which uses the compiled
+    Fortran extension if available and a vectorized NumPy implementation
+    otherwise.
 
     The algorithm is based on the paper of :cite:`Wang2009`.
 
@@ -590,9 +687,31 @@ def unfold_phi(phidp, rho, width=5, copy=False):
        Width of the analysis window
     copy : boolean
        Leaves original phidp array unchanged if set to True (default: False)
+    method : string
+       'auto' (default) selects 'fortran' if the extension
+       `wradlib.speedup` is available and 'numpy' otherwise, 'naive' uses
+       :func:`unfold_phi_naive`.
+
+       .. versionadded:: 0.11.0
+
+    Returns
+    -------
+    phidp : array of float32 with the shape of the input phidp
     """
     # Check whether fast Fortran implementation is available
     speedup = util.import_optional("wradlib.speedup")
+    if not isinstance(speedup, util.OptionalModuleStub):
+        # __import__ returns the top-level package
+        speedup = speedup.speedup
+    if method == 'auto':
+        if isinstance(speedup, util.OptionalModuleStub):
+            method = 'numpy'
+        else:
+            method = 'fortran'
+    if method == 'naive':
+        return unfold_phi_naive(phidp, rho, width=width, copy=copy)
+    if method not in ['fortran', 'numpy']:
+        raise ValueError("Unknown method '%s'." % method)
 
     shape = phidp.shape
     assert rho.shape == shape, "rho and phidp must have the same shape."
@@ -607,18 +726,67 @@ def unfold_phi(phidp, rho, width=5, copy=False):
 
     # Compute the standard deviation within windows of 9 range bins
     stdarr = np.zeros(phidp.shape, dtype=np.float32)
-    for r in range(rs - 9):
-        stdarr[..., r] = np.std(phidp[..., r:r + 9], -1)
-
-    phidp = speedup.f_unfold_phi(phidp=phidp.astype("f4"),
-                                 rho=rho.astype("f4"),
-                                 gradphi=gradphi.astype("f4"),
-                                 stdarr=stdarr.astype("f4"),
-                                 beams=beams, rs=rs, w=width)
+    stdarr[..., :rs - 9] = _rolling_std(phidp, 9, nan=False)[..., :rs - 9]
+
+    if method == 'fortran':
+        phidp = speedup.f_unfold_phi(phidp=phidp.astype("f4"),
+                                     rho=rho.astype("f4"),
+                                     gradphi=gradphi.astype("f4"),
+                                     stdarr=stdarr.astype("f4"),
+                                     beams=beams, rs=rs, w=width)
+    else:
+        phidp = _unfold_phi_numpy(phidp.astype("f4"), rho.astype("f4"),
+                                  gradphi.astype("f4"), stdarr, width)
 
     return phidp.reshape(shape)
 
 
+def _unfold_phi_numpy(phidp, rho, gradphi, stdarr, width):
+    """Vectorized phase unfolding of :func:`unfold_phi`, phidp is changed in
+    place.
+
+    Follows the Fortran implementation, but empty beams are skipped instead
+    of stopping the processing of all remaining beams.
+    """
+    beams, rs = phidp.shape
+
+    # step 1: determine location where meaningful PhiDP profile begins, the
+    # first window of width gates with low std and high rho
+    good = (stdarr < 5) & (rho > 0.9)
+    start = _rolling_sum(good, width) == width
+    j = np.where(np.any(start, axis=-1), np.argmax(start, axis=-1),
+                 rs - width)
+
+    # reference phase is the mean of this window, NaNs propagate
+    ref = np.take_along_axis(_rolling_sum(phidp, width), j[:, None], axis=-1)
+    count = np.take_along_axis(_rolling_count(phidp, width), j[:, None],
+                               axis=-1)
+    ref = np.where(count == width, ref / width, np.nan)
+
+    # step 2: starting at the last gate of this window, the reference phase
+    # follows the gradient where the slope is plausible and the std is low
+    # within the window of width gates ending at the gate
+    k = np.arange(rs)
+    active = k >= (j + width - 1)[:, None]
+    slope = _rolling_count(np.where((gradphi < -5) | (gradphi > 20),
+                                    np.nan, 0.), width) == width
+    sumup = _rolling_sum(stdarr, width)
+    sumup[_rolling_count(stdarr, width) < width] = np.nan
+    follow = np.zeros(phidp.shape, dtype=bool)
+    with np.errstate(invalid='ignore'):
+        follow[:, width - 1:] = slope & (sumup < 15.)
+    follow &= active
+    ref = ref + np.cumsum(np.where(follow, gradphi * 0.5, 0.), axis=-1)
+
+    # unfold
+    with np.errstate(invalid='ignore'):
+        fold = active & (phidp - ref < -80.) & (phidp < 0)
+    # skip empty beams
+    fold[np.all(phidp[:, :rs - width + 1] == 0, axis=-1)] = False
+    phidp[fold] += 360.
+    return phidp
+
+
 def unfold_phi_naive(phidp, rho, width=5, copy=False):
     """
     Unfolds differential phase by adjusting values that exceeded maximum
@@ -654,34 +822,30 @@ def unfold_phi_naive(phidp, rho, width=5, copy=False):
 
     # Compute the standard deviation within windows of 9 range bins
     stdarr = np.zeros(phidp.shape, dtype=np.float32)
-    for r in range(rs - 9):
-        stdarr[..., r] = np.std(phidp[..., r:r + 9], -1)
+    stdarr[..., :rs - 9] = _rolling_std(phidp, 9, nan=False)[..., :rs - 9]
 
     # phi_corr = np.zeros(phidp.shape)
     for beam in range(beams):
 
-        if np.all(phidp[beam] == 0):
+        if np.all(phidp[beam, :rs - width + 1] == 0):
             continue
 
         # step 1: determine location where meaningful PhiDP profile begins
-        for j in range(0, rs - width):
+        for j in range(0, rs - width + 1):
             if (np.sum(stdarr[beam, j:j + width] < 5) == width) and \
-                    (np.sum(rho[beam, j:j + 5] > 0.9) == width):
+                    (np.sum(rho[beam, j:j + width] > 0.9) == width):
                 break
 
         ref = np.mean(phidp[beam, j:j + width])
-        for k in range(j + width, rs):
-            if np.sum(stdarr[beam, k - width:k] < 5) and \
-                    np.logical_and(gradphi[beam, k] > -5,
-                                   gradphi[beam, k] < 20):
+        for k in range(j + width - 1, rs):
+            grad = gradphi[beam, k - width + 1:k + 1]
+            if not np.any((grad < -5) | (grad > 20)) and \
+                    np.sum(stdarr[beam, k - width + 1:k + 1]) < 15:
                 ref += gradphi[beam, k] * 0.5
-                if phidp[beam, k] - ref < -80:
-                    if phidp[beam, k] < 0:
-                        phidp[beam, k] += 360
-            elif phidp[beam, k] - ref < -80:
+            if phidp[beam, k] - ref < -80:
                 if phidp[beam, k] < 0:
                     phidp[beam, k] += 360
-    return phidp
+    return phidp.reshape(shape)
 
 
 def linear_despeckle(data, N=3, copy=False):
@@ -709,21 +873,10 @@ def linear_despeckle(data, N=3, copy=False):
         "Window size N for function linear_despeckle must be 3 or 5."
     if copy:
         data = data.copy()
-    axis = data.ndim - 1
-    arr = np.ones(data.shape, dtype="i4")
-    arr[np.isnan(data)] = 0
-    arr_plus1 = np.roll(arr, shift=1, axis=axis)
-    arr_minus1 = np.roll(arr, shift=-1, axis=axis)
-    if N == 3:
-        # for a window of size 3
-        test = arr + arr_plus1 + arr_minus1
-        data[np.logical_and(np.logical_not(np.isnan(data)), test < 2)] = np.nan
-    else:
-        # for a window of size 5
-        arr_plus2 = np.roll(arr, shift=2, axis=axis)
-        arr_minus2 = np.roll(arr, shift=-2, axis=axis)
-        test = arr + arr_plus1 + arr_minus1 + arr_plus2 + arr_minus2
-        data[np.logical_and(np.logical_not(np.isnan(data)), test < 3)] = np.nan
+    # number of valid values in the window of size N (wrapping around)
+    test = _rolling_count(_pad_range(data, N // 2, mode='wrap'), N)
+    data[np.logical_and(np.logical_not(np.isnan(data)),
+                        test < N // 2 + 1)] = np.nan
     # remove isolated pixels at the first gate
     secondgate = np.squeeze(np.take(data, range(1, 2), data.ndim - 1))
     data[..., 0][np.isnan(secondgate)] = np.nan
@@ -746,37 +899,28 @@ def texture(data):
     texture : array of textures with the same shape as data
 
     """
-    x1 = np.roll(data, 1, -2)  # center:2
-    x2 = np.roll(data, 1, -1)  # 4
-    x3 = np.roll(data, -1, -2)  # 8
-    x4 = np.roll(data, -1, -1)  # 6
-    x5 = np.roll(x1, 1, -1)  # 1
-    x6 = np.roll(x4, 1, -2)  # 3
-    x7 = np.roll(x3, -1, -1)  # 9
-    x8 = np.roll(x2, -1, -2)  # 7
-
-    # at least one NaN would give a sum of NaN
-    xa = np.array([x1, x2, x3, x4, x5, x6, x7, x8])
-
-    # get count of valid neighboring pixels
-    xa_valid = np.ones(np.shape(xa))
-    xa_valid[np.isnan(xa)] = 0
+    # sums over the 3x3 neighborhood, wrapping around at the edges
+    def boxsum(func, x):
+        x = func(_pad_range(x, 1, mode='wrap'), 3)
+        x = _rolling_sum(_pad_range(np.swapaxes(x, -1, -2), 1, mode='wrap'),
+                         3)
+        return np.swapaxes(x, -1, -2)
+
+    # sums of the valid values including the center pixel, which does not
+    # contribute to the squared differences
+    count = boxsum(_rolling_count, data)
+    sum1 = boxsum(_rolling_sum, data)
+    sum2 = boxsum(_rolling_sum, data ** 2)
+    # sum of squared differences to the valid neighbors
+    num = count * data ** 2 - 2 * data * sum1 + sum2
     # count number of valid neighbors
-    xa_valid_count = np.sum(xa_valid, axis=0)
-
-    num = np.zeros(data.shape)
-    for xarr in xa:
-        diff = data - xarr
-        # difference of NaNs will be converted to zero
-        # (to not affect the summation)
-        diff[np.isnan(diff)] = 0
-        # only those with valid values are considered in the summation
-        num += diff ** 2
+    count -= ~np.isnan(data)
+    # only those with valid values are considered in the summation
+    num[num < 0] = 0.
 
     # reinforce that NaN values should have NaN textures
-    num[np.isnan(data)] = np.nan
-
-    return np.sqrt(num / xa_valid_count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.sqrt(num / count)
 
 
 def contiguous_regions(condition):
@@ -816,14 +960,135 @@ def contiguous_regions(condition):
     return idx
 
 
+# -----------------------------------------------------------------------------
+# rolling window statistics along the range axis
+# -----------------------------------------------------------------------------
+def _pad_range(x, pad, mode='constant', **kwargs):
+    """Pads ``pad`` range gates to both ends of the last axis, see
+    :func:`numpy.pad`.
+    """
+    pad_width = [(0, 0)] * (x.ndim - 1) + [(pad, pad)]
+    return np.pad(x, pad_width, mode=mode, **kwargs)
+
+
+def _rolling_window(x, N):
+    """Read-only view of shape (..., nr - N + 1, N) of the windows of ``N``
+    consecutive range gates.
+    """
+    x = np.asanyarray(x)
+    shape = x.shape[:-1] + (x.shape[-1] - N + 1, N)
+    strides = x.strides + (x.strides[-1],)
+    return as_strided(x, shape=shape, strides=strides, writeable=False)
+
+
+def _rolling_cumsum(x):
+    """Cumulative sum along the last axis starting with zero, NaNs count as
+    zero.
+    """
+    shape = x.shape[:-1] + (x.shape[-1] + 1,)
+    if x.dtype == np.bool_:
+        # valid value counts, keep them small
+        csum = np.zeros(shape, dtype=np.int32)
+        np.cumsum(x, axis=-1, out=csum[..., 1:])
+        return csum
+    csum = np.zeros(shape, dtype=np.result_type(x, np.int64))
+    np.cumsum(np.where(np.isnan(x), 0, x), axis=-1, out=csum[..., 1:])
+    return csum
+
+
+def _rolling_sum(x, N):
+    """Sums of the valid values within windows of ``N`` range gates.
+
+    The result has the shape (..., nr - N + 1), element ``i`` holds the sum
+    over gates ``i`` to ``i + N - 1``. Pad the input with
+    :func:`_pad_range` to get centered windows for every gate.
+    """
+    csum = _rolling_cumsum(x)
+    return csum[..., N:] - csum[..., :-N]
+
+
+def _rolling_count(x, N):
+    """Numbers of valid (non-NaN) values within windows of ``N`` range gates,
+    see :func:`_rolling_sum`.
+    """
+    return _rolling_sum(~np.isnan(x), N)
+
+
+def _rolling_mean(x, N):
+    """Means of the valid values within windows of ``N`` range gates, see
+    :func:`_rolling_sum`.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return _rolling_sum(x, N) / _rolling_count(x, N)
+
+
+def _rolling_std(x, N, ddof=0, nan=True):
+    """Standard deviations of the valid values within windows of ``N`` range
+    gates, see :func:`_rolling_sum`.
+
+    With ``nan=False`` windows containing NaNs are NaN, like
+    :func:`numpy.std`.
+    """
+    # the standard deviation does not depend on the origin, shifting by the
+    # mean of each beam reduces cancellation
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        x = x - np.nanmean(x, axis=-1)[..., None]
+    count = _rolling_count(x, N)
+    sum1 = _rolling_sum(x, N)
+    sum2 = _rolling_sum(x ** 2, N)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = (sum2 - sum1 ** 2 / count) / (count - ddof)
+        var[(var < 0) | (count == 1)] = 0.
+        var[count <= ddof] = np.nan
+    if not nan:
+        var[count < N] = np.nan
+    return np.sqrt(var)
+
+
+def _rolling_min(x, N):
+    """Minima of the valid values within windows of ``N`` range gates, see
+    :func:`_rolling_sum`.
+    """
+    return np.fmin.reduce(_rolling_window(x, N), axis=-1)
+
+
+def _rolling_max(x, N):
+    """Maxima of the valid values within windows of ``N`` range gates, see
+    :func:`_rolling_sum`.
+    """
+    return np.fmax.reduce(_rolling_window(x, N), axis=-1)
+
+
+def _rolling_median(x, N):
+    """Medians of the valid values within windows of ``N`` range gates, see
+    :func:`_rolling_sum`.
+    """
+    windows = _rolling_window(x, N)
+    median = np.median(windows, axis=-1)
+    # only windows containing NaNs need the slow NaN-aware median
+    invalid = np.isnan(median)
+    if np.any(invalid):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            median[invalid] = np.nanmedian(windows[invalid], axis=-1)
+    return median
+
+
 # TO UTILS
 def medfilt_along_axis(x, N, axis=-1):
     """Applies median filter smoothing on one axis of an N-dimensional array.
     """
-    kernel_size = np.array(x.shape)
-    kernel_size[:] = 1
-    kernel_size[axis] = N
-    return medfilt(x, kernel_size)
+    x = np.swapaxes(x, axis, -1)
+    # zero padding like scipy.signal.medfilt
+    median = np.median(_rolling_window(_pad_range(x, N // 2), N), axis=-1)
+    median = median.astype(x.dtype, copy=False)
+    # beams containing NaNs are left to scipy.signal.medfilt, which does
+    # not ignore NaNs like the NaN-aware rolling statistics
+    gappy = np.any(np.isnan(median), axis=-1)
+    if np.any(gappy):
+        median[gappy] = medfilt(x[gappy], [1, N])
+    return np.swapaxes(median, axis, -1)
 
 
 # TO UTILS
@@ -836,8 +1101,7 @@ def gradient_along_axis(x):
     diff_begin = (x[..., 1] - x[..., 0]).reshape(newshape)
     diff_end = (x[..., -1] - x[..., -2]).reshape(newshape)
     diffs = ((x - np.roll(x, 2, axis)) / 2.)
-    diffs = np.append(diffs[..., 2:], diff_end, axis=axis)
-    return np.insert(diffs, 0, diff_begin, axis=axis)
+    return np.concatenate([diff_begin, diffs[..., 2:], diff_end], axis=axis)
 
 
 # TO UTILS
@@ -188,7 +188,7 @@ def parse_DX_header(header):
     return out
 
 
-def readDX(filename):
+def readDX(filename, lut=None):
     """Data reader for German Weather Service DX product raw radar data files.
 
     This product uses a simple algorithm to compress zero values to reduce data
@@ -218,10 +218,19 @@ def readDX(filename):
     filename : string
         binary file of DX raw data
 
+    Keyword Arguments
+    -----------------
+    lut : :func:`numpy:numpy.array`
+        lookup table indexed by the RVP6 codes of the data, e.g. rain rates
+        from :func:`wradlib.zr.rvp2r_lookup`. If given, ``lut[codes]`` is
+        returned instead of dBZ. Defaults to None.
+
+        .. versionadded:: 0.11.0
+
     Returns
     -------
     data : :func:`numpy:numpy.array`
-        of image data [dBZ]; shape (360,128)
+        of image data [dBZ] (or looked up values); shape (360,128)
 
     attributes : dict
         dictionary of attributes - currently implemented keys:
@@ -329,9 +338,19 @@ def readDX(filename):
     attrs['azim'] = np.array(azims)
     attrs['clutter'] = (beams & clutterflag) != 0
 
+    codes = beams & dataflag
+
+    if lut is not None:
+        # skip the dBZ stage and look up the values of the RVP6 codes
+        if codes.size and codes.max() >= len(lut):
+            raise ValueError("wradlib: RVP6 code {0} exceeds the lookup "
+                             "table of length {1}.".format(codes.max(),
+                                                           len(lut)))
+        return lut[codes], attrs
+
     # converting the DWD rvp6-format into dBZ data and return as numpy array
     # together with attributes
-    return (beams & dataflag) * 0.5 - 32.5, attrs
+    return codes * 0.5 - 32.5, attrs
 
 
 def _write_polygon2txt(f, idx, vertices):
@@ -799,7 +818,7 @@ def read_radolan_header(fid):
     return header
 
 
-def read_RADOLAN_composite(f, missing=-9999, loaddata=True):
+def read_RADOLAN_composite(f, missing=-9999, loaddata=True, lut=None):
     """Read quantitative radar composite format of the German Weather Service
 
     The quantitative composite format of the DWD (German Weather Service) was
@@ -830,6 +849,15 @@ def read_RADOLAN_composite(f, missing=-9999, loaddata=True):
     loaddata : bool
         True | False, If False function returns (None, attrs)
 
+    Keyword Arguments
+    -----------------
+    lut : :func:`numpy:numpy.array`
+        lookup table indexed by the RVP6 codes of RX, EX and WX products,
+        e.g. rain rates from :func:`wradlib.zr.rvp2r_lookup`. If given,
+        ``lut[codes]`` is returned for all data cells. Defaults to None.
+
+        .. versionadded:: 0.11.0
+
     Returns
     -------
     output : tuple
@@ -858,6 +886,12 @@ def read_RADOLAN_composite(f, missing=-9999, loaddata=True):
 
     attrs = parse_DWD_quant_composite_header(header)
 
+    if lut is not None and attrs['producttype'] not in ['RX', 'EX', 'WX']:
+        f.close()
+        raise ValueError("Lookup tables are only applicable to RVP6 coded "
+                         "products (RX, EX, WX), got {0}."
+                         .format(attrs['producttype']))
+
     if not loaddata:
         f.close()
         return None, attrs
@@ -877,8 +911,14 @@ def read_RADOLAN_composite(f, missing=-9999, loaddata=True):
     if attrs['producttype'] in ['RX', 'EX', 'WX']:
         # convert to 8bit integer
         arr = np.frombuffer(indat, np.uint8).astype(np.uint8)
-        arr = np.where(arr == 250, NODATA, arr)
-        attrs['cluttermask'] = np.where(arr == 249)[0]
+        if lut is None:
+            arr = np.where(arr == 250, NODATA, arr)
+            attrs['cluttermask'] = np.where(arr == 249)[0]
+        else:
+            attrs['cluttermask'] = np.where(arr == 249)[0]
+            nodata = arr == 250
+            arr = lut[arr]
+            arr[nodata] = NODATA
     elif attrs['producttype'] in ['PG', 'PC']:
         arr = decode_radolan_runlength_array(indat, attrs)
     else:
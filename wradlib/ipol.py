@@ -27,18 +27,25 @@ This includes for example:
    ExternalDriftKriging
    interpolate
    interpolate_polar
+   PolarFiller
    cart2irregular_interp
    cart2irregular_spline
+   cart2irregular_index
+   SparseOperator
+   from_sparse
+   empirical_variogram
+   fit_variogram
 
 """
 
 from functools import reduce
 import re
 import scipy
-from scipy.spatial import cKDTree
-from scipy.interpolate import LinearNDInterpolator
+from scipy.spatial import Delaunay
+from scipy.sparse import csr_matrix, issparse, load_npz
 from scipy.ndimage.interpolation import map_coordinates
 from scipy.interpolate import griddata
+from scipy.optimize import curve_fit
 import numpy as np
 import warnings
 
@@ -96,6 +103,107 @@ class IpolBase():
         self._check_shape(vals)
         return None
 
+    @classmethod
+    def chunked(cls, src, trg, vals, *args, **kwargs):
+        """
+        Interpolate values from src to trg, processing the targets in chunks.
+
+        An interpolator is created for each chunk of `chunksize` targets, so
+        that its temporary arrays (e.g. distances, neighbour indices and
+        weights) only need to hold one chunk. The result of each chunk is
+        written into `out`, which may e.g. be a :class:`numpy:numpy.memmap`.
+        Thus, peak memory does not depend on the number of targets.
+
+        .. versionadded:: 0.11.0
+
+        Parameters
+        ----------
+        src : ndarray of floats, shape (npoints, ndims)
+            Data point coordinates of the source points.
+        trg : ndarray of floats, shape (npoints, ndims)
+            Data point coordinates of the target points.
+        vals : ndarray of float, shape (numsources, ...)
+            Values at the source points which to interpolate
+        *args : arguments of the interpolator
+
+        Keyword Arguments
+        -----------------
+        chunksize : int
+            number of targets per chunk, defaults to 65536
+        out : ndarray of shape (numtargets, ...)
+            output array, allocated from the result of the first chunk if
+            not given
+        **kwargs : keyword arguments of the interpolator
+
+        Returns
+        -------
+        out : ndarray of shape (numtargets, ...)
+
+        Examples
+        --------
+        >>> import tempfile
+        >>> import numpy as np
+        >>> import wradlib.ipol as ipol
+        >>> src = np.random.uniform(0., 10., (10, 2))
+        >>> trg = np.random.uniform(0., 10., (1000, 2))
+        >>> out = np.memmap(tempfile.TemporaryFile(), dtype='f4', mode='w+',
+        ...                 shape=(1000,))
+        >>> out = ipol.Idw.chunked(src, trg, np.arange(10.), chunksize=100,
+        ...                        out=out)
+
+        """
+        chunksize = kwargs.pop('chunksize', 65536)
+        out = kwargs.pop('out', None)
+        src = cls._make_coord_arrays(src)
+        trg = cls._make_coord_arrays(trg)
+        if len(trg) == 0:
+            raise MissingTargetsError
+        for start in range(0, len(trg), chunksize):
+            sl = slice(start, start + chunksize)
+            ipvals = cls(src, trg[sl], *args, **kwargs)(vals)
+            if out is None:
+                out = np.empty((len(trg),) + ipvals.shape[1:],
+                               dtype=ipvals.dtype)
+            out[sl] = ipvals.reshape(out[sl].shape)
+        return out
+
+    def to_sparse(self):
+        """
+        Returns the interpolation as sparse linear operator.
+
+        Once the configuration of source and target points is fixed, the
+        interpolation is a linear map from the source values to the target
+        values. Applying the operator to an array of shape
+        (numsources, numfields) is equivalent to calling the interpolator.
+
+        The operator can be saved with :func:`scipy:scipy.sparse.save_npz`
+        and reloaded with :func:`from_sparse`.
+
+        Returns
+        -------
+        operator : :class:`scipy:scipy.sparse.csr_matrix`
+            sparse matrix of shape (numtargets, numsources)
+
+        """
+        ix, weights = self._get_ix_weights()
+        nnear = ix.shape[1]
+        operator = csr_matrix((weights.ravel(), ix.ravel(),
+                               np.arange(0, ix.size + 1, nnear)),
+                              shape=(self.numtargets, self.numsources),
+                              copy=True)
+        operator.eliminate_zeros()
+        return operator
+
+    def _get_ix_weights(self):
+        """
+        Returns the source point indices and weights of each target point,
+        both of shape (numtargets, nnear). To be implemented by the
+        interpolation classes which support :meth:`to_sparse`.
+
+        """
+        raise NotImplementedError('%s does not provide a sparse operator.' %
+                                  self.__class__.__name__)
+
     def _check_shape(self, vals):
         """
         Checks whether the values correspond to the source points
@@ -109,7 +217,8 @@ class IpolBase():
             ('Length of value array %d does not correspond to number '
              'of source points %d' % (len(vals), self.numsources))
 
-    def _make_coord_arrays(self, x):
+    @staticmethod
+    def _make_coord_arrays(x):
         """
         Make sure that the coordinates are provided as ndarray
         of shape (numpoints, ndim)
@@ -171,6 +280,12 @@ class Nearest(IpolBase):
     trg : ndarray of floats, shape (npoints, ndims)
         Data point coordinates of the target points.
 
+    Keyword Arguments
+    -----------------
+    **kwargs : keyword arguments of :func:`wradlib.util.query_tree`, e.g.
+        `workers`, `chunksize`, `dtype`, `ix_dtype` or
+        `distance_upper_bound`
+
     Examples
     --------
     See :ref:`notebooks/interpolation/wradlib_ipol_example.ipynb`.
@@ -182,7 +297,7 @@ class Nearest(IpolBase):
 
     """
 
-    def __init__(self, src, trg):
+    def __init__(self, src, trg, **kwargs):
         src = self._make_coord_arrays(src)
         trg = self._make_coord_arrays(trg)
         # remember some things
@@ -193,8 +308,9 @@ class Nearest(IpolBase):
         if self.numsources == 0:
             raise MissingSourcesError
         # plant a tree
-        self.tree = cKDTree(src)
-        self.dists, self.ix = self.tree.query(trg, k=1)
+        self.tree = util.get_tree(src, owner=self)
+        self._query_kwargs = kwargs
+        self.dists, self.ix = util.query_tree(self.tree, trg, k=1, **kwargs)
 
     def __call__(self, vals, maxdist=None):
         """
@@ -214,11 +330,21 @@ class Nearest(IpolBase):
 
         """
         self._check_shape(vals)
-        out = vals[self.ix]
-        if maxdist is None:
-            return out
-        else:
-            return np.where(self.dists > maxdist, np.nan, out)
+        # targets without neighbour within distance_upper_bound
+        invalid = self.ix == self.numsources
+        if maxdist is None and not np.any(invalid):
+            return vals[self.ix]
+        if maxdist is not None:
+            invalid |= self.dists > maxdist
+        out = vals[np.where(invalid, 0, self.ix)]
+        invalid = invalid.reshape(invalid.shape + (1,) * (out.ndim - 1))
+        return np.where(invalid, np.nan, out)
+
+    def _get_ix_weights(self):
+        # targets without neighbour within distance_upper_bound yield np.nan
+        missing = (self.ix == self.numsources)[:, np.newaxis]
+        return (np.where(missing, 0, self.ix[:, np.newaxis]),
+                np.where(missing, np.nan, 1.))
 
 
 class Idw(IpolBase):
@@ -236,6 +362,12 @@ class Idw(IpolBase):
     nnearest : integer - max. number of neighbours to be considered
     p : float - inverse distance power used in 1/dist**p
 
+    Keyword Arguments
+    -----------------
+    **kwargs : keyword arguments of :func:`wradlib.util.query_tree`, e.g.
+        `workers`, `chunksize`, `dtype`, `ix_dtype` or
+        `distance_upper_bound`
+
     Examples
     --------
     See :ref:`notebooks/interpolation/wradlib_ipol_example.ipynb`.
@@ -246,7 +378,7 @@ class Idw(IpolBase):
 
     """
 
-    def __init__(self, src, trg, nnearest=4, p=2.):
+    def __init__(self, src, trg, nnearest=4, p=2., **kwargs):
         src = self._make_coord_arrays(src)
         trg = self._make_coord_arrays(trg)
         # remember some things
@@ -268,12 +400,47 @@ class Idw(IpolBase):
             self.nnearest = nnearest
         self.p = p
         # plant a tree
-        self.tree = cKDTree(src)
-        self.dists, self.ix = self.tree.query(trg, k=self.nnearest)
+        self.tree = util.get_tree(src, owner=self)
+        self._query_kwargs = kwargs
+        self.dists, self.ix = util.query_tree(self.tree, trg, k=self.nnearest,
+                                              **kwargs)
         # avoid bug, if there is only one neighbor at all
         if self.dists.ndim == 1:
             self.dists = self.dists[:, np.newaxis]
             self.ix = self.ix[:, np.newaxis]
+        # the weights only depend on the configuration of the points
+        self.weights = self._get_weights()
+        # neighbours which do not contribute point to an additional zero
+        # value which is appended to the source values on call
+        self._src_ix = np.where(self.weights > 0, self.ix, self.numsources)
+
+    def _get_weights(self):
+        """Calculates the normalized inverse distance weights.
+
+        Neighbours at infinite distance do not contribute. If a target point
+        coincides with a source point, the target gets the value of that
+        source point.
+
+        Returns
+        -------
+        weights : ndarray of float, shape (numtargetpoints, nnearest)
+
+        """
+        valid = np.isfinite(self.dists)
+        if self.nnearest == 1:
+            # defaults to nearest neighbour
+            weights = valid.astype(np.float64)
+        else:
+            # weight z values by (1/dist)**p --
+            with np.errstate(divide='ignore'):
+                weights = np.where(valid, 1. / self.dists ** self.p, 0.)
+            # if a target point coincides with a source point
+            coincident = self.dists[:, 0] < 1e-10
+            weights[coincident] = 0.
+            weights[coincident, 0] = 1.
+        with np.errstate(invalid='ignore'):
+            weights /= np.sum(weights, axis=1, keepdims=True)
+        return weights
 
     def __call__(self, vals):
         """
@@ -283,60 +450,40 @@ class Idw(IpolBase):
         ----------
         vals : ndarray of float, shape (numsourcepoints, ...)
             Values at the source points which to interpolate
-        maxdist : the maximum distance up to which an interpolated values is
-            assigned - if maxdist is exceeded, np.nan will be assigned
-            If maxdist==None, values will be assigned everywhere
 
         Returns
         -------
         output : ndarray of float with shape (numtargetpoints,...)
 
         """
-
-        # self distances: a list of arrays of distances of the nearest points
-        # which are indicated by self.ix
         self._check_shape(vals)
-        outshape = list(vals.shape)
-        outshape[0] = len(self.dists)
-        interpol = (np.repeat(np.nan, util._shape2size(outshape)).
-                    reshape(tuple(outshape)).astype('f4'))
-        # weights is the container for the weights (a list)
-        weights = list(range(len(self.dists)))
-        # sources is the container for the source point indices
-        src_ix = list(range(len(self.dists)))
-        # jinterpol is the jth element of interpol
-        jinterpol = 0
-        for dist, ix in zip(self.dists, self.ix):
-            valid_dists = np.where(np.isfinite(dist))[0]
-            dist = dist[valid_dists]
-            ix = ix[valid_dists]
-            if self.nnearest == 1:
-                # defaults to nearest neighbour
-                wz = vals[ix]
-                w = 1.
-            elif dist[0] < 1e-10:
-                # if a target point coincides with a source point
-                wz = vals[ix[0]]
-                w = 1.
-            else:
-                # weight z values by (1/dist)**p --
-                w = 1. / dist ** self.p
-                w /= np.sum(w)
-                wz = np.dot(w, vals[ix])
-            interpol[jinterpol] = wz.ravel()
-            weights[jinterpol] = w
-            src_ix[jinterpol] = ix
-            jinterpol += 1
-        return interpol  # if self.qdim > 1  else interpol[0]
+        vals = np.asanyarray(vals)
+        # append a zero value for non-contributing neighbours
+        vals = np.concatenate([vals, np.zeros((1,) + vals.shape[1:],
+                                              dtype=vals.dtype)])
+        interpol = np.einsum('ij,ij...->i...', self.weights,
+                             vals[self._src_ix])
+        return interpol.astype('f4')
+
+    def _get_ix_weights(self):
+        contrib = self._src_ix < self.numsources
+        weights = np.where(contrib, self.weights, 0.)
+        # targets without any contributing neighbour yield np.nan
+        weights[~np.any(contrib, axis=1), 0] = np.nan
+        return np.where(contrib, self.ix, 0), weights
 
 
 class Linear(IpolBase):
     """
-    Interface to the :class:`scipy:scipy.interpolate.LinearNDInterpolator`
-    class.
+    Linear(src, trg)
 
-    We provide this class in order to achieve a uniform interface for all
-    Interpolator classes
+    Linear barycentric interpolation in N dimensions, equivalent to
+    :class:`scipy:scipy.interpolate.LinearNDInterpolator`.
+
+    The source points are triangulated only once during initialization.
+    The simplex containing each target point and the barycentric weights of
+    its vertices are kept, so that calling the interpolator is only a
+    weighted sum over the values at these vertices.
 
     Parameters
     ----------
@@ -348,6 +495,11 @@ class Linear(IpolBase):
     Examples
     --------
     See :ref:`notebooks/interpolation/wradlib_ipol_example.ipynb`.
+
+    Note
+    ----
+    Uses :class:`scipy:scipy.spatial.Delaunay`
+
     """
 
     def __init__(self, src, trg):
@@ -360,6 +512,21 @@ class Linear(IpolBase):
         self.numsources = len(src)
         if self.numsources == 0:
             raise MissingSourcesError
+        # triangulate once
+        self.tri = Delaunay(self.src)
+        simplex = self.tri.find_simplex(self.trg)
+        # targets outside the convex hull of the sources
+        self.outside = simplex == -1
+        simplex[self.outside] = 0
+        # vertex indices and barycentric weights of the enclosing simplex
+        self.ix = self.tri.simplices[simplex]
+        ndim = self.src.shape[1]
+        transform = self.tri.transform[simplex]
+        bary = np.einsum('ijk,ik->ij', transform[:, :ndim, :],
+                         self.trg - transform[:, ndim, :])
+        self.weights = np.concatenate([bary, 1. - np.sum(bary, axis=1,
+                                                         keepdims=True)],
+                                      axis=1)
 
     def __call__(self, vals, fill_value=np.nan):
         """
@@ -378,8 +545,16 @@ class Linear(IpolBase):
 
         """
         self._check_shape(vals)
-        ip = LinearNDInterpolator(self.src, vals, fill_value=fill_value)
-        return ip(self.trg)
+        vals = np.asanyarray(vals)
+        ip = np.einsum('ij,ij...->i...', self.weights, vals[self.ix])
+        ip[self.outside] = fill_value
+        return ip
+
+    def _get_ix_weights(self):
+        # targets outside the convex hull of the sources will yield np.nan
+        weights = self.weights.copy()
+        weights[self.outside] = np.nan
+        return self.ix, weights
 
 
 # -----------------------------------------------------------------------------
@@ -508,6 +683,289 @@ def cov_cau(h, sill=1., rng=1., alpha=1., beta=1.0):
     return sill * (1 + (h / rng) ** alpha) ** (-beta / alpha)
 
 
+# covariance models which can be fitted to an empirical variogram and the
+# bounds of their additional shape parameters
+_VARIOGRAM_MODELS = {'Lin': (cov_lin, []),
+                     'Sph': (cov_sph, []),
+                     'Exp': (cov_exp, []),
+                     'Gau': (cov_gau, []),
+                     'Mat': (cov_mat, [(0.05, 100.)]),
+                     'Cau': (cov_cau, [(1e-3, 2.), (1e-3, np.inf)]),
+                     }
+
+# maximum number of pairwise differences of the variogram computed at once
+_MAX_VARIOGRAM_ELEMENTS = 2 ** 22
+
+
+def empirical_variogram(src, vals, maxlag, nbins=10):
+    """Compute the empirical semivariogram of point observations
+
+    Pairs of points up to a distance of `maxlag` are retrieved from a
+    :class:`scipy:scipy.spatial.cKDTree`, so no dense matrix of all pairwise
+    distances is formed. If `vals` contains several fields (e.g. time steps),
+    the semivariances of all fields are pooled. Missing values (NaN) are
+    ignored pairwise.
+
+    .. versionadded:: 0.11.0
+
+    Parameters
+    ----------
+    src : :class:`numpy:numpy.ndarray`
+        array of shape (npoints, ndim) of point coordinates
+    vals : :class:`numpy:numpy.ndarray`
+        array of shape (npoints,) or (npoints, nfields) of observations
+    maxlag : float
+        maximum distance between pairs of points
+    nbins : int
+        number of equidistant lag classes between 0 and `maxlag`
+
+    Returns
+    -------
+    lags : :class:`numpy:numpy.ndarray`
+        mean distance of the pairs in each lag class
+    gamma : :class:`numpy:numpy.ndarray`
+        semivariance of each lag class, NaN for empty classes
+    counts : :class:`numpy:numpy.ndarray`
+        number of pairs in each lag class
+    """
+    src = np.asarray(src, dtype=np.float64)
+    if src.ndim == 1:
+        src = src.reshape((-1, 1))
+    vals = np.asarray(vals, dtype=np.float64).reshape((len(src), -1))
+    tree = util.get_tree(src)
+    pairs = tree.query_pairs(maxlag, output_type='ndarray')
+    lags = np.sqrt(((src[pairs[:, 0]] - src[pairs[:, 1]]) ** 2).sum(axis=-1))
+    bins = np.clip((lags / maxlag * nbins).astype(np.intp), 0, nbins - 1)
+    sums = np.zeros(nbins)
+    counts = np.zeros(nbins)
+    lagsums = np.zeros(nbins)
+    # process fields in chunks to limit the size of the pairwise differences
+    nfields = vals.shape[1]
+    step = max(_MAX_VARIOGRAM_ELEMENTS // max(len(pairs), 1), 1)
+    for start in range(0, nfields, step):
+        sl = slice(start, start + step)
+        diff = vals[pairs[:, 0], sl] - vals[pairs[:, 1], sl]
+        valid = np.isfinite(diff)
+        n = valid.sum(axis=1)
+        sqdiff = np.where(valid, diff, 0.) ** 2
+        sums += np.bincount(bins, weights=sqdiff.sum(axis=1), minlength=nbins)
+        counts += np.bincount(bins, weights=n, minlength=nbins)
+        lagsums += np.bincount(bins, weights=n * lags, minlength=nbins)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        gamma = 0.5 * sums / counts
+        lags = lagsums / counts
+    return lags, gamma, counts.astype(np.intp)
+
+
+def fit_variogram(lags, gamma, counts=None, model='Exp', nugget=True):
+    r"""Fit a covariance model to an empirical variogram
+
+    The semivariogram :math:`\gamma(h) = n + s - C(h)` of the covariance
+    model :math:`C` with sill :math:`s` and nugget :math:`n` is fitted by
+    least squares weighted by the number of pairs in each lag class.
+
+    .. versionadded:: 0.11.0
+
+    Parameters
+    ----------
+    lags : :class:`numpy:numpy.ndarray`
+        lag distances, e.g. from :func:`empirical_variogram`
+    gamma : :class:`numpy:numpy.ndarray`
+        semivariances at `lags`
+    counts : :class:`numpy:numpy.ndarray`
+        number of pairs per lag class, defaults to equal weights
+    model : string
+        one of 'Lin', 'Sph', 'Exp', 'Gau', 'Mat' or 'Cau'
+    nugget : bool
+        fit a nugget effect
+
+    Returns
+    -------
+    cov_model : string
+        covariance model string suitable for :func:`parse_covariogram`,
+        e.g. '0.1 Nug(0.0) + 1.3 Exp(2500.0)'
+    """
+    if model not in _VARIOGRAM_MODELS:
+        raise ValueError("wradlib: Unknown covariance model '{0}', must be "
+                         "one of {1}.".format(model,
+                                              sorted(_VARIOGRAM_MODELS)))
+    func, shape_bounds = _VARIOGRAM_MODELS[model]
+    lags = np.asarray(lags, dtype=np.float64)
+    gamma = np.asarray(gamma, dtype=np.float64)
+    if counts is None:
+        counts = np.ones_like(gamma)
+    counts = np.asarray(counts, dtype=np.float64)
+    valid = np.isfinite(gamma) & np.isfinite(lags) & (counts > 0)
+    lags, gamma, counts = lags[valid], gamma[valid], counts[valid]
+    nparams = 2 + len(shape_bounds)
+    if len(gamma) < nparams + int(nugget):
+        raise ValueError("wradlib: Not enough lag classes to fit the "
+                         "variogram.")
+
+    def variogram(h, *params):
+        if nugget:
+            nug, params = params[0], params[1:]
+        else:
+            nug = 0.
+        return nug + params[0] - func(h, *params)
+
+    gmax = gamma.max()
+    p0 = [gmax, lags.max() / 3.]
+    lower = [0., lags.max() * 1e-6]
+    upper = [np.inf, np.inf]
+    for lo, up in shape_bounds:
+        p0.append(min(max(1., lo), up))
+        lower.append(lo)
+        upper.append(up)
+    if nugget:
+        p0 = [0.1 * gmax] + p0
+        p0[1] = 0.9 * gmax
+        lower = [0.] + lower
+        upper = [np.inf] + upper
+    params, _ = curve_fit(variogram, lags, gamma, p0=p0,
+                          sigma=1. / np.sqrt(counts), bounds=(lower, upper))
+
+    def fmt(x):
+        return np.format_float_positional(x, precision=10, trim='0')
+
+    parts = []
+    if nugget:
+        parts.append('{0} Nug(0.0)'.format(fmt(params[0])))
+        params = params[1:]
+    parts.append('{0} {1}({2})'.format(fmt(params[0]), model,
+                                       fmt(params[1])))
+    parts[-1] += ''.join(['^' + fmt(p) for p in params[2:]])
+    return ' + '.join(parts)
+
+
+def _check_kriging_kwargs(name, kwargs):
+    """Rejects keyword arguments of :func:`wradlib.util.query_tree` which
+    the kriging interpolators do not support."""
+    if 'distance_upper_bound' in kwargs:
+        raise ValueError("wradlib.ipol.{0}: <distance_upper_bound> is not "
+                         "supported, the kriging systems need <nnearest> "
+                         "neighbours for each target.".format(name))
+
+
+# maximum number of matrix elements of the kriging systems solved at once
+_MAX_KRIGING_ELEMENTS = 2 ** 22
+
+
+def _distance_matrices(src):
+    """Calculates the pairwise distances for stacked configurations of
+    source points of shape (..., npoints, ndims)."""
+    diff = src[..., :, np.newaxis, :] - src[..., np.newaxis, :, :]
+    return np.sqrt(np.sum(diff ** 2, axis=-1))
+
+
+def _solve_kriging_matrices(matrix, rhs):
+    """Solves stacked kriging systems with matrices of shape (n, m, m) for
+    right hand sides of shape (n, m, k) by means of LU decomposition.
+
+    Each matrix is factorized once for all of its `k` right hand sides.
+    Returns the solutions of shape (n, m, k) and a boolean array of shape (n,)
+    which flags the singular matrices. The solutions of singular systems are
+    set to np.nan.
+    """
+    try:
+        solution = np.linalg.solve(matrix, rhs)
+        singular = np.zeros(len(matrix), dtype=bool)
+    except np.linalg.LinAlgError:
+        # at least one matrix is singular, so we have to find out which
+        solution = np.full(rhs.shape, np.nan)
+        singular = np.ones(len(matrix), dtype=bool)
+        for i, (m, r) in enumerate(zip(matrix, rhs)):
+            try:
+                solution[i] = np.linalg.solve(m, r)
+                singular[i] = False
+            except np.linalg.LinAlgError:
+                pass
+    return solution, singular
+
+
+def _solve_kriging_systems(ix, dists, size, matrix_func, rhs_func, sill):
+    """Solves the kriging systems of all targets.
+
+    Targets with identical sets of neighbours share the same kriging matrix.
+    Therefore, the matrix of each distinct neighbour set is factorized only
+    once and solved for the right hand sides of all of its targets.
+
+    Parameters
+    ----------
+    ix : ndarray of int, shape (numtargets, nnearest)
+        indices of the neighbouring source points of each target
+    dists : ndarray of float, shape (numtargets, nnearest)
+        distances of each target to its neighbouring source points
+    size : int
+        size of the kriging systems
+    matrix_func : callable
+        sets up the kriging matrices of shape (n, size, size) given the
+        neighbour sets of shape (n, nnearest)
+    rhs_func : callable
+        sets up the right hand sides of shape (n, size) given the distances
+        of shape (n, nnearest) and the indices of the targets
+    sill : float
+        covariance at separation distance 0
+
+    Returns
+    -------
+    weights : ndarray of float, shape (numtargets, size)
+        kriging weights in the order of `ix` followed by the lagrange
+        multipliers
+    variance : ndarray of float, shape (numtargets,)
+        kriging estimation variance
+    singular : ndarray of bool, shape (numtargets,)
+        flags the targets with singular kriging systems
+    """
+    numtargets, nnearest = ix.shape
+    # identify distinct neighbour sets by sorting the neighbours by index
+    order = np.argsort(ix, axis=1)
+    rows = np.arange(numtargets)[:, np.newaxis]
+    sets, group = np.unique(ix[rows, order], axis=0, return_inverse=True)
+    group = group.ravel()
+    # targets sorted by group, so that the targets of each group are found
+    # in a contiguous slice
+    trg_order = np.argsort(group, kind='mergesort')
+    bounds = np.searchsorted(group[trg_order], np.arange(len(sets) + 1))
+    counts = np.diff(bounds)
+    # the right hand sides of each chunk of neighbour sets are padded to the
+    # largest number of targets in the chunk, so the sets are processed in
+    # the order of decreasing number of targets
+    set_order = np.argsort(-counts, kind='mergesort')
+
+    weights = np.empty((numtargets, size))
+    variance = np.empty(numtargets)
+    singular = np.empty(numtargets, dtype=bool)
+    start = 0
+    while start < len(sets):
+        ntrg = counts[set_order[start]]
+        step = max(1, _MAX_KRIGING_ELEMENTS // (size * (size + ntrg)))
+        gix = set_order[start:start + step]
+        start += step
+        # targets of the chunk, their set within the chunk and their column
+        # in the right hand side matrix of their set
+        gcounts = counts[gix]
+        offsets = np.repeat(np.cumsum(gcounts) - gcounts, gcounts)
+        col = np.arange(gcounts.sum()) - offsets
+        tgroup = np.repeat(np.arange(len(gix)), gcounts)
+        tix = trg_order[np.repeat(bounds[gix], gcounts) + col]
+        torder = order[tix]
+        trows = np.arange(len(tix))[:, np.newaxis]
+        rhs = rhs_func(dists[tix][trows, torder], tix)
+        stacked = np.zeros((len(gix), size, ntrg))
+        stacked[tgroup, :, col] = rhs
+        # factorize the kriging matrices once per neighbour set
+        solution, sing = _solve_kriging_matrices(matrix_func(sets[gix]),
+                                                 stacked)
+        w = solution[tgroup, :, col]
+        variance[tix] = sill - np.sum(w * rhs, axis=-1)
+        singular[tix] = sing[tgroup]
+        # restore the original order of the neighbours
+        w[trows, torder] = w[:, :nnearest].copy()
+        weights[tix] = w
+    return weights, variance, singular
+
+
 class OrdinaryKriging(IpolBase):
     r"""
     OrdinaryKriging(src, trg, cov='1.0 Exp(10000.)', nnearest=12)
@@ -551,6 +1009,12 @@ class OrdinaryKriging(IpolBase):
         uses.
     nnearest : integer - max. number of neighbours to be considered
 
+    Keyword Arguments
+    -----------------
+    **kwargs : keyword arguments of :func:`wradlib.util.query_tree`, i.e.
+        `workers`, `chunksize`, `dtype` or `ix_dtype`
+        (`distance_upper_bound` is not supported)
+
     Note
     ----
     The class calculates the Kriging weights during initialization, because
@@ -562,14 +1026,17 @@ class OrdinaryKriging(IpolBase):
     different from that of the Idw or Nearest Interpolators.
 
     After initialization the estimation variance at each interpolation target
-    may be retrieved from the attribute `estimation_variance`.
+    may be retrieved from the attribute `estimation_variance`. Targets with
+    a singular kriging system are flagged in the attribute `singular`, their
+    weights and estimation variances are set to np.nan.
 
     Examples
     --------
     See :ref:`notebooks/interpolation/wradlib_ipol_example.ipynb`.
     """
 
-    def __init__(self, src, trg, cov='1.0 Exp(10000.)', nnearest=12):
+    def __init__(self, src, trg, cov='1.0 Exp(10000.)', nnearest=12,
+                 **kwargs):
         """"""
         self.src = self._make_coord_arrays(src)
         self.trg = self._make_coord_arrays(trg)
@@ -592,51 +1059,52 @@ class OrdinaryKriging(IpolBase):
         else:
             self.nnearest = nnearest
         # plant a tree
-        self.tree = cKDTree(src)
-        self.dists, self.ix = self.tree.query(trg, k=self.nnearest)
+        _check_kriging_kwargs(self.__class__.__name__, kwargs)
+        self.tree = util.get_tree(src, owner=self)
+        self.dists, self.ix = util.query_tree(self.tree, trg, k=self.nnearest,
+                                              **kwargs)
         # avoid bug, if there is only one neighbor at all
         if self.dists.ndim == 1:
             self.dists = self.dists[:, np.newaxis]
             self.ix = self.ix[:, np.newaxis]
         # parse covariogram function string
         self.cov_func = parse_covariogram(cov)
-        self.weights = []
-        self.estimation_variance = []
         # do the kriging
         self._krige()
 
     def _krig_matrix(self, src):
-        """Sets up the kriging system for a configuration of source points.
+        """Sets up the kriging systems for stacked configurations of source
+        points of shape (..., npoints, ndims).
         """
-        var_matrix = self.cov_func(scipy.spatial.distance_matrix(src, src))
+        var_matrix = self.cov_func(_distance_matrices(src))
 
-        ok_matrix = np.ones((len(src) + 1, len(src) + 1))
+        n = src.shape[-2]
+        ok_matrix = np.ones(src.shape[:-2] + (n + 1, n + 1))
 
-        ok_matrix[:-1, :-1] = var_matrix
-        ok_matrix[-1, -1] = 0.
+        ok_matrix[..., :-1, :-1] = var_matrix
+        ok_matrix[..., -1, -1] = 0.
 
         return ok_matrix
 
     def _krig_rhs(self, dists):
-        """Sets up a right hand side of the kriging system given the distances
-        of the target to the source points. To be used in conjunction with
-        `_krig_matrix`."""
-        rhs = self.cov_func(dists)
-        ok_rhs = np.concatenate([rhs, [1.]])
+        """Sets up the right hand sides of the kriging systems given the
+        distances of shape (..., npoints) of the targets to the source points.
+        To be used in conjunction with `_krig_matrix`."""
+        ok_rhs = np.ones(dists.shape[:-1] + (dists.shape[-1] + 1,))
+        ok_rhs[..., :-1] = self.cov_func(dists)
 
         return ok_rhs
 
     def _krige(self):
-        """Sets up the kriging system and solves it in order to obtain the
+        """Sets up the kriging systems and solves them in order to obtain the
         interpolation weights of ordinary kriging.
         Also calculates the kriging estimation variance from the results"""
-        for dist, ix in zip(self.dists, self.ix):
-            matrix = self._krig_matrix(self.src[ix, :])
-            rhs = self._krig_rhs(dist)
-            weights = np.linalg.solve(matrix, rhs)
-            self.weights.append(weights)
-            self.estimation_variance.append(self.cov_func(0.) -
-                                            np.sum(weights * rhs))
+        (self.weights, self.estimation_variance,
+         self.singular) = _solve_kriging_systems(
+            self.ix, self.dists, self.nnearest + 1,
+            lambda ix: self._krig_matrix(self.src[ix]),
+            lambda dists, trg_ix: self._krig_rhs(dists),
+            self.cov_func(0.))
 
     def __call__(self, vals):
         """
@@ -659,12 +1127,13 @@ class OrdinaryKriging(IpolBase):
         v = self._make_2d(vals)
         self._check_shape(v)
         # calculate estimator
-        weights = np.array(self.weights)
-        ip = np.add.reduce(weights[:, :-1, np.newaxis] * v[self.ix, ...],
-                           axis=1)
+        ip = np.einsum('ij,ij...->i...', self.weights[:, :-1], v[self.ix])
 
         return ip
 
+    def _get_ix_weights(self):
+        return self.ix, self.weights[:, :-1]
+
 
 class ExternalDriftKriging(IpolBase):
     """
@@ -689,6 +1158,12 @@ class ExternalDriftKriging(IpolBase):
     trg_drift : ndarray of floats, shape (ntrgpoints,)
         values of the external drift at each target point
 
+    Keyword Arguments
+    -----------------
+    **kwargs : keyword arguments of :func:`wradlib.util.query_tree`, i.e.
+        `workers`, `chunksize`, `dtype` or `ix_dtype`
+        (`distance_upper_bound` is not supported)
+
     See Also
     --------
     OrdinaryKriging
@@ -698,7 +1173,10 @@ class ExternalDriftKriging(IpolBase):
     After calling the object in order to get the interpolated values,
     the estimation variance of the system may be
     retrieved from the attribute `estimation_variance`. Accordingly, the
-    interpolation weights can be retrieved from the attribute `weights`
+    interpolation weights can be retrieved from the attribute `weights` and
+    the targets with a singular kriging system from the attribute `singular`.
+    In case of drifts varying over multiple fields, these attributes get an
+    additional leading dimension corresponding to the fields.
 
     If drift_src or drift_trg are not given on initialization, they must
     be provided when using the __call__ method.
@@ -708,7 +1186,7 @@ class ExternalDriftKriging(IpolBase):
     """
 
     def __init__(self, src, trg, cov='1.0 Exp(10000.)', nnearest=12,
-                 src_drift=None, trg_drift=None):
+                 src_drift=None, trg_drift=None, **kwargs):
         """"""
         self.src = self._make_coord_arrays(src)
         self.trg = self._make_coord_arrays(trg)
@@ -733,8 +1211,10 @@ class ExternalDriftKriging(IpolBase):
         else:
             self.nnearest = nnearest
         # plant a tree
-        self.tree = cKDTree(src)
-        self.dists, self.ix = self.tree.query(trg, k=self.nnearest)
+        _check_kriging_kwargs(self.__class__.__name__, kwargs)
+        self.tree = util.get_tree(src, owner=self)
+        self.dists, self.ix = util.query_tree(self.tree, trg, k=self.nnearest,
+                                              **kwargs)
         # avoid bug, if there is only one neighbor at all
         if self.dists.ndim == 1:
             self.dists = self.dists[:, np.newaxis]
@@ -743,55 +1223,53 @@ class ExternalDriftKriging(IpolBase):
         self.cov_func = parse_covariogram(cov)
         self.weights = []
         self.estimation_variance = []
+        self.singular = []
 
     def _krig_matrix(self, src, drift):
-        """Sets up the kriging system for a configuration of source points.
+        """Sets up the kriging systems for stacked configurations of source
+        points of shape (..., npoints, ndims) and their drifts of shape
+        (..., npoints).
         """
         # the basic covariance matrix
-        var_matrix = self.cov_func(scipy.spatial.distance_matrix(src, src))
+        var_matrix = self.cov_func(_distance_matrices(src))
         # the extended matrix, initialized to ones
-        edk_matrix = np.ones((len(src) + 2, len(src) + 2))
+        n = src.shape[-2]
+        edk_matrix = np.ones(src.shape[:-2] + (n + 2, n + 2))
 
         # adding entries for the first lagrange multiplier for the ordinary
         # kriging part
-        edk_matrix[:-2, :-2] = var_matrix
-        edk_matrix[-2, -2] = 0.
+        edk_matrix[..., :-2, :-2] = var_matrix
+        edk_matrix[..., -2, -2] = 0.
 
         # adding entries for the second lagrange multiplier for the  edk part
-        edk_matrix[:-2, -1] = drift
-        edk_matrix[-1, :-2] = drift
-        edk_matrix[-2:, -1] = 0.
-        edk_matrix[-1, -2:] = 0.
+        edk_matrix[..., :-2, -1] = drift
+        edk_matrix[..., -1, :-2] = drift
+        edk_matrix[..., -2:, -1] = 0.
+        edk_matrix[..., -1, -2:] = 0.
 
         return edk_matrix
 
     def _krig_rhs(self, dists, drift):
-        """Sets up a right hand side of the kriging system given the distances
-        of the target to the source points. To be used in conjunction with
+        """Sets up the right hand sides of the kriging systems given the
+        distances of shape (..., npoints) of the targets to the source points
+        and the target drifts of shape (...). To be used in conjunction with
         `_krig_matrix`."""
-        rhs = self.cov_func(dists)
-        edk_rhs = np.concatenate([rhs, np.array([1., drift])])
+        edk_rhs = np.ones(dists.shape[:-1] + (dists.shape[-1] + 2,))
+        edk_rhs[..., :-2] = self.cov_func(dists)
+        edk_rhs[..., -1] = drift
 
         return edk_rhs
 
     def _krige(self, src_drift, trg_drift):
-        """Sets up the kriging system and solves it in order to obtain the
-        interpolation weights of ordinary kriging.
+        """Sets up the kriging systems and solves them in order to obtain the
+        interpolation weights of external drift kriging.
         Also calculates the kriging estimation variance from the results"""
-        all_weights = []
-        estimation_variances = []
-        for dist, ix, td in zip(self.dists, self.ix, trg_drift):
-            matrix = self._krig_matrix(self.src[ix, :], src_drift[ix])
-            rhs = self._krig_rhs(dist, td)
-            try:
-                weights = np.linalg.solve(matrix, rhs)
-            except np.linalg.LinAlgError:
-                weights = np.repeat(np.nan, len(rhs))
-            all_weights.append(weights)
-            estimation_variances.append(self.cov_func(0.) -
-                                        np.sum(weights * rhs))
-
-        return all_weights, estimation_variances
+        trg_drift = np.broadcast_to(trg_drift, (self.numtargets,))
+        return _solve_kriging_systems(
+            self.ix, self.dists, self.nnearest + 2,
+            lambda ix: self._krig_matrix(self.src[ix], src_drift[ix]),
+            lambda dists, trg_ix: self._krig_rhs(dists, trg_drift[trg_ix]),
+            self.cov_func(0.))
 
     def __call__(self, vals, src_drift=None, trg_drift=None):
         """
@@ -834,38 +1312,212 @@ class ExternalDriftKriging(IpolBase):
         trg_d = self._make_2d(trg_drift)
         self._check_shape(src_d)
 
-        # re-initialize weights and variances to ensure that these only reflect
-        # the results of the current call and not any previous call
-        self.weights = []
-        self.estimation_variance = []
-
         # if drifts are constant, we can save time by solving the kriging
         # system once
         if src_d.shape[1] == 1:
-            wght, variances = self._krige(src_d.squeeze(), trg_d.squeeze())
-            self.weights = wght
-            self.estimation_variance = variances
-            weights = np.array(self.weights)
-            ip = np.add.reduce(weights[:, :-2, np.newaxis] * v[self.ix, ...],
-                               axis=1)
+            (self.weights, self.estimation_variance,
+             self.singular) = self._krige(src_d[:, 0], trg_d[:, 0])
+            ip = np.einsum('ij,ij...->i...', self.weights[:, :-2],
+                           v[self.ix])
         # otherwise we need to setup and solve the kriging system for each
         # field individually
         else:
-            ip = np.empty((self.trg.shape[0], v.shape[1]))
             assert ((v.shape[1] == src_d.shape[1]) and
                     (v.shape[1] == trg_d.shape[1]))
-            for i in range(v.shape[1]):
-                wght, variances = self._krige(src_d[:, i].squeeze(),
-                                              trg_d[:, i].squeeze())
-
-                weights = np.array(wght)
-                ip[:, i] = np.add.reduce(weights[:, :-2] * v[self.ix, i],
-                                         axis=1)
-                self.weights.append(weights)
-                self.estimation_variance.append(variances)
+            nfields = v.shape[1]
+            ip = np.empty((self.numtargets, nfields))
+            # re-initialize weights and variances to ensure that these only
+            # reflect the results of the current call
+            self.weights = np.empty((nfields, self.numtargets,
+                                     self.nnearest + 2))
+            self.estimation_variance = np.empty((nfields, self.numtargets))
+            self.singular = np.empty((nfields, self.numtargets), dtype=bool)
+            for i in range(nfields):
+                (self.weights[i], self.estimation_variance[i],
+                 self.singular[i]) = self._krige(src_d[:, i], trg_d[:, i])
+                ip[:, i] = np.sum(self.weights[i, :, :-2] * v[self.ix, i],
+                                  axis=1)
 
         return ip
 
+    def _get_ix_weights(self):
+        if len(self.weights) == 0:
+            # weights have not been calculated by a call, yet
+            if self.src_drift is None or self.trg_drift is None:
+                raise ValueError('src_drift and trg_drift must be specified '
+                                 'on initialization in order to obtain the '
+                                 'sparse operator before calling the '
+                                 'interpolator.')
+            src_d = self._make_2d(self.src_drift)
+            trg_d = self._make_2d(self.trg_drift)
+            if src_d.shape[1] == 1:
+                (self.weights, self.estimation_variance,
+                 self.singular) = self._krige(src_d[:, 0], trg_d[:, 0])
+        if np.ndim(self.weights) != 2:
+            raise ValueError('The sparse operator of ExternalDriftKriging is '
+                             'only available for drifts which are constant '
+                             'over all fields.')
+        return self.ix, self.weights[:, :-2]
+
+
+class SparseOperator(IpolBase):
+    """
+    SparseOperator(operator)
+
+    Interpolation by means of a sparse linear operator as obtained from
+    :meth:`IpolBase.to_sparse`.
+
+    Parameters
+    ----------
+    operator : :class:`scipy:scipy.sparse.spmatrix`
+        sparse matrix of shape (numtargets, numsources)
+
+    See Also
+    --------
+    from_sparse
+
+    """
+
+    def __init__(self, operator):
+        self.operator = csr_matrix(operator)
+        self.numtargets, self.numsources = self.operator.shape
+
+    def __call__(self, vals):
+        """
+        Evaluate interpolator for values given at the source points.
+
+        Parameters
+        ----------
+        vals : ndarray of float, shape (numsourcepoints, ...)
+            Values at the source points which to interpolate
+
+        Returns
+        -------
+        output : ndarray of float with shape (numtargetpoints,...)
+
+        """
+        self._check_shape(vals)
+        vals = np.asanyarray(vals)
+        ip = self.operator.dot(vals.reshape(self.numsources, -1))
+        return ip.reshape((self.numtargets,) + vals.shape[1:])
+
+    def to_sparse(self):
+        return self.operator
+
+
+def _leave_one_out(Interpolator, src, **kwargs):
+    """INTERNAL: Returns a SparseOperator which estimates the value at each
+    source point from all other source points (leave-one-out).
+
+    The neighbours of all source points are queried at once and the source
+    point itself is dropped from its neighbours. For Idw and Nearest, the
+    weights are computed from the remaining neighbours. For OrdinaryKriging
+    with all other points as neighbours, the closed form of the
+    leave-one-out estimates (Dubrule 1983) is used, which requires only one
+    factorization of the kriging matrix of all source points.
+
+    Returns None if this is not implemented for `Interpolator`.
+    """
+    src = IpolBase._make_coord_arrays(src)
+    numsources = len(src)
+    if numsources < 2:
+        return None
+    if Interpolator is Nearest:
+        nnearest = 1
+    elif Interpolator is Idw:
+        nnearest = kwargs.pop('nnearest', 4)
+        p = kwargs.pop('p', 2.)
+    elif Interpolator is OrdinaryKriging:
+        cov = kwargs.pop('cov', '1.0 Exp(10000.)')
+        nnearest = kwargs.pop('nnearest', 12)
+        _check_kriging_kwargs('OrdinaryKriging', kwargs)
+        if nnearest >= numsources - 1:
+            return _leave_one_out_kriging(src, cov)
+    else:
+        return None
+    nnearest = min(nnearest, numsources - 1)
+    dists, ix = util.query_tree(util.get_tree(src), src, k=nnearest + 1,
+                                **kwargs)
+    # drop the source point itself (or the farthest neighbour, in case the
+    # point is not found among the neighbours due to duplicate points)
+    itself = ix == np.arange(numsources)[:, np.newaxis]
+    drop = np.where(np.any(itself, axis=1), np.argmax(itself, axis=1),
+                    nnearest)
+    keep = np.ones(ix.shape, dtype=bool)
+    keep[np.arange(numsources), drop] = False
+    dists = dists[keep].reshape((numsources, nnearest))
+    ix = ix[keep].reshape((numsources, nnearest))
+    if Interpolator is OrdinaryKriging:
+        ip = OrdinaryKriging.__new__(OrdinaryKriging)
+        ip.src, ip.cov_func = src, parse_covariogram(cov)
+        ip.dists, ip.ix, ip.nnearest = dists, ix, nnearest
+        ip._krige()
+        weights = ip.weights[:, :-1]
+    else:
+        ip = Idw.__new__(Idw)
+        ip.dists, ip.nnearest = dists, nnearest
+        ip.p = 1. if Interpolator is Nearest else p
+        weights = ip._get_weights()
+    # neighbours beyond distance_upper_bound do not contribute, points
+    # without any neighbour yield np.nan
+    missing = ix == numsources
+    weights = np.where(missing, 0., weights)
+    weights[np.all(missing, axis=1), 0] = np.nan
+    ix = np.where(missing, 0, ix)
+    rows = np.repeat(np.arange(numsources), nnearest)
+    return SparseOperator(csr_matrix((weights.ravel(), (rows, ix.ravel())),
+                                     shape=(numsources, numsources)))
+
+
+def _leave_one_out_kriging(src, cov):
+    """INTERNAL: Closed form leave-one-out estimates of ordinary kriging with
+    global neighbourhood, returns None if the kriging matrix is singular."""
+    ip = OrdinaryKriging.__new__(OrdinaryKriging)
+    ip.cov_func = parse_covariogram(cov)
+    try:
+        inverse = np.linalg.inv(ip._krig_matrix(src))
+    except np.linalg.LinAlgError:
+        return None
+    numsources = len(src)
+    # the leave-one-out residual of point i is (A^-1 z)_i / (A^-1)_ii
+    weights = -inverse[:numsources, :numsources]
+    weights /= np.diag(inverse)[:numsources, np.newaxis]
+    np.fill_diagonal(weights, 0.)
+    return SparseOperator(weights)
+
+
+def from_sparse(operator):
+    """
+    Creates an interpolator from a sparse linear operator
+
+    Parameters
+    ----------
+    operator : :class:`scipy:scipy.sparse.spmatrix`, string or file-like
+        sparse matrix of shape (numtargets, numsources) as obtained from
+        :meth:`IpolBase.to_sparse` or the file (name, path or file object)
+        to which such an operator has been saved by
+        :func:`scipy:scipy.sparse.save_npz`
+
+    Returns
+    -------
+    ip : :class:`SparseOperator`
+
+    Examples
+    --------
+    >>> import scipy.sparse
+    >>> src = np.arange(10)[:, None]
+    >>> trg = np.linspace(0, 9, 40)[:, None]
+    >>> op = Idw(src, trg, nnearest=2).to_sparse()
+    >>> scipy.sparse.save_npz('idw_operator.npz', op)  # doctest: +SKIP
+    >>> ip = from_sparse('idw_operator.npz')  # doctest: +SKIP
+    >>> ip = from_sparse(op)
+    >>> result = ip(np.sin(src))
+
+    """
+    if not issparse(operator):
+        operator = load_npz(operator)
+    return SparseOperator(operator)
+
 
 # -----------------------------------------------------------------------------
 # Wrapper functions
@@ -892,14 +1544,20 @@ def interpolate(src, trg, vals, Interpolator, *args, **kwargs):
     care of the remaining np.nan in your interpolation result. This is done by
     this convenience function.
 
+    For :class:`Nearest` and :class:`Idw`, the neighbours are queried only
+    once, including as many additional neighbours as there are missing
+    values in a field (up to 32). The weights are then
+    renormalized over the valid neighbours of each field. Fields with more
+    missing values and all fields of other interpolators are interpolated
+    again from the valid source points, once for each distinct pattern of
+    missing values. For interpolators other than :class:`Nearest` and
+    :class:`Idw`, only the targets which are affected by missing values are
+    interpolated again.
+
     Alternatively, you have to make sure that your *vals* argument does not
     contain any *np.nan* values OR you have to post-process missing values in
     your interpolation result in another way.
 
-    Warning
-    -------
-    Works only for one- and two-dimensional *vals* arrays, yet.
-
     Parameters
     ----------
     src : ndarray of floats, shape (npoints, ndims)
@@ -933,41 +1591,134 @@ def interpolate(src, trg, vals, Interpolator, *args, **kwargs):
     >>> line2 = plt.plot(src, vals, 'ro')
 
     """
-    if vals.ndim == 1:
-        # source values are one dimensional, we have just
+    vals = np.asanyarray(vals)
+    v = vals.reshape(len(vals), -1)
+    valid = np.isfinite(v)
+    if np.all(valid):
+        # no missing values, so we can safely apply the Interpolator as is
+        ip = Interpolator(src, trg, *args, **kwargs)
+        return ip(vals)
+    # distinct patterns of valid source values over all fields
+    patterns, inverse = np.unique(valid, axis=1, return_inverse=True)
+    inverse = inverse.ravel()
+    if patterns.shape[1] == 1:
+        # same valid source values in all fields, we have just
         # to remove invalid data
-        ix_valid = np.where(np.isfinite(vals))[0]
+        ix_valid = np.where(patterns[:, 0])[0]
         ip = Interpolator(src[ix_valid], trg, *args, **kwargs)
         result = ip(vals[ix_valid])
-    elif vals.ndim == 2:
-        # this implementation for 2 dimensions needs generalization
-        ip = Interpolator(src, trg, *args, **kwargs)
-        result = ip(vals)
-        nan_in_result = np.where(np.isnan(result))
-        # nan_in_vals = np.where(np.isnan(vals))
-        for i in np.unique(nan_in_result[-1]):
-            ix_good = np.where(np.isfinite(vals[..., i]))[0]
-            ix_broken_targets = (nan_in_result[0]
-                                 [np.where(nan_in_result[-1] == i)[0]])
-            ip = Interpolator(src[ix_good],
-                              trg[nan_in_result[0]
-                              [np.where(nan_in_result[-1] == i)[0]]],
-                              *args, **kwargs)
-            tmp = ip(vals[ix_good, i].reshape((len(ix_good), -1)))
-            result[ix_broken_targets, i] = tmp.ravel()
     else:
-        if not np.any(np.isnan(vals.ravel())):
-            raise Exception(
-                'At the moment, <interpolate> can only deal with NaN values '
-                'in <vals> if vals has less than 3 dimension.')
+        ip = Interpolator(src, trg, *args, **kwargs)
+        trg = ip._make_coord_arrays(trg)
+        if isinstance(ip, (Nearest, Idw)):
+            result = np.empty((len(trg), v.shape[1]))
+            # patterns with few missing values are interpolated from
+            # additional neighbours, the others from their valid sources
+            near = np.sum(~patterns, axis=0) <= _MAX_EXTRA_NEIGHBOURS
+            _interpolate_valid_neighbours(ip, trg, v, patterns, inverse,
+                                          np.where(near)[0], result)
+            for i in np.where(~near)[0]:
+                cols = np.where(inverse == i)[0]
+                ix_good = np.where(patterns[:, i])[0]
+                if len(ix_good) == 0:
+                    result[:, cols] = np.nan
+                    continue
+                tmp = Interpolator(src[ix_good], trg, *args,
+                                   **kwargs)(v[np.ix_(ix_good, cols)])
+                result[:, cols] = tmp.reshape(len(trg), len(cols))
+            if isinstance(ip, Idw):
+                result = result.astype('f4')
         else:
-            # if no NaN value are in <vals> we can safely apply the
-            # Interpolator as is
-            ip = Interpolator(src, trg, *args, **kwargs)
-            result = ip(vals[ix_valid])
+            result = ip(v)
+            # interpolate the affected targets again from the valid sources
+            for i, pattern in enumerate(patterns.T):
+                cols = np.where(inverse == i)[0]
+                ix_broken = np.where(np.any(np.isnan(result[:, cols]),
+                                            axis=1))[0]
+                if len(ix_broken) == 0 or not np.any(pattern):
+                    continue
+                ix_good = np.where(pattern)[0]
+                ip = Interpolator(src[ix_good], trg[ix_broken],
+                                  *args, **kwargs)
+                tmp = ip(v[np.ix_(ix_good, cols)])
+                result[np.ix_(ix_broken, cols)] = tmp.reshape(len(ix_broken),
+                                                              len(cols))
+        result = result.reshape((len(result),) + vals.shape[1:])
     return result
 
 
+# maximum number of additional neighbours which are queried by
+# :func:`interpolate` to replace missing source values
+_MAX_EXTRA_NEIGHBOURS = 32
+
+
+def _interpolate_valid_neighbours(ip, trg, vals, patterns, inverse, which,
+                                  out):
+    """Evaluates a :class:`Nearest` or :class:`Idw` interpolator using only
+    the valid source values of each field.
+
+    The neighbours are queried once with the query keyword arguments of the
+    interpolator, including as many additional neighbours as there are
+    invalid values in the patterns. Thus, the `nnearest` closest valid
+    neighbours of each target are available in each field, and the weights
+    are renormalized over them. Neighbours beyond `distance_upper_bound`
+    are not used.
+
+    Parameters
+    ----------
+    ip : :class:`Nearest` or :class:`Idw`
+    trg : ndarray of floats, shape (numtargets, ndims)
+    vals : ndarray of float, shape (numsources, numfields)
+    patterns : ndarray of bool, shape (numsources, numpatterns)
+        distinct patterns of valid source values
+    inverse : ndarray of int, shape (numfields,)
+        pattern index of each field
+    which : ndarray of int
+        indices of the patterns to evaluate
+    out : ndarray of float, shape (numtargets, numfields)
+        output array, the fields of the patterns `which` are written
+    """
+    if len(which) == 0:
+        return
+    nnearest = getattr(ip, 'nnearest', 1)
+    # number of neighbours needed by each pattern
+    kpattern = np.minimum(nnearest + np.sum(~patterns, axis=0),
+                          ip.numsources)
+    dists, ix = util.query_tree(ip.tree, trg, k=np.max(kpattern[which]),
+                                **ip._query_kwargs)
+    if dists.ndim == 1:
+        dists = dists[:, np.newaxis]
+        ix = ix[:, np.newaxis]
+    # missing neighbours point to an additional invalid source
+    vals = np.concatenate([vals, np.zeros((1, vals.shape[1]))])
+    patterns = np.concatenate([patterns,
+                               np.zeros((1, patterns.shape[1]), dtype=bool)])
+    rows = np.arange(len(ix))
+    for i in which:
+        cols = np.where(inverse == i)[0]
+        k = kpattern[i]
+        pdists, pix = dists[:, :k], ix[:, :k]
+        # use the nnearest closest valid neighbours
+        use = patterns[pix, i] & np.isfinite(pdists)
+        use &= np.cumsum(use, axis=1) <= nnearest
+        if nnearest == 1:
+            # defaults to nearest neighbour
+            weights = use.astype(np.float64)
+        else:
+            # weight z values by (1/dist)**p --
+            with np.errstate(divide='ignore'):
+                weights = np.where(use, 1. / pdists ** ip.p, 0.)
+            # if a target point coincides with a valid source point
+            first = np.argmax(use, axis=1)
+            coincident = (pdists[rows, first] < 1e-10) & use[rows, first]
+            weights[coincident] = 0.
+            weights[coincident, first[coincident]] = 1.
+        with np.errstate(invalid='ignore'):
+            weights /= np.sum(weights, axis=1, keepdims=True)
+        nbvals = np.where(use[..., np.newaxis], vals[:, cols][pix], 0.)
+        out[:, cols] = np.einsum('ij,ijk->ik', weights, nbvals)
+
+
 def interpolate_polar(data, mask=None, Interpolator=Nearest):
     """
     Convenience function to interpolate polar data
@@ -1049,6 +1800,198 @@ def interpolate_polar(data, mask=None, Interpolator=Nearest):
     return filled_data.reshape(data.shape[0], data.shape[1])
 
 
+class PolarFiller():
+    """
+    PolarFiller(shape, Interpolator=Nearest, nnearest=12, **kwargs)
+
+    Fill masked bins of polar data, reusing the sweep geometry
+
+    The cartesian bin coordinates (same geometry as in
+    :func:`interpolate_polar`) and a KD-tree over all bins are computed once.
+    On each call, only the masked bins and their neighbourhood of
+    `nnearest` unmasked bins are considered, so the cost scales with the
+    number of masked bins instead of the sweep size. Masked bins which
+    cannot be interpolated (e.g. outside the triangulation of
+    :class:`Linear`) are filled by nearest neighbour interpolation.
+
+    .. versionadded:: 0.11.0
+
+    Parameters
+    ----------
+    shape : tuple
+        shape (azimuth, ranges) of the sweeps to fill
+    Interpolator : a class which inherits from IpolBase
+    nnearest : int
+        number of unmasked bins in the neighbourhood of each masked bin which
+        are passed to the Interpolator as sources, is increased to the
+        `nnearest` keyword argument of the Interpolator if that is larger
+
+    Keyword Arguments
+    -----------------
+    **kwargs : keyword arguments of the Interpolator
+
+    Examples
+    --------
+    >>> import numpy as np  # noqa
+    >>> import wradlib as wrl
+    >>> data = np.arange(24.).reshape(2, 4, 3)
+    >>> mask = (data == 2) | (data == 9) | (data == 20)
+    >>> filler = wrl.ipol.PolarFiller(data.shape[-2:])
+    >>> filled = filler(data, mask)
+
+    See Also
+    --------
+    interpolate_polar
+    """
+
+    def __init__(self, shape, Interpolator=Nearest, nnearest=12, **kwargs):
+        self.shape = tuple(shape[-2:])
+        self.Interpolator = Interpolator
+        self.kwargs = kwargs
+        self.nnearest = max(nnearest, kwargs.get('nnearest', 1))
+        nrays, nbins = self.shape
+        # construct the ranges and angles for every bin
+        ranges = np.tile(np.arange(0.5, nbins + 0.5), nrays)
+        angles = np.repeat(np.radians(np.arange(0, 360, 360. / nrays)),
+                           nbins)
+        # calculate cartesian coordinates for every bin
+        self.coords = np.column_stack((np.cos(angles) * ranges,
+                                       np.sin(angles) * ranges))
+        self.tree = util.get_tree(self.coords, owner=self)
+
+    def __call__(self, data, mask=None):
+        """
+        Fill the masked bins of data
+
+        Parameters
+        ----------
+        data : ndarray
+            array of shape (..., azimuth, ranges), e.g. a stack of sweeps;
+            if no mask is assigned explicitly, data should be a masked array
+        mask : ndarray
+            boolean array with bins to be filled set to True, must have the
+            same shape as data
+
+        Returns
+        -------
+        filled_data : ndarray
+            copy of data with the masked bins filled
+        """
+        if mask is None:
+            mask = np.ma.getmaskarray(data)
+        mask = np.broadcast_to(mask, data.shape)
+        filled_data = np.array(np.ma.getdata(data))
+        sweeps = filled_data.reshape((-1,) + self.shape)
+        masks = mask.reshape((-1,) + self.shape)
+        for sweep, sweepmask in zip(sweeps, masks):
+            trgix = np.flatnonzero(sweepmask)
+            if not len(trgix):
+                continue
+            sweep = sweep.reshape(-1)
+            srcix = self._get_sources(~sweepmask.ravel(), trgix)
+            src = self.coords[srcix]
+            trg = self.coords[trgix]
+            vals = sweep[srcix]
+            filling = self.Interpolator(src, trg, **self.kwargs)(vals)
+            # fill bins which could not be interpolated with nearest neighbours
+            missing = np.isnan(filling)
+            if np.any(missing):
+                filling[missing] = Nearest(src, trg[missing])(vals)
+            sweep[trgix] = filling.astype(sweep.dtype)
+        return filled_data
+
+    def _get_sources(self, valid, trgix):
+        """INTERNAL: Returns the indices of the valid bins in the neighbourhood
+        of the bins trgix
+        """
+        numbins = len(valid)
+        need = min(self.nnearest, np.count_nonzero(valid))
+        if need == 0:
+            raise MissingSourcesError
+        srcix = []
+        k = min(2 * need, numbins)
+        while len(trgix):
+            ix = util.query_tree(self.tree, self.coords[trgix], k=k)[1]
+            ix = ix.reshape((len(trgix), -1))
+            isvalid = valid[ix]
+            # targets with enough valid neighbours are done
+            done = isvalid.sum(axis=1) >= need
+            srcix.append(ix[done][isvalid[done]])
+            trgix = trgix[~done]
+            k = min(2 * k, numbins)
+        return np.unique(np.concatenate(srcix))
+
+
+def _get_regular_axes(cartgrid, check=True):
+    """INTERNAL: Returns origin and spacing (x0, dx, y0, dy) of a regular grid
+
+    `cartgrid` is either a 3 dimensional array (ny, nx, 2) of coordinates or
+    a tuple of the x coordinates of the columns and the y coordinates of the
+    rows. Returns None if the grid is not regular. With `check=False`, the
+    grid is assumed to be regular and only the corner coordinates are used.
+    """
+    if isinstance(cartgrid, (tuple, list)):
+        x, y = [np.asarray(ax, dtype=np.float64) for ax in cartgrid]
+    else:
+        x = cartgrid[0, :, 0]
+        y = cartgrid[:, 0, 1]
+    axes = []
+    for ax in (x, y):
+        d = (ax[-1] - ax[0]) / max(len(ax) - 1, 1)
+        if check and (d == 0 or not _isclose(np.diff(ax), d, d)):
+            return None
+        axes.extend([ax[0], d if d != 0 else 1.])
+    if check and not isinstance(cartgrid, (tuple, list)):
+        if not (_isclose(cartgrid[..., 0], x, axes[1]) and
+                _isclose(cartgrid[..., 1], y[:, np.newaxis], axes[3])):
+            return None
+    return tuple(axes)
+
+
+def _isclose(a, b, spacing):
+    """INTERNAL: Compare coordinates relative to the grid spacing"""
+    return np.allclose(a, b, rtol=0., atol=1e-6 * abs(spacing))
+
+
+def cart2irregular_index(cartgrid, newgrid):
+    """
+    Compute the fractional (row, column) indices of ``newgrid`` into the
+    regular grid ``cartgrid``
+
+    The indices can be passed as keyword argument ``index`` to
+    :func:`cart2irregular_interp` and :func:`cart2irregular_spline` in order
+    to resample several arrays on the same grids without repeating the
+    computation.
+
+    .. versionadded:: 0.11.0
+
+    Parameters
+    ----------
+    cartgrid : numpy ndarray or tuple
+        3 dimensional array (ny, nx, lon/lat) of floats or a tuple of the
+        x coordinates (nx,) of the columns and the y coordinates (ny,) of
+        the rows of a regular grid
+    newgrid : numpy ndarray
+        Nx2 dimensional array (..., lon/lat) of floats
+
+    Returns
+    -------
+    index : numpy ndarray
+        array of shape (2, ...) with the fractional row and column indices
+    """
+    axes = _get_regular_axes(cartgrid)
+    if axes is None:
+        raise ValueError("wradlib: cartgrid is not a regular grid.")
+    return _get_fractional_index(axes, newgrid)
+
+
+def _get_fractional_index(axes, newgrid):
+    """INTERNAL: Compute fractional indices of newgrid from grid axes"""
+    x0, dx, y0, dy = axes
+    return np.stack(((newgrid[..., 1] - y0) / dy,
+                     (newgrid[..., 0] - x0) / dx))
+
+
 def cart2irregular_interp(cartgrid, values, newgrid, **kwargs):
     """
     Interpolate array ``values`` defined by cartesian coordinate array
@@ -1057,18 +2000,31 @@ def cart2irregular_interp(cartgrid, values, newgrid, **kwargs):
 
     .. versionadded:: 0.6.0
 
-    Slow for large arrays
+    .. versionchanged:: 0.11.0
+       Regular grids are detected and resampled using index arithmetic for
+       methods 'nearest' and 'linear' (bilinear), accept precomputed
+       ``index``.
+
+    Slow for large irregular arrays and method 'cubic'
 
     Keyword arguments are fed to :func:`scipy:scipy.interpolate.griddata`
 
     Parameters
     ----------
-    cartgrid : numpy ndarray
-        3 dimensional array (nx, ny, lon/lat) of floats;
+    cartgrid : numpy ndarray or tuple
+        3 dimensional array (nx, ny, lon/lat) of floats or a tuple of the
+        x coordinates of the columns and the y coordinates of the rows
     values : numpy 2d-array
         2 dimensional array (nx, ny) of data values
     newgrid : numpy ndarray
-        Nx2 dimensional array (..., lon/lat) of floats
+        Nx2 dimensional array (..., lon/lat) of floats, can be None if
+        ``index`` is given
+
+    Keyword Arguments
+    -----------------
+    index : numpy ndarray
+        fractional indices as returned by :func:`cart2irregular_index`,
+        only for methods 'nearest' and 'linear'
     kwargs : :func:`scipy:scipy.interpolate.griddata`
 
     Returns
@@ -1078,6 +2034,27 @@ def cart2irregular_interp(cartgrid, values, newgrid, **kwargs):
     """
 
     # TODO: dimension checking
+    index = kwargs.pop('index', None)
+    method = kwargs.get('method', 'linear')
+    fill_value = kwargs.get('fill_value', np.nan)
+
+    if method in ['nearest', 'linear']:
+        if index is None:
+            axes = _get_regular_axes(cartgrid)
+            if axes is not None:
+                index = _get_fractional_index(axes, newgrid)
+        if index is not None:
+            return _regular_interp(values, index, method, fill_value)
+    elif index is not None:
+        raise ValueError("wradlib: Precomputed <index> is only supported "
+                         "for methods 'nearest' and 'linear', "
+                         "not '{0}'.".format(method))
+    if newgrid is None:
+        raise ValueError("wradlib: <newgrid> must be given, if no <index> "
+                         "is given.")
+
+    if isinstance(cartgrid, (tuple, list)):
+        cartgrid = np.dstack(np.meshgrid(*cartgrid))
 
     newshape = newgrid.shape[:-1]
 
@@ -1093,6 +2070,27 @@ def cart2irregular_interp(cartgrid, values, newgrid, **kwargs):
     return interp
 
 
+def _regular_interp(values, index, method, fill_value):
+    """INTERNAL: Nearest or bilinear interpolation at fractional indices"""
+    shape = np.array(values.shape[:2]).reshape((2,) + (1,) * (index.ndim - 1))
+    if method == 'nearest':
+        ix = np.clip(np.rint(index), 0, shape - 1).astype(np.intp)
+        return values[ix[0], ix[1]]
+    eps = 1e-6
+    outside = np.any((index < -eps) | (index > shape - 1 + eps), axis=0)
+    index = np.clip(index, 0, shape - 1)
+    ix = np.clip(np.floor(index), 0, np.maximum(shape - 2, 0)).astype(np.intp)
+    t, s = index - ix
+    ix1 = np.minimum(ix + 1, shape - 1)
+    interp = ((values[ix[0], ix[1]] * (1 - s) +
+               values[ix[0], ix1[1]] * s) * (1 - t) +
+              (values[ix1[0], ix[1]] * (1 - s) +
+               values[ix1[0], ix1[1]] * s) * t)
+    if np.any(outside):
+        interp = np.where(outside, fill_value, interp)
+    return interp
+
+
 def cart2irregular_spline(cartgrid, values, newgrid, **kwargs):
     """
     Map array ``values`` defined by cartesian coordinate array ``cartgrid``
@@ -1103,17 +2101,28 @@ def cart2irregular_spline(cartgrid, values, newgrid, **kwargs):
     .. versionchanged:: 0.10.0
        Accept data/coords with origin 'lower' or 'upper'.
 
+    .. versionchanged:: 0.11.0
+       Grid spacing is taken from the grid corners, accept precomputed
+       ``index``.
+
     Keyword arguments are fed through to
     :func:`scipy:scipy.ndimage.map_coordinates`
 
     Parameters
     ----------
-    cartgrid : numpy ndarray
-        3 dimensional array (nx, ny, lon/lat) of floats
+    cartgrid : numpy ndarray or tuple
+        3 dimensional array (nx, ny, lon/lat) of floats or a tuple of the
+        x coordinates of the columns and the y coordinates of the rows
     values : numpy 2d-array
         2 dimensional array (nx, ny) of data values
     newgrid : numpy ndarray
-        Nx2 dimensional array (..., lon/lat) of floats
+        Nx2 dimensional array (..., lon/lat) of floats, can be None if
+        ``index`` is given
+
+    Keyword Arguments
+    -----------------
+    index : numpy ndarray
+        fractional indices as returned by :func:`cart2irregular_index`
     kwargs : :func:`scipy:scipy.ndimage.map_coordinates`
 
     Returns
@@ -1128,33 +2137,17 @@ Read-DEM-Raster-Data`.
     """
 
     # TODO: dimension checking
-    newshape = newgrid.shape[:-1]
-
-    xi = newgrid[..., 0].ravel()
-    yi = newgrid[..., 1].ravel()
-
-    nx = cartgrid.shape[1]
-    ny = cartgrid.shape[0]
-
-    cxmin = np.min(cartgrid[..., 0])
-    cxmax = np.max(cartgrid[..., 0])
-    cymin = np.min(cartgrid[..., 1])
-    cymax = np.max(cartgrid[..., 1])
-
-    # this functionality finds the floating point
-    # indices into the value array (0:nx-1)
-    # can be transferred into separate function
-    # if necessary
-    xi = (nx - 1) * (xi - cxmin) / (cxmax - cxmin)
-
-    # check origin to calculate y index
-    if util.get_raster_origin(cartgrid) is 'lower':
-        yi = (ny - 1) * (yi - cymin) / (cymax - cymin)
-    else:
-        yi = ny - (ny - 1) * (yi - cymin) / (cymax - cymin)
+    index = kwargs.pop('index', None)
+    if index is None:
+        # the floating point indices into the value array are computed from
+        # the grid corners, works for origin 'lower' and 'upper'
+        index = _get_fractional_index(_get_regular_axes(cartgrid,
+                                                        check=False),
+                                      newgrid)
+    newshape = index.shape[1:]
 
     # interpolation by map_coordinates
-    interp = map_coordinates(values, [yi, xi], **kwargs)
+    interp = map_coordinates(values, index.reshape(2, -1), **kwargs)
     interp = interp.reshape(newshape)
 
     return interp
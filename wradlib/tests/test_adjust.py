@@ -4,6 +4,11 @@
 
 import unittest
 
+import numpy as np
+
+import wradlib.adjust as adjust
+import wradlib.ipol as ipol
+
 
 class AdjustBaseTest(unittest.TestCase):
     def test___init__(self):
@@ -22,7 +27,51 @@ class AdjustBaseTest(unittest.TestCase):
         pass
 
     def test_xvalidate(self):
-        pass
+        np.random.seed(42)
+        raw_coords = np.random.uniform(0., 100., (500, 2))
+        obs_coords = np.random.uniform(0., 100., (40, 2))
+        raw = np.random.uniform(0., 10., 500)
+        obs = np.random.uniform(0., 10., 40)
+        obs[[3, 17]] = np.nan
+        for cls in [adjust.AdjustAdd, adjust.AdjustMixed, adjust.GageOnly]:
+            for Ipclass, ipargs in [(ipol.Nearest, {}),
+                                    (ipol.Idw, {'nnearest': 6}),
+                                    (ipol.OrdinaryKriging,
+                                     {'cov': '1.0 Exp(30.)', 'nnearest': 8}),
+                                    (ipol.OrdinaryKriging,
+                                     {'cov': '1.0 Exp(30.)',
+                                      'nnearest': 40})]:
+                # reference: leave out each gage in turn
+                loop = type('Loop', (cls,), {'_vectorized_xvalidate': False})
+                ref = loop(obs_coords, raw_coords, Ipclass=Ipclass,
+                           **ipargs).xvalidate(obs, raw)
+                res = cls(obs_coords, raw_coords, Ipclass=Ipclass,
+                          **ipargs).xvalidate(obs, raw)
+                self.assertTrue(np.allclose(res[0], ref[0], equal_nan=True))
+                self.assertTrue(np.allclose(res[1], ref[1], equal_nan=True,
+                                            atol=1e-5))
+                self.assertEqual(np.isnan(res[1]).sum(), 2)
+
+    def test_batch(self):
+        np.random.seed(42)
+        raw_coords = np.random.uniform(0., 100., (300, 2))
+        obs_coords = np.random.uniform(0., 100., (20, 2))
+        raw = np.random.uniform(0., 10., (12, 300))
+        obs = np.random.uniform(0., 10., (12, 20))
+        obs[np.random.uniform(0., 1., obs.shape) < 0.1] = np.nan
+        obs[3] = np.nan
+        for cls in [adjust.AdjustAdd, adjust.AdjustMultiply,
+                    adjust.AdjustMixed, adjust.AdjustMFB, adjust.GageOnly]:
+            adj = cls(obs_coords, raw_coords, mingages=5)
+            ref = np.array([adj(o, r) for o, r in zip(obs, raw)])
+            self.assertTrue(np.allclose(adj.batch(obs, raw), ref,
+                                        atol=1e-5))
+            out = np.zeros(raw.shape, dtype='f4')
+            res = adj.batch(obs, raw, out=out, chunksize=5)
+            self.assertTrue(res is out)
+            self.assertTrue(np.allclose(out, ref, atol=1e-4))
+        # unadjusted data for time steps without enough gages
+        self.assertTrue(np.allclose(out[3], raw[3]))
 
 
 class AdjustAddTest(unittest.TestCase):
@@ -32,6 +32,132 @@ class TestAttenuation(unittest.TestCase):
         result = atten.calc_attenuation_forward(self.gateset, a, b, l)
         self.assertTrue(np.allclose(result, self.gateset_result))
 
+    def test_calc_attenuation_forward_analytic(self):
+        np.random.seed(42)
+        gateset = np.random.uniform(0., 30., (2, 36, 50))
+        gateset[1, 3, 20] = np.nan
+        loop = atten.calc_attenuation_forward(gateset)
+        result = atten.calc_attenuation_forward(gateset, engine='analytic')
+        self.assertEqual(result.shape, gateset.shape)
+        np.testing.assert_array_equal(np.isnan(result), np.isnan(loop))
+        np.testing.assert_allclose(result, loop, rtol=1e-2, atol=1e-6)
+        # beyond the singularity of the closed-form solution
+        result = atten.calc_attenuation_forward(self.gateset + 20.,
+                                                engine='analytic')
+        self.assertTrue(np.isinf(result[1, 1, -1]))
+        self.assertRaises(ValueError,
+                          lambda: atten.calc_attenuation_forward(
+                              gateset, engine='foo'))
+
+    def test_correctAttenuationHB(self):
+        np.random.seed(42)
+        gateset = np.random.uniform(0., 40., (36, 50))
+        for mode in ['nan', 'zero', 'warn']:
+            loop = atten.correctAttenuationHB(gateset, mode=mode, thrs=45.)
+            result = atten.correctAttenuationHB(gateset, mode=mode, thrs=45.,
+                                                engine='analytic')
+            np.testing.assert_array_equal(np.isnan(result), np.isnan(loop))
+            np.testing.assert_allclose(result, loop, rtol=5e-2, atol=1e-6)
+        pia = atten.correctAttenuationHB(gateset, mode='warn', thrs=30.,
+                                         engine='analytic')
+        result = atten.correctAttenuationHB(gateset, mode='nan', thrs=30.,
+                                            engine='analytic')
+        np.testing.assert_array_equal(np.isnan(result[..., 1:]),
+                                      (gateset + pia)[..., 1:] > 30.)
+        self.assertRaises(atten.AttenuationOverflowError,
+                          lambda: atten.correctAttenuationHB(
+                              gateset, thrs=30., engine='analytic'))
+
+    def test_correctAttenuationKraemer(self):
+        np.random.seed(42)
+        gateset = np.random.uniform(0., 30., (2, 18, 60))
+        gateset[..., 20:40] += np.random.uniform(0., 25., (2, 18, 1))
+        a = 1.67e-4 - np.arange(5) * (1.67e-4 - 2.33e-5) / 4
+        # reference: first admissible a-parameter of each beam
+        pias = np.array([atten.calc_attenuation_forward(gateset, ai, 0.7, 1.)
+                         for ai in a])
+        ok = np.max(gateset + pias, axis=-1) <= 55.
+        ix = np.where(np.any(ok, axis=0), np.argmax(ok, axis=0), len(a) - 1)
+        ref = np.choose(ix[..., None], pias)
+        ref[~np.any(ok, axis=0)] = np.nan
+        result = atten.correctAttenuationKraemer(gateset, n=5, mode='nan',
+                                                 thrs_dBZ=55.)
+        np.testing.assert_array_equal(result, ref)
+        self.assertTrue(np.any(ix > 0))
+
+    def test_correctAttenuationHJ(self):
+        np.random.seed(42)
+        gateset = np.random.uniform(0., 30., (18, 60))
+        gateset[:, 20:40] += np.random.uniform(0., 25., (18, 1))
+        gateset[3, 30] = np.nan
+        result = atten.correctAttenuationHJ(gateset, n=5, mode='cap',
+                                            thrs_dBZ=55., max_PIA=5.)
+        self.assertTrue(np.all(np.isnan(result[3])))
+        self.assertFalse(np.any(np.isnan(np.delete(result, 3, axis=0))))
+        self.assertTrue(np.nanmax(result) <= 5.)
+        ref = atten.correctAttenuationKraemer(np.delete(gateset, 3, axis=0),
+                                              n=5, mode='warn', thrs_dBZ=55.)
+        valid = np.max(ref, axis=-1) <= 5.
+        np.testing.assert_array_equal(np.delete(result, 3, axis=0)[valid],
+                                      ref[valid])
+
+    def test_calc_attenuation_backward(self):
+        np.random.seed(42)
+        gateset = np.random.uniform(0., 30., (2, 3, 40))
+        diagnostics = {'iterations': None}
+        result = atten.calc_attenuation_backward(gateset, 1.67e-4, 0.7, 1.,
+                                                 2., 1e-6, 100,
+                                                 diagnostics=diagnostics)
+        self.assertEqual(result.shape, gateset.shape)
+        self.assertEqual(diagnostics['iterations'].shape, gateset.shape)
+        for ix in np.ndindex(gateset.shape[:-1]):
+            beam = atten.calc_attenuation_backward(gateset[ix][None], 1.67e-4,
+                                                   0.7, 1., 2., 1e-6, 100)
+            np.testing.assert_array_equal(result[ix], beam[0])
+        self.assertRaises(atten.AttenuationIterationError,
+                          lambda: atten.calc_attenuation_backward(
+                              gateset, 1.67e-4, 0.7, 1., 2., 1e-6, 1))
+
+    def test_bisectReferenceAttenuation(self):
+        np.random.seed(42)
+        gateset = np.random.uniform(0., 35., (50, 60))
+        a = np.random.uniform(5e-5, 1.2e-4, 50)
+        pia_ref = atten.calc_attenuation_forward(gateset, a, 0.7, 1.)[:, -1]
+        for dtype in [np.float64, np.float32]:
+            diagnostics = {'hit': None, 'iterations': None, 'niter': None}
+            pia, a_mid, b = atten.bisectReferenceAttenuation(
+                gateset, pia_ref, dtype=dtype, diagnostics=diagnostics)
+            self.assertEqual(pia.dtype, dtype)
+            self.assertTrue(np.all(diagnostics['hit']))
+            self.assertEqual(diagnostics['niter'],
+                             diagnostics['iterations'].max())
+            np.testing.assert_array_less(np.abs(pia[:, -1] - pia_ref), 0.25)
+            np.testing.assert_allclose(
+                atten.calc_attenuation_forward(gateset, a_mid, b, 1.), pia,
+                rtol=1e-4)
+
+    def test_correctAttenuationVolume(self):
+        np.random.seed(42)
+        gateset = np.random.uniform(0., 30., (3, 36, 40))
+        gateset[..., 10:20] += np.random.uniform(0., 30., (3, 36, 1))
+        kwargs = dict(constraints=[atten.constraint_dBZ,
+                                   atten.constraint_pia],
+                      constraint_args=[[55.], [10.]], sector_thr=3)
+        ref = atten.correctAttenuationConstrained2(gateset, **kwargs)
+        result = atten.correctAttenuationVolume(gateset, processes=2,
+                                                **kwargs)
+        np.testing.assert_array_equal(result, ref)
+        ref = atten.correctAttenuationHJ(gateset, thrs_dBZ=55., max_PIA=10.)
+        result = atten.correctAttenuationVolume(gateset,
+                                                atten.correctAttenuationHJ,
+                                                by='sector', nsectors=5,
+                                                processes=2, thrs_dBZ=55.,
+                                                max_PIA=10.)
+        np.testing.assert_array_equal(result, ref)
+        self.assertRaises(ValueError,
+                          lambda: atten.correctAttenuationVolume(
+                              gateset, by='sector', processes=2))
+
     def test_sector_filter_1(self):
         # """test sector filter with odd sector size"""
         # mask = np.array([1,1,0,1,0,1,1,0,1,1,1,0,1], dtype=np.int)
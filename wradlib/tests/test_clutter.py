@@ -37,7 +37,27 @@ class TestClutter(unittest.TestCase):
         pass
 
     def test_filter_gabella_a(self):
-        pass
+        self.filter_setup()
+        np.random.seed(42)
+        noisy = self.img + np.random.uniform(-1, 1, self.img.shape)
+        for img in [self.img, noisy]:
+            for wsize in [3, 7]:
+                # reference by shifted copies of the image
+                nn = wsize // 2
+                ref = -np.ones(img.shape, dtype=int)
+                for sa in range(-nn, nn + 1):
+                    for sr in range(-nn, nn + 1):
+                        ref += img - np.roll(np.roll(img, sa, axis=0), sr,
+                                             axis=1) < 4.
+                ref[:, 0:nn] = wsize ** 2
+                ref[:, -nn:] = wsize ** 2
+                res = cl.filter_gabella_a(img, wsize, 4.)
+                np.testing.assert_array_equal(res, ref)
+                # stacked sweeps
+                res = cl.filter_gabella_a(np.array([img, img[::-1]]),
+                                          wsize, 4.)
+                np.testing.assert_array_equal(res[0], ref)
+                np.testing.assert_array_equal(res[1], ref[::-1])
 
     def test_filter_window_distance(self):
         self.filter_setup()
@@ -52,3 +72,7 @@ class TestClutter(unittest.TestCase):
         result = similar < 0.3
         np.set_printoptions(precision=3)
         self.assertTrue((result == clutter).all())
+        # stacked sweeps
+        res = cl.filter_window_distance(np.array([self.img, self.img]),
+                                        rscale, fsize=300, tr1=4)
+        np.testing.assert_array_equal(res[1], similar)
@@ -4,13 +4,34 @@
 
 import unittest
 
+import numpy as np
+
+import wradlib.comp as comp
+import wradlib.ipol as ipol
+
 
 class ComposeTest(unittest.TestCase):
     def test_extract_circle(self):
         pass
 
     def test_togrid(self):
-        pass
+        np.random.seed(42)
+        src = np.random.uniform(-10., 10., (50, 2))
+        trg = np.random.uniform(-20., 20., (200, 2))
+        data = np.random.uniform(0., 1., 50)
+        res = comp.togrid(src, trg, 10., np.array([0., 0.]), data, ipol.Idw)
+        inside = (trg ** 2).sum(axis=-1) < 100.
+        self.assertTrue(np.all(np.isnan(res[~inside])))
+        self.assertTrue(np.allclose(res[inside],
+                                    ipol.Idw(src, trg[inside])(data)))
+        res2 = comp.togrid(src, trg, 10., np.array([0., 0.]), data, ipol.Idw,
+                           chunksize=7)
+        self.assertTrue(np.allclose(res, res2, equal_nan=True))
+        out = np.zeros(len(trg))
+        res3 = comp.togrid(src, trg, 10., np.array([0., 0.]), data, ipol.Idw,
+                           chunksize=7, out=out)
+        self.assertTrue(res3 is out)
+        self.assertTrue(np.allclose(res, res3, equal_nan=True))
 
     def test_compose_ko(self):
         pass
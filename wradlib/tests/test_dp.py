@@ -3,6 +3,7 @@
 # Distributed under the MIT License. See LICENSE.txt for more info.
 
 import unittest
+from multiprocessing.pool import ThreadPool
 
 import wradlib.dp as dp
 import numpy as np
@@ -17,10 +18,45 @@ class KDPFromPHIDPTest(unittest.TestCase):
         self.phidp_raw[gaps] = np.nan
 
     def test_process_raw_phidp_vulpiani(self):
-        pass
+        np.random.seed(42)
+        phidp = np.cumsum(np.random.uniform(0, 1, (3, 4, 10, 60)), axis=-1)
+        phidp += np.random.uniform(-2, 2, phidp.shape)
+        phidp[np.random.uniform(size=phidp.shape) < 0.1] = np.nan
+        res_phidp, res_kdp = dp.process_raw_phidp_vulpiani(phidp, dr=0.5,
+                                                           copy=True)
+        self.assertEqual(res_phidp.shape, phidp.shape)
+        self.assertFalse(np.any(np.isnan(res_kdp)))
+        # sweep by sweep processing gives the same result
+        sweep_phidp, sweep_kdp = dp.process_raw_phidp_vulpiani(phidp[1, 2],
+                                                               dr=0.5,
+                                                               copy=True)
+        np.testing.assert_allclose(res_phidp[1, 2], sweep_phidp)
+        np.testing.assert_allclose(res_kdp[1, 2], sweep_kdp)
+        # float32 end to end
+        res32 = dp.process_raw_phidp_vulpiani(phidp.astype(np.float32),
+                                              dr=0.5)
+        self.assertEqual(res32[0].dtype, np.float32)
+        self.assertEqual(res32[1].dtype, np.float32)
+        np.testing.assert_allclose(res32[1], res_kdp, atol=1e-3)
+        # parallel over sweeps
+        pool = ThreadPool(2)
+        try:
+            res = dp.process_raw_phidp_vulpiani(phidp, dr=0.5, copy=True,
+                                                executor=pool)
+        finally:
+            pool.close()
+        np.testing.assert_array_equal(res[0], res_phidp)
+        np.testing.assert_array_equal(res[1], res_kdp)
 
     def test_unfold_phi_vulpiani(self):
-        pass
+        phidp = np.zeros((2, 3, 8))
+        kdp = np.zeros((2, 3, 8))
+        kdp[0, 1, [1, 3, 5]] = -30
+        kdp[1, 2, [2, 4]] = -30
+        res = dp.unfold_phi_vulpiani(phidp, kdp)
+        ref = np.zeros((2, 3, 8))
+        ref[0, 1, 5:] = 360
+        np.testing.assert_array_equal(res, ref)
 
     def test_kdp_from_phidp_finitediff(self):
         kdp_re = dp.kdp_from_phidp_finitediff(self.phidp_raw)  # noqa
@@ -30,6 +66,28 @@ class KDPFromPHIDPTest(unittest.TestCase):
         kdp_re = dp.kdp_from_phidp_linregress(self.phidp_raw)  # noqa
         pass
 
+    def test_kdp_from_phidp_linregress_window(self):
+        from scipy.stats import linregress
+        phidp = np.stack([self.phidp_raw, self.phidp_raw[::-1]])
+        kdp = dp.kdp_from_phidp_linregress(phidp, L=7, dr=0.5)
+        x = np.arange(phidp.shape[-1])
+        for beam in range(2):
+            for r in range(7, phidp.shape[-1] - 7):
+                ix = x[r - 3:r + 4]
+                valid = ix[~np.isnan(phidp[beam, ix])]
+                if len(valid) < 4:
+                    self.assertTrue(np.isnan(kdp[beam, r]))
+                else:
+                    ref = linregress(valid, phidp[beam, valid])[0]
+                    self.assertAlmostEqual(kdp[beam, r], ref, places=8)
+        # regression over the first and last window
+        ref = linregress(x[:7], phidp[0, :7])[0]
+        np.testing.assert_allclose(kdp[0, :7], ref, rtol=1e-8)
+        conv = dp.kdp_from_phidp_convolution(phidp, L=7, dr=0.5)
+        valid = ~np.isnan(kdp[:, 7:-7])
+        np.testing.assert_allclose(conv[:, 7:-7][valid], kdp[:, 7:-7][valid],
+                                   rtol=1e-8)
+
     def test_kdp_from_phidp_sobel(self):
         kdp_re = dp.kdp_from_phidp_sobel(self.phidp_raw)  # noqa
         pass
@@ -39,9 +97,95 @@ class KDPFromPHIDPTest(unittest.TestCase):
         pass
 
 
+class UnfoldPhiTest(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(42)
+        true = np.cumsum(np.random.uniform(0, 4., (2, 20, 150)), axis=-1)
+        self.phidp = ((true + 180) % 360) - 180 + \
+            np.random.normal(0, 1, true.shape)
+        self.phidp[0, 5, 100:110] = np.nan
+        self.rho = np.random.uniform(0.85, 1., true.shape)
+
+    def test_unfold_phi(self):
+        numpy = dp.unfold_phi(self.phidp, self.rho, copy=True,
+                              method='numpy')
+        naive = dp.unfold_phi(self.phidp, self.rho, copy=True,
+                              method='naive')
+        self.assertEqual(numpy.shape, self.phidp.shape)
+        self.assertEqual(numpy.dtype, np.float32)
+        self.assertTrue(np.any(numpy - self.phidp > 300))
+        np.testing.assert_allclose(numpy, naive, rtol=1e-5, atol=1e-4)
+        from wradlib import util
+        if isinstance(util.import_optional('wradlib.speedup'),
+                      util.OptionalModuleStub):
+            self.skipTest('wradlib.speedup is not available')
+        fortran = dp.unfold_phi(self.phidp, self.rho, copy=True,
+                                method='fortran')
+        np.testing.assert_array_equal(fortran, numpy)
+
+
 class TextureTest(unittest.TestCase):
     def test_texture(self):
-        pass
+        np.random.seed(42)
+        data = np.random.uniform(0, 60, (6, 8))
+        data[2, 3] = np.nan
+        data[4, 0] = np.nan
+        result = dp.texture(data)
+        ref = np.zeros(data.shape)
+        for i, j in np.ndindex(data.shape):
+            neighbors = [data[(i + di) % 6, (j + dj) % 8]
+                         for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                         if di or dj]
+            neighbors = np.array(neighbors)
+            neighbors = neighbors[~np.isnan(neighbors)]
+            ref[i, j] = np.sqrt(np.mean((data[i, j] - neighbors) ** 2))
+        np.testing.assert_allclose(result, ref, rtol=1e-10)
+
+
+class RollingTest(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(42)
+        self.data = np.random.normal(size=(3, 4, 30))
+        self.data[0, 1, 5] = np.nan
+        self.data[2, 3, 10:17] = np.nan
+        self.windows = np.array([self.data[..., i:i + 5]
+                                 for i in range(26)])
+
+    def test_rolling(self):
+        import warnings
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            for func, ref in [(dp._rolling_sum, np.nansum),
+                              (dp._rolling_mean, np.nanmean),
+                              (dp._rolling_std, np.nanstd),
+                              (dp._rolling_min, np.nanmin),
+                              (dp._rolling_max, np.nanmax),
+                              (dp._rolling_median, np.nanmedian)]:
+                np.testing.assert_allclose(
+                    func(self.data, 5),
+                    np.moveaxis(ref(self.windows, axis=-1), 0, -1),
+                    rtol=1e-10, atol=1e-12)
+        np.testing.assert_array_equal(
+            dp._rolling_count(self.data, 5),
+            np.moveaxis(np.sum(~np.isnan(self.windows), axis=-1), 0, -1))
+        std = dp._rolling_std(self.data, 5, nan=False)
+        np.testing.assert_allclose(
+            std, np.moveaxis(np.std(self.windows, axis=-1), 0, -1),
+            rtol=1e-10)
+
+    def test_medfilt_along_axis(self):
+        from scipy.signal import medfilt
+        data = np.random.uniform(size=(5, 20))
+        np.testing.assert_array_equal(dp.medfilt_along_axis(data, 5),
+                                      medfilt(data, [1, 5]))
+        np.testing.assert_array_equal(dp.medfilt_along_axis(data, 3, axis=0),
+                                      medfilt(data, [3, 1]))
+        # windows containing NaNs behave like scipy.signal.medfilt
+        data[1, 3] = data[2, 10:12] = np.nan
+        np.testing.assert_array_equal(dp.medfilt_along_axis(data, 5),
+                                      medfilt(data, [1, 5]))
+        np.testing.assert_array_equal(dp.medfilt_along_axis(data, 3, axis=0),
+                                      medfilt(data, [3, 1]))
 
 
 if __name__ == '__main__':
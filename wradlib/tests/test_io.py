@@ -36,6 +36,33 @@ class DXTest(unittest.TestCase):
     def test_readDX(self):
         pass
 
+    def test_readDX_lut(self):
+        np.random.seed(42)
+        codes = np.random.randint(0, 250, (2, 128)).astype(np.uint16)
+        codes[:, :5] = [0, 65, 120, 200, 255]
+        # clutter flag
+        codes[0, 10] |= 2 ** 15
+        raw = np.hstack([[[2 ** 13, 0, 5], [2 ** 13, 10, 5]], codes])
+        header = ('DX021205100000814BY{0:5d}VS 2CO0CD2CS0EP0.50.50.50.50.5'
+                  '0.50.50.5MS  0')
+        header = header.format(len(header.format(0)) + 1 + raw.nbytes)
+        tmp = tempfile.NamedTemporaryFile()
+        tmp.write(header.encode() + b'\x03' + raw.astype(np.uint16).tobytes())
+        tmp.flush()
+        data, attrs = wrl.io.readDX(tmp.name)
+        lut = wrl.zr.rvp2r_lookup(dtype=np.float32)
+        res, attrs = wrl.io.readDX(tmp.name, lut=lut)
+        self.assertEqual(res.dtype, np.float32)
+        np.testing.assert_array_equal(
+            res, wrl.zr.rvp2r(codes & 4095, dtype=np.float32))
+        np.testing.assert_allclose(
+            res, wrl.zr.z2r(wrl.trafo.idecibel(data)), rtol=1e-5)
+        np.testing.assert_array_equal(attrs['azim'], [0., 1.])
+        self.assertTrue(attrs['clutter'][0, 10])
+        # codes exceeding the lookup table
+        self.assertRaises(ValueError,
+                          lambda: wrl.io.readDX(tmp.name, lut=lut[:200]))
+
 
 class IOTest(unittest.TestCase):
     def test_writePolygon2Text(self):
@@ -343,6 +370,26 @@ class RadolanTest(unittest.TestCase):
                 self.assertEqual(value, test_attrs[key])
         self.assertRaises(KeyError, lambda: attrs['nodataflag'])
 
+    def test_read_RADOLAN_composite_lut(self):
+        header = ('RX021205100000814BY{0:7d}VS 3SW   2.18.3PR E+00INT   5'
+                  'GP   2x   3')
+        header = header.format(len(header.format(0)) + 1 + 6)
+        codes = np.array([0, 65, 249, 250, 120, 200], dtype=np.uint8)
+        buf = header.encode() + b'\x03' + codes.tobytes()
+        data, attrs = wrl.io.read_RADOLAN_composite(io.BytesIO(buf))
+        lut = wrl.zr.rvp2r_lookup(dtype=np.float32)
+        res, attrs = wrl.io.read_RADOLAN_composite(io.BytesIO(buf), lut=lut)
+        self.assertEqual(res.dtype, np.float32)
+        valid = data != -9999
+        np.testing.assert_array_equal(res[valid], lut[data[valid]])
+        np.testing.assert_array_equal(res[~valid], -9999)
+        np.testing.assert_array_equal(attrs['cluttermask'], [2])
+        # no RVP6 codes
+        buf = b'RW' + buf[2:]
+        self.assertRaises(ValueError,
+                          lambda: wrl.io.read_RADOLAN_composite(
+                              io.BytesIO(buf), lut=lut))
+
 
 class RainbowTest(unittest.TestCase):
     def test_read_rainbow(self):
@@ -3,7 +3,9 @@
 # Copyright (c) 2016, wradlib developers.
 # Distributed under the MIT License. See LICENSE.txt for more info.
 
+import io
 import numpy as np
+import scipy.sparse
 import wradlib.ipol as ipol
 import wradlib.georef as georef
 import unittest
@@ -90,6 +92,75 @@ class InterpolationTest(unittest.TestCase):
             ipol.cov_cau([0., 5., 10.], sill=2., rng=10., alpha=0.5, beta=1.5),
             np.array([2., 0.40202025, 0.25])))
 
+    def test_empirical_variogram(self):
+        src = np.array([[0.], [1.], [2.], [4.]])
+        vals = np.array([[0., 1.], [1., np.nan], [2., 3.], [4., 5.]])
+        lags, gamma, counts = ipol.empirical_variogram(src, vals, 2.5, nbins=2)
+        self.assertTrue(np.allclose(lags, [1., 2.]))
+        self.assertTrue(np.allclose(gamma, [0.5, 2.]))
+        self.assertTrue(np.all(counts == [2, 4]))
+
+    def test_fit_variogram(self):
+        h = np.linspace(0.5, 20., 30)
+        gamma = 0.2 + 1.3 * (1. - np.exp(-h / 4.))
+        cov_model = ipol.fit_variogram(h, gamma, model='Exp')
+        c = ipol.parse_covariogram(cov_model)
+        self.assertTrue(np.allclose(c(0.) - c(h), gamma))
+        cov_model = ipol.fit_variogram(h, gamma - 0.2, np.arange(30) + 1,
+                                       model='Mat', nugget=False)
+        self.assertTrue('Nug' not in cov_model)
+        c = ipol.parse_covariogram(cov_model)
+        self.assertTrue(np.allclose(c(0.) - c(h), gamma - 0.2))
+        self.assertRaises(ValueError, ipol.fit_variogram, h, gamma,
+                          model='Pow')
+
+    def test_Nearest_1(self):
+        """testing the basic behaviour of the Nearest class"""
+        ip = ipol.Nearest(self.src, self.trg)
+        res = ip(self.vals)
+        self.assertTrue(np.allclose(res[[0, 2, 3]],
+                                    self.vals[[0, 0, 1]]))
+        ip = ipol.Nearest(self.src, self.trg, distance_upper_bound=1.5,
+                          chunksize=2)
+        res = ip(self.vals[:, 0])
+        self.assertTrue(np.allclose(res, [1., np.nan, 1., 3.],
+                                    equal_nan=True))
+        self.assertTrue(np.allclose(ip.to_sparse().dot(self.vals[:, 0]),
+                                    res, equal_nan=True))
+
+    def test_Idw_1(self):
+        """testing the basic behaviour of the Idw class"""
+        ip = ipol.Idw(self.src, self.trg, nnearest=2)
+        res = ip(self.vals)
+        self.assertTrue(np.allclose(res, np.array([[1., 2., 3.],
+                                                   [2., 2., 2.],
+                                                   [1.2, 2., 2.8],
+                                                   [3., 2., 1.]])))
+        # additional trailing value dimensions
+        vals = np.dstack((self.vals, 2 * self.vals))
+        res3 = ip(vals)
+        self.assertEqual(res3.shape, (4, 3, 2))
+        self.assertTrue(np.allclose(res3[..., 0], res))
+        self.assertTrue(np.allclose(res3[..., 1], 2 * res))
+        # nnearest=1 defaults to nearest neighbour
+        ip = ipol.Idw(self.src, self.trg, nnearest=1)
+        self.assertTrue(np.allclose(ip(self.vals[:, 0]), [1., 1., 1., 3.]))
+
+    def test_Linear_1(self):
+        """testing the basic behaviour of the Linear class"""
+        src = np.array([[0., 0.], [4., 0.], [0., 4.], [4., 4.]])
+        trg = np.array([[0., 0.], [2., 2.], [1., 3.], [5., 0.]])
+        vals = np.array([[1., 2.], [3., 2.], [5., 2.], [7., 2.]])
+        ip = ipol.Linear(src, trg)
+        res = ip(vals)
+        self.assertTrue(np.allclose(res[:-1], np.array([[1., 2.],
+                                                        [4., 2.],
+                                                        [4.5, 2.]])))
+        self.assertTrue(np.all(np.isnan(res[-1])))
+        # repeated calls reuse the triangulation
+        res = ip(vals[:, 0], fill_value=-9999.)
+        self.assertTrue(np.allclose(res, np.array([1., 4., 4.5, -9999.])))
+
     def test_OrdinaryKriging_1(self):
         """testing the basic behaviour of the OrdinaryKriging class"""
 
@@ -101,6 +172,34 @@ class InterpolationTest(unittest.TestCase):
                                                 [1.5, 2., 2.5],
                                                 [3., 2., 1.]])))
 
+    def test_OrdinaryKriging_2(self):
+        """testing the flagging of singular kriging systems"""
+        src = np.vstack((self.src, self.src[:1]))
+        vals = np.vstack((self.vals, self.vals[:1]))
+        ip = ipol.OrdinaryKriging(src, self.trg, '1.0 Lin(2.0)', nnearest=3)
+        res = ip(vals)
+        self.assertTrue(np.all(ip.singular))
+        self.assertTrue(np.all(np.isnan(res)))
+        self.assertEqual(ip.weights.shape, (4, 4))
+        self.assertEqual(ip.estimation_variance.shape, (4,))
+
+    def test_OrdinaryKriging_3(self):
+        """testing the kriging weights of targets sharing neighbour sets"""
+        np.random.seed(42)
+        src = np.random.uniform(0., 10., (20, 2))
+        x = np.linspace(0., 10., 11)
+        trg = np.vstack([item.ravel() for item in np.meshgrid(x, x)]).T
+        ip = ipol.OrdinaryKriging(src, trg, '1.0 Exp(5.0)', nnearest=4)
+        for i in range(len(trg)):
+            matrix = ip._krig_matrix(src[ip.ix[i]])
+            rhs = ip._krig_rhs(ip.dists[i])
+            self.assertTrue(np.allclose(ip.weights[i],
+                                        np.linalg.solve(matrix, rhs)))
+        self.assertRaises(ValueError, ipol.OrdinaryKriging, src, trg,
+                          nnearest=4, distance_upper_bound=1.)
+        self.assertRaises(ValueError, ipol.ExternalDriftKriging, src, trg,
+                          nnearest=4, distance_upper_bound=1.)
+
     def test_ExternalDriftKriging_1(self):
         """testing the basic behaviour of the ExternalDriftKriging class
         with drift terms constant over multiple fields"""
@@ -144,6 +243,128 @@ class InterpolationTest(unittest.TestCase):
 
         self.assertRaises(ValueError, ip, self.vals)
 
+    def test_to_sparse(self):
+        """testing the export of the sparse interpolation operators"""
+        src = np.array([[0., 0.], [4., 0.], [0., 4.], [4., 4.], [2., 1.]])
+        trg = np.array([[0., 0.], [2., 2.], [1., 3.], [3., 1.5]])
+        vals = np.array([[1., 2.], [3., 2.], [5., 2.], [7., 2.], [3., 4.]])
+        ips = [ipol.Nearest(src, trg),
+               ipol.Idw(src, trg, nnearest=3),
+               ipol.Linear(src, trg),
+               ipol.OrdinaryKriging(src, trg, '1.0 Exp(5.0)', nnearest=3),
+               ipol.ExternalDriftKriging(src, trg, '1.0 Exp(5.0)',
+                                         nnearest=4,
+                                         src_drift=vals[:, 0],
+                                         trg_drift=np.arange(4.))]
+        for ip in ips:
+            op = ip.to_sparse()
+            self.assertEqual(op.shape, (len(trg), len(src)))
+            self.assertTrue(np.allclose(op.dot(vals), ip(vals)))
+            self.assertTrue(np.allclose(ipol.from_sparse(op)(vals),
+                                        ip(vals)))
+        # targets without neighbours yield np.nan
+        ip = ipol.Idw(src, trg + 3., nnearest=3, distance_upper_bound=1.5)
+        op = ip.to_sparse()
+        self.assertTrue(np.isnan(ip(vals)).any())
+        self.assertTrue(np.allclose(op.dot(vals), ip(vals), equal_nan=True))
+        # operators saved to file
+        f = io.BytesIO()
+        scipy.sparse.save_npz(f, op)
+        f.seek(0)
+        self.assertTrue(np.allclose(ipol.from_sparse(f)(vals), ip(vals),
+                                    equal_nan=True))
+        ip = ipol.ExternalDriftKriging(src, trg)
+        self.assertRaises(ValueError, ip.to_sparse)
+        self.assertRaises(NotImplementedError,
+                          ipol.IpolBase(src, trg).to_sparse)
+
+    def test_interpolate(self):
+        """testing the interpolation of values containing NaN"""
+        np.random.seed(42)
+        src = np.random.uniform(0., 10., (30, 2))
+        trg = np.vstack((np.random.uniform(0., 10., (50, 2)), src[:5]))
+        vals = np.random.uniform(0., 1., (30, 4))
+        vals[[0, 3, 7], 0] = np.nan
+        vals[[1, 2], 1] = np.nan
+        vals[[4], 3] = np.nan
+        for Interpolator, kwargs in [(ipol.Nearest, {}),
+                                     (ipol.Idw, {'nnearest': 4}),
+                                     (ipol.OrdinaryKriging,
+                                      {'cov': '1.0 Exp(5.0)',
+                                       'nnearest': 6})]:
+            res = ipol.interpolate(src, trg, vals, Interpolator, **kwargs)
+            self.assertEqual(res.shape, (len(trg), 4))
+            for i in range(vals.shape[1]):
+                good = np.isfinite(vals[:, i])
+                ip = Interpolator(src[good], trg, **kwargs)
+                self.assertTrue(np.allclose(res[:, i],
+                                            ip(vals[good, i]).ravel()))
+        # neighbours beyond distance_upper_bound are not used
+        src1 = np.array([[0.], [10.], [20.]])
+        vals1 = np.array([[1., 2.], [2., 2.], [3., np.nan]])
+        for Interpolator in [ipol.Nearest, ipol.Idw]:
+            res = ipol.interpolate(src1, np.array([[19.5]]), vals1,
+                                   Interpolator, distance_upper_bound=2.)
+            self.assertTrue(np.allclose(res, [[3., np.nan]], equal_nan=True))
+        # fields with many missing values are interpolated from their valid
+        # sources
+        src2 = np.random.uniform(0., 10., (100, 2))
+        vals2 = np.random.uniform(0., 1., (100, 2))
+        vals2[:60, 1] = np.nan
+        vals2[3, 0] = np.nan
+        res = ipol.interpolate(src2, trg, vals2, ipol.Idw)
+        for i in range(vals2.shape[1]):
+            good = np.isfinite(vals2[:, i])
+            self.assertTrue(np.allclose(
+                res[:, i], ipol.Idw(src2[good], trg)(vals2[good, i])))
+        # more than two dimensions
+        res = ipol.interpolate(src, trg, vals.reshape((30, 2, 2)), ipol.Idw)
+        self.assertEqual(res.shape, (len(trg), 2, 2))
+        self.assertTrue(np.allclose(
+            res.reshape((len(trg), 4)),
+            ipol.interpolate(src, trg, vals, ipol.Idw)))
+
+    def test_chunked(self):
+        np.random.seed(42)
+        src = np.random.uniform(0., 10., (30, 2))
+        trg = np.random.uniform(0., 10., (55, 2))
+        vals = np.random.uniform(0., 1., (30, 3))
+        for Interpolator, kwargs in [(ipol.Nearest, {}),
+                                     (ipol.Idw, {'nnearest': 4}),
+                                     (ipol.Linear, {}),
+                                     (ipol.OrdinaryKriging,
+                                      {'cov': '1.0 Exp(5.0)',
+                                       'nnearest': 6})]:
+            res = Interpolator.chunked(src, trg, vals, chunksize=10, **kwargs)
+            self.assertTrue(np.allclose(
+                res, Interpolator(src, trg, **kwargs)(vals), equal_nan=True))
+        out = np.zeros((55, 3), dtype='f4')
+        res = ipol.Idw.chunked(src, trg, vals, chunksize=20, out=out)
+        self.assertTrue(res is out)
+        self.assertTrue(np.allclose(out, ipol.Idw(src, trg)(vals)))
+
+    def test_PolarFiller(self):
+        np.random.seed(42)
+        shape = (36, 20)
+        filler = ipol.PolarFiller(shape, ipol.Linear)
+        data = (filler.coords[:, 0] + 2. * filler.coords[:, 1])
+        data = data.reshape(shape)
+        mask = np.random.uniform(0., 1., shape) < 0.1
+        mask[5:8, 10:13] = True
+        self.assertTrue(np.allclose(
+            filler(data, mask),
+            ipol.interpolate_polar(data, mask, ipol.Linear)))
+        # stack of sweeps given as masked array
+        stack = np.ma.array(np.stack((data, -data)),
+                            mask=np.stack((mask, mask[::-1])))
+        filled = filler(stack)
+        self.assertEqual(filled.shape, stack.shape)
+        self.assertTrue(np.allclose(filled[0], filler(data, mask)))
+        self.assertTrue(np.allclose(filled[1], filler(-data, mask[::-1])))
+        self.assertTrue(np.all(filled[~stack.mask] == stack[~stack.mask]))
+        self.assertRaises(ipol.MissingSourcesError, filler, data,
+                          np.ones(shape, dtype=bool))
+
     def test_MissingErrors(self):
         self.assertRaises(ipol.MissingSourcesError,
                           ipol.Nearest, np.array([]), self.trg)
@@ -244,6 +465,33 @@ class Regular2IrregularTest(unittest.TestCase):
                                                    self.newgrid,
                                                    order=1, prefilter=False)))
 
+    def test_cart2irregular_regular(self):
+        x = np.arange(0., 10., 0.5)
+        y = np.arange(20., 4., -0.8)
+        cartgrid = np.dstack(np.meshgrid(x, y))
+        values = 3. * cartgrid[..., 0] - 2. * cartgrid[..., 1] + 5.
+        newgrid = np.array([[1.2, 10.1], [9.5, 4.8], [0., 20.], [11., 10.]])
+        plane = 3. * newgrid[..., 0] - 2. * newgrid[..., 1] + 5.
+        for grid in [cartgrid, (x, y)]:
+            newvalues = ipol.cart2irregular_interp(grid, values, newgrid,
+                                                   method='linear')
+            self.assertTrue(np.allclose(newvalues[:3], plane[:3]))
+            self.assertTrue(np.isnan(newvalues[3]))
+        newvalues = ipol.cart2irregular_interp(cartgrid, values, newgrid,
+                                               method='nearest')
+        self.assertTrue(np.allclose(newvalues, [-12.8, 23.9, -35., 12.7]))
+        index = ipol.cart2irregular_index(cartgrid, newgrid)
+        self.assertTrue(np.allclose(index[:, 0], [12.375, 2.4]))
+        newvalues = ipol.cart2irregular_spline(cartgrid, values, None,
+                                               index=index[:, :3], order=1)
+        self.assertTrue(np.allclose(newvalues, plane[:3]))
+        self.assertRaises(ValueError, ipol.cart2irregular_index,
+                          cartgrid ** 2, newgrid)
+        self.assertRaises(ValueError, ipol.cart2irregular_interp, cartgrid,
+                          values, None, index=index, method='cubic')
+        self.assertRaises(ValueError, ipol.cart2irregular_interp, cartgrid,
+                          values, None, method='cubic')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -5,6 +5,7 @@
 import os
 import numpy as np
 import wradlib.util as util
+from scipy.spatial import cKDTree
 import unittest
 import datetime as dt
 
@@ -92,6 +93,54 @@ class HelperFunctionsTest(unittest.TestCase):
         poly = util.calculate_polynomial(data, w)
         np.testing.assert_allclose(poly, out, rtol=1e-12)
 
+    def test_query_tree(self):
+        np.random.seed(42)
+        src = np.random.uniform(0., 10., (100, 2))
+        trg = np.random.uniform(0., 10., (55, 2))
+        tree = cKDTree(src)
+        dists, ix = tree.query(trg, k=4)
+        d, i = util.query_tree(tree, trg, k=4, chunksize=10,
+                               dtype=np.float32, ix_dtype=np.int32)
+        self.assertEqual(d.dtype, np.float32)
+        self.assertEqual(i.dtype, np.int32)
+        np.testing.assert_allclose(d, dists, rtol=1e-6)
+        np.testing.assert_array_equal(i, ix)
+        d, i = util.query_tree(tree, trg, k=1, workers=2)
+        self.assertEqual(d.shape, (55,))
+        np.testing.assert_array_equal(i, ix[:, 0])
+        d, i = util.query_tree(tree, trg, k=4, distance_upper_bound=1.)
+        self.assertTrue(np.all(np.isinf(d[dists >= 1.])))
+        self.assertTrue(np.all(i[dists >= 1.] == len(src)))
+
+    def test_KDTreeRegistry(self):
+        np.random.seed(42)
+        registry = util.KDTreeRegistry(maxsize=1)
+        src = np.random.uniform(0., 10., (100, 2))
+        tree = registry.get(src)
+        self.assertTrue(registry.get(src.copy()) is tree)
+        self.assertTrue(src in registry)
+        # a second unreferenced tree evicts the least recently used one
+        registry.get(src + 1.)
+        self.assertFalse(src in registry)
+        self.assertEqual(len(registry), 1)
+        # referenced trees are kept until their owner is gone
+        owner = util.KDTreeRegistry()
+        registry.get(src, owner=owner)
+        registry.get(src + 2.)
+        self.assertTrue(src in registry)
+        del owner
+        self.assertFalse(src in registry)
+        registry.clear()
+        self.assertEqual(len(registry), 0)
+        # looking up a tree marks it as most recently used
+        registry = util.KDTreeRegistry(maxsize=2)
+        registry.get(src)
+        registry.get(src + 1.)
+        registry.get(src)
+        registry.get(src + 2.)
+        self.assertTrue(src in registry)
+        self.assertFalse(src + 1. in registry)
+
 
 # -------------------------------------------------------------------------------
 # testing the filter helper function
@@ -64,7 +64,22 @@ class VPRHelperFunctionsTest(unittest.TestCase):
 
 class CartesianVolumeTest(unittest.TestCase):
     def test_CartesianVolume(self):
-        pass
+        np.random.seed(42)
+        polcoords = np.random.uniform(-10., 10., (100, 3))
+        gridcoords = np.random.uniform(-10., 10., (50, 3))
+        data = np.random.uniform(0., 1., 100)
+        res = vpr.CartesianVolume(polcoords, gridcoords)(data)
+        vol = vpr.CartesianVolume(polcoords, gridcoords, chunksize=7)
+        self.assertTrue(np.allclose(vol(data), res))
+        out = np.empty(len(gridcoords))
+        self.assertTrue(vol(data, out=out) is out)
+        self.assertTrue(np.allclose(out, res))
+        self.assertEqual(len(vol._chunks), 0)
+        vol = vpr.CartesianVolume(polcoords, gridcoords, chunksize=7,
+                                  cache_chunks=True)
+        self.assertTrue(np.allclose(vol(data), res))
+        self.assertEqual(len(vol._chunks), 8)
+        self.assertTrue(np.allclose(vol(data), res))
 
     def test_CAPPI(self):
         pass
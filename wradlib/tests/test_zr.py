@@ -7,6 +7,7 @@ import unittest
 import wradlib.zr as zr
 import wradlib.trafo as trafo
 import numpy as np
+from scipy import ndimage
 
 
 class ZRConversionTest(unittest.TestCase):
@@ -66,6 +67,50 @@ class ZRConversionTest(unittest.TestCase):
         self.assertTrue(np.allclose(rr, res_rr))
         self.assertTrue(np.allclose(si, res_si))
 
+    def test_z2rEnhanced_nd(self):
+        np.random.seed(42)
+        z = trafo.idecibel(np.random.uniform(-10., 55., (2, 3, 12, 10)))
+        res_rr, res_si = zr.z2rEnhanced(z)
+        self.assertEqual(res_rr.shape, z.shape)
+        for i in range(2):
+            for j in range(3):
+                rr, si = zr.z2rEnhanced(z[i, j])
+                np.testing.assert_allclose(res_rr[i, j], rr)
+                np.testing.assert_allclose(res_si[i, j], si)
+        # the box sum versions of the multidimensional helpers
+        rr, si = zr._z2rEnhanced_md(z)
+        np.testing.assert_allclose(rr, zr._z2rEnhanced(z)[0])
+        rr, si = zr._z2rEnhanced_mdfilt(z[0, 0])
+        db = trafo.decibel(z[0, 0])
+        ref = ndimage.generic_filter(db, zr.z2rEsifilter, size=(3, 3))
+        ref[db >= 36.5] = -1.
+        ref[(db >= 36.5) & (db <= 44.)] = -2.
+        np.testing.assert_allclose(si, ref)
+
+    def test_rvp2r(self):
+        codes = np.arange(256, dtype=np.uint8).reshape((16, 16))
+        ref = zr.z2r(trafo.idecibel(trafo.rvp2dBZ(codes)), a=256., b=1.42)
+        np.testing.assert_array_equal(zr.rvp2r(codes, a=256., b=1.42), ref)
+        res = zr.rvp2r(codes, a=256., b=1.42, interval=300.,
+                       dtype=np.float32)
+        self.assertEqual(res.dtype, np.float32)
+        np.testing.assert_allclose(res, trafo.r2depth(ref, 300.), rtol=1e-6)
+        # tables are cached and read-only
+        table = zr.rvp2r_lookup(a=256., b=1.42)
+        self.assertIs(table, zr.rvp2r_lookup(a=256, b=1.42))
+        self.assertFalse(table.flags.writeable)
+
+    def test_rvp2rEnhanced(self):
+        np.random.seed(42)
+        codes = np.random.randint(0, 256, (2, 36, 20))
+        # reflectivities exactly at the thresholds
+        codes[:, :3] = 138
+        codes[:, 3:6] = 153
+        res_rr, res_si = zr.rvp2rEnhanced(codes)
+        rr, si = zr.z2rEnhanced(trafo.idecibel(trafo.rvp2dBZ(codes)))
+        np.testing.assert_array_equal(res_rr, rr)
+        np.testing.assert_array_equal(res_si, si)
+
 
 if __name__ == '__main__':
     unittest.main()
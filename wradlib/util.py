@@ -22,6 +22,9 @@ attributable to the other modules
    find_bbox_indices
    get_raster_origin
    calculate_polynomial
+   query_tree
+   get_tree
+   KDTreeRegistry
 
 """
 import datetime as dt
@@ -30,8 +33,13 @@ from time import mktime
 import warnings
 import functools
 import os
+import collections
+import hashlib
+import threading
+import weakref
 
 import numpy as np
+import scipy
 from scipy import interpolate
 from scipy.ndimage import filters
 from scipy.spatial import cKDTree
@@ -864,6 +872,13 @@ def _idvalid(data, isinvalid=None, minval=None, maxval=None):
     data : :class:`numpy:numpy.ndarray` of floats
     isinvalid : list of what is considered an invalid value
 
+    """
+    return np.where(_isvalid(data, isinvalid, minval, maxval))[0]
+
+
+def _isvalid(data, isinvalid=None, minval=None, maxval=None):
+    """Returns a boolean array which flags the valid entries of data, see
+    :func:`_idvalid`
     """
     if isinvalid is None:
         isinvalid = [-99., 99, -9999., -9999]
@@ -875,7 +890,7 @@ def _idvalid(data, isinvalid=None, minval=None, maxval=None):
     if maxval is not None:
         ix = np.logical_or(ix, np.ma.masked_greater(data, maxval).mask)
 
-    return np.where(np.logical_not(ix))[0]
+    return np.logical_not(ix) & np.ones(np.shape(data), dtype=bool)
 
 
 def meshgridN(*arrs):
@@ -1458,5 +1473,193 @@ def calculate_polynomial(data, w):
     return poly
 
 
+# scipy < 1.6 names the number of threads of tree queries n_jobs
+_SCIPY_VERSION = tuple(int(v) for v in scipy.__version__.split('.')[:2])
+_QUERY_WORKERS = 'workers' if _SCIPY_VERSION >= (1, 6) else 'n_jobs'
+
+
+def query_tree(tree, x, k=1, workers=1, chunksize=None, dtype=np.float64,
+               ix_dtype=np.intp, distance_upper_bound=np.inf):
+    """Query a :class:`scipy:scipy.spatial.cKDTree` for nearest neighbours
+
+    The query points are processed in chunks of `chunksize` points, and each
+    chunk is queried using `workers` threads. Distances and indices are
+    written to arrays of the requested data types, so that the temporary
+    float64 and int64 arrays of the tree query are limited to the chunk size.
+
+    .. versionadded:: 0.11.0
+
+    Parameters
+    ----------
+    tree : :class:`scipy:scipy.spatial.cKDTree`
+        the tree to query
+    x : :class:`numpy:numpy.ndarray`
+        array of shape (npoints, ndim) of points to query
+    k : int
+        number of nearest neighbours to return
+    workers : int
+        number of threads to use for each query, -1 uses all processors
+    chunksize : int
+        number of query points per chunk, defaults to all points at once
+    dtype : numpy data type
+        data type of the returned distances, e.g. np.float32
+    ix_dtype : numpy data type
+        data type of the returned indices, e.g. np.int32
+    distance_upper_bound : float
+        return only neighbours within this distance. Missing neighbours are
+        indicated with infinite distance and an index of `tree.n`.
+
+    Returns
+    -------
+    dists : :class:`numpy:numpy.ndarray`
+        distances of shape (npoints,) for k=1, (npoints, k) otherwise
+    ix : :class:`numpy:numpy.ndarray`
+        indices of the neighbours with the same shape as `dists`
+    """
+    x = np.asarray(x)
+    npoints = len(x)
+    shape = (npoints,) if k == 1 else (npoints, k)
+    dists = np.empty(shape, dtype=dtype)
+    ix = np.empty(shape, dtype=ix_dtype)
+    if chunksize is None:
+        chunksize = max(npoints, 1)
+    for start in range(0, npoints, chunksize):
+        sl = slice(start, start + chunksize)
+        dists[sl], ix[sl] = tree.query(
+            x[sl], k=k, distance_upper_bound=distance_upper_bound,
+            **{_QUERY_WORKERS: workers})
+    return dists, ix
+
+
+class KDTreeRegistry(object):
+    """Cache of :class:`scipy:scipy.spatial.cKDTree` objects keyed by the
+    content of their coordinate arrays
+
+    Trees are looked up by a hash of the coordinate values, so that
+    different consumers of the same coordinates (e.g. radar bin centroids)
+    share a single tree. Trees which are referenced by a living owner object
+    are kept, all other trees are evicted in least recently used order once
+    more than `maxsize` of them are cached.
+
+    .. versionadded:: 0.11.0
+
+    Parameters
+    ----------
+    maxsize : int
+        maximum number of unreferenced trees to keep
+
+    """
+
+    def __init__(self, maxsize=8):
+        self.maxsize = maxsize
+        self._trees = collections.OrderedDict()
+        self._refs = collections.Counter()
+        # weak references to the owners and the keys of their trees
+        self._owners = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def key(coords):
+        """Returns the registry key of a coordinate array
+
+        Parameters
+        ----------
+        coords : :class:`numpy:numpy.ndarray`
+            array of shape (npoints, ndim)
+
+        Returns
+        -------
+        key : tuple
+            shape and hash digest of the coordinate values
+        """
+        coords = np.ascontiguousarray(coords, dtype=np.float64)
+        return coords.shape, hashlib.sha1(coords.view(np.uint8)).hexdigest()
+
+    def get(self, coords, owner=None):
+        """Returns the tree for `coords`, building it if necessary
+
+        Parameters
+        ----------
+        coords : :class:`numpy:numpy.ndarray`
+            array of shape (npoints, ndim)
+        owner : object
+            if given, the tree is kept in the registry at least as long as
+            `owner` is alive
+
+        Returns
+        -------
+        tree : :class:`scipy:scipy.spatial.cKDTree`
+        """
+        coords = np.ascontiguousarray(coords, dtype=np.float64)
+        key = self.key(coords)
+        with self._lock:
+            tree = self._trees.get(key)
+            if tree is None:
+                tree = cKDTree(coords)
+                self._trees[key] = tree
+            else:
+                # mark as most recently used
+                self._trees[key] = self._trees.pop(key)
+            if owner is not None:
+                self._refs[key] += 1
+                ref = weakref.ref(owner, self._release)
+                self._owners[id(ref)] = (ref, key)
+            self._evict()
+        return tree
+
+    def _release(self, ref):
+        with self._lock:
+            _, key = self._owners.pop(id(ref))
+            self._refs[key] -= 1
+            if self._refs[key] <= 0:
+                del self._refs[key]
+            self._evict()
+
+    def _evict(self):
+        unused = [key for key in self._trees if key not in self._refs]
+        for key in unused[:max(len(unused) - self.maxsize, 0)]:
+            del self._trees[key]
+
+    def clear(self):
+        """Removes all trees which are not referenced by an owner"""
+        with self._lock:
+            for key in list(self._trees):
+                if key not in self._refs:
+                    del self._trees[key]
+
+    def __contains__(self, coords):
+        return self.key(coords) in self._trees
+
+    def __len__(self):
+        return len(self._trees)
+
+
+tree_registry = KDTreeRegistry()
+
+
+def get_tree(coords, owner=None):
+    """Returns a :class:`scipy:scipy.spatial.cKDTree` for `coords` from the
+    process-wide :class:`KDTreeRegistry`
+
+    Building the tree is skipped if a tree for coordinates with identical
+    values has been built before and is still cached.
+
+    .. versionadded:: 0.11.0
+
+    Parameters
+    ----------
+    coords : :class:`numpy:numpy.ndarray`
+        array of shape (npoints, ndim)
+    owner : object
+        if given, the tree is kept in the registry at least as long as
+        `owner` is alive
+
+    Returns
+    -------
+    tree : :class:`scipy:scipy.spatial.cKDTree`
+    """
+    return tree_registry.get(coords, owner=owner)
+
+
 if __name__ == '__main__':
     print('wradlib: Calling module <util> as main...')
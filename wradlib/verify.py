@@ -19,7 +19,6 @@ estimates to ground truth.
 """
 # site packages
 import numpy as np
-from scipy.spatial import KDTree
 from scipy import stats
 import matplotlib.pyplot as pl
 from pprint import pprint
@@ -62,6 +61,11 @@ class PolarNeighbours():
     nnear : int
         number of neighbouring radar bins you would like to find
 
+    Keyword Arguments
+    -----------------
+    **kwargs : keyword arguments of :func:`wradlib.util.query_tree`, e.g.
+        `workers` or `chunksize`
+
     Examples
     --------
 
@@ -69,7 +73,7 @@ class PolarNeighbours():
 
     """
 
-    def __init__(self, r, az, sitecoords, proj, x, y, nnear=9):
+    def __init__(self, r, az, sitecoords, proj, x, y, nnear=9, **kwargs):
         self.nnear = nnear
         self.az = az
         self.r = r
@@ -81,10 +85,12 @@ class PolarNeighbours():
         binx, biny = georef.reproject(bin_lon, bin_lat,
                                       projection_target=proj)
         self.binx, self.biny = binx.ravel(), biny.ravel()
-        # compute the KDTree
-        tree = KDTree(list(zip(self.binx, self.biny)))
+        # get the (shared) KDTree
+        tree = util.get_tree(np.column_stack((self.binx, self.biny)))
         # query the tree for nearest neighbours
-        self.dist, self.ix = tree.query(list(zip(x, y)), k=nnear)
+        self.dist, self.ix = util.query_tree(
+            tree, np.column_stack((np.ravel(x), np.ravel(y))), k=nnear,
+            **kwargs)
 
     def extract(self, vals):
         """
@@ -107,6 +107,14 @@ class CartesianVolume():
     maxrange : float
         The maximum radar range (must be the same for each elevation angle)
     Ipclass : an interpolation class from :mod:`wradlib.ipol`
+    chunksize : int
+        if given, the voxels are interpolated in chunks of this size on each
+        call instead of creating one interpolator for all voxels on
+        initialisation. This limits the memory needed for large grids.
+    cache_chunks : bool
+        if True, the interpolators of the chunks are created on the first
+        call and kept for subsequent calls. This avoids recreating them, but
+        needs as much memory as a single interpolator for all voxels.
     ipargs : keyword arguments corresponding to Ipclass
 
     Returns
@@ -118,7 +126,8 @@ class CartesianVolume():
 
     def __init__(self, polcoords, gridcoords, gridshape=None,
                  maxrange=None, minelev=None, maxelev=None,
-                 Ipclass=ipol.Idw, **ipargs):
+                 Ipclass=ipol.Idw, chunksize=None, cache_chunks=False,
+                 **ipargs):
         # TODO: rename Ipclas to ipclass
         # radar location in Cartesian coordinates
         # TODO: pass projected radar location as argument
@@ -131,15 +140,29 @@ class CartesianVolume():
                                    maxrange, minelev, maxelev)
         # create an instance of the Interpolation class
         self.trgix = np.where(np.logical_not(self.mask))
-        self.ip = Ipclass(src=polcoords, trg=gridcoords[self.trgix], **ipargs)
-
-    def __call__(self, data):
+        if chunksize is None:
+            self.ip = Ipclass(src=polcoords, trg=gridcoords[self.trgix],
+                              **ipargs)
+        else:
+            # interpolators are created chunk by chunk in __call__
+            self.ip = None
+            self.polcoords = polcoords
+            self.gridcoords = gridcoords
+            self.Ipclass = Ipclass
+            self.ipargs = ipargs
+        self.chunksize = chunksize
+        self.cache_chunks = cache_chunks
+        self._chunks = {}
+
+    def __call__(self, data, out=None):
         """Interpolates the polar data to 3-dimensional Cartesian coordinates
 
         Parameters
         ----------
         data : 1-d array of length (num radar bins in volume,)
             The length of this array must be the same as len(polcoords)
+        out : 1-d array of length (num voxels,)
+            optional output array, e.g. a :class:`numpy:numpy.memmap`
 
         Returns
         -------
@@ -147,10 +170,24 @@ class CartesianVolume():
 
         """
         # Interpolate data in 3-D
-        ipdata = np.repeat(np.nan, len(self.mask))
-        ipdata[self.trgix] = self.ip(data)
-
-        return ipdata
+        if out is None:
+            out = np.empty(len(self.mask))
+        out[self.mask] = np.nan
+        if self.ip is not None:
+            out[self.trgix] = self.ip(data)
+            return out
+        trgix = self.trgix[0]
+        for start in range(0, len(trgix), self.chunksize):
+            ix = trgix[start:start + self.chunksize]
+            ip = self._chunks.get(start)
+            if ip is None:
+                ip = self.Ipclass(src=self.polcoords, trg=self.gridcoords[ix],
+                                  **self.ipargs)
+                if self.cache_chunks:
+                    self._chunks[start] = ip
+            out[ix] = ip(data)
+
+        return out
 
     def _get_mask(self, gridcoords, polcoords=None, gridshape=None,
                   maxrange=None, minelev=None, maxelev=None):
@@ -18,12 +18,18 @@ into rainfall rates and vice versa
    z2r
    r2z
    z2rEnhanced
+   rvp2r
+   rvp2r_lookup
+   rvp2rEnhanced
 
 
 """
 import numpy as np
 import scipy.ndimage.filters as filters
-from .trafo import decibel
+from .trafo import decibel, idecibel, rvp2dBZ, r2depth
+
+# cache of lookup tables, see rvp2r_lookup
+_rvp_tables = {}
 
 
 def z2r(z, a=200., b=1.6):
@@ -116,139 +122,91 @@ def _z2rEnhanced(z):
            then, the upper line of the sum would be diffx (DIFFerences in
            X-direction), the lower line would be diffy
            (DIFFerences in Y-direction) in the code below.
-    """
-    # get the shape of the input
-    dimy = z.shape[0]
-    dimx = z.shape[1]
 
+    The shower index is computed for all pixels at once from 3x3 box sums of
+    the difference fields, the last two dimensions of z represent the image.
+    """
     # calculate the decibel values from the input
     db = decibel(z)
 
-    # set up our output arrays
+    # set up our output array
     r = np.zeros(z.shape)
-    si = np.zeros(z.shape)
-
-    # calculate difference fields in x and y direction
-    #  mainly for performance reasons, so that we can use numpy's efficient
-    #  array operations and avoid calculating a difference more than once
-    diffx = np.abs(db[:, :-1] - db[:, 1:])
-    diffy = np.abs(db[:-1, :] - db[1:, :])
 
     # if the reflectivity is larger than 44dBZ, then there is no need to
     # calculate the shower index
-    gt44 = np.where(db > 44.)
+    gt44 = db > 44.
     r[gt44] = z2r(z[gt44], a=77., b=1.9)
     # the same is true for values between 36.5 and 44 dBZ
-    bt3644 = np.where(np.logical_and(db >= 36.5, db <= 44.))
+    bt3644 = (db >= 36.5) & (db <= 44.)
     r[bt3644] = z2r(z[bt3644], a=200., b=1.6)
 
-    # now iterate over the array and look for the remaining values
-    # TODO : this could be a starting point for further optimization, if we
-    #        iterated only over the remaining pixels instead of all
-    for i in range(dimy):
-        for j in range(dimx):
-            # if the reflectivity is too high, we coped with it already
-            # so we can skip that one
-            if db[i, j] >= 36.5:
-                # just set the shower index to some impossible value so that
-                # we know that there was no calculation done here
-                si[i, j] = -1
-                # continue with the next iteration
-                continue
-            else:
-                # calculate the bounds of the region where we have to consider
-                # the respective difference
-                xmin = max(0, j - 1)
-                xmax = min(dimx, j + 1)
-                ymin = max(0, i - 1)
-                ymax = min(dimy, i + 1)
-                # in fact python is quite forgiving with upper indices
-                # ours might go one index too far, so don't try to port this
-                # to another programming language straigt away!
-                diffxcut = diffx[ymin:ymax + 1, xmin:xmax]
-                diffycut = diffy[ymin:ymax, xmin:xmax + 1]
-                # calculate the mean for the current pixel
-                mn = (np.sum(diffxcut) + np.sum(diffycut)) / \
-                     (diffxcut.size + diffycut.size)
-                # apply the three different Z/R relations
-                if mn < 3.5:
-                    r[i, j] = z2r(z[i, j], a=125., b=1.4)
-                elif mn <= 7.5:
-                    r[i, j] = z2r(z[i, j], a=200., b=1.6)
-                else:
-                    r[i, j] = z2r(z[i, j], a=320., b=1.4)
-                # save the shower index
-                si[i, j] = mn
+    # the shower index decides for the remaining pixels
+    si = _shower_index(db)
+    lt36 = ~(db >= 36.5)
+    # just set the shower index to some impossible value so that
+    # we know that there was no calculation done here
+    si[~lt36] = -1
+    # apply the three different Z/R relations
+    lt35 = lt36 & (si < 3.5)
+    bt3575 = lt36 & ~lt35 & (si <= 7.5)
+    gt75 = lt36 & ~lt35 & ~bt3575
+    r[lt35] = z2r(z[lt35], a=125., b=1.4)
+    r[bt3575] = z2r(z[bt3575], a=200., b=1.6)
+    r[gt75] = z2r(z[gt75], a=320., b=1.4)
     # return the results
     return r, si
 
 
+def _shower_index(db):
+    """Shower index (see :func:`_z2rEnhanced`) of all pixels of the decibel
+    array db, the last two dimensions representing the image.
+
+    The absolute differences along both image axes are summed over the
+    3x3 neighbourhood of each pixel and divided by the number of differences
+    available inside the image, so that fewer differences are used near the
+    edges of the image.
+    """
+    ny, nx = db.shape[-2:]
+    diffx = np.abs(np.diff(db, axis=-1))
+    diffy = np.abs(np.diff(db, axis=-2))
+    # number of differences inside the image, per row and column
+    rows = filters.correlate1d(np.ones(ny), np.ones(3), mode='constant')
+    cols = filters.correlate1d(np.ones(nx), np.ones(3), mode='constant')
+    count = (np.outer(rows, _pair_sum(np.ones(nx - 1), -1)) +
+             np.outer(_pair_sum(np.ones(ny - 1), -1), cols))
+    return _shower_sum(diffx, diffy) / count
+
+
+def _shower_sum(diffx, diffy):
+    """Sums of the x- and y-differences within the 3x3 neighbourhoods.
+    """
+    sumx = filters.correlate1d(_pair_sum(diffx, -1), np.ones(3), axis=-2,
+                               mode='constant')
+    sumy = filters.correlate1d(_pair_sum(diffy, -2), np.ones(3), axis=-1,
+                               mode='constant')
+    return sumx + sumy
+
+
+def _pair_sum(diff, axis):
+    """Sums of the (at most two) differences adjacent to each pixel along
+    axis, for the n - 1 differences between n pixels.
+    """
+    pad = [(0, 0)] * diff.ndim
+    pad[axis] = (1, 1)
+    diff = np.pad(diff, pad, mode='constant').swapaxes(axis, -1)
+    return (diff[..., :-1] + diff[..., 1:]).swapaxes(axis, -1)
+
+
 def _z2rEnhanced_md(z):
     """multidimensional version
     assuming the two last dimensions represent an image
     This version should also be a bit more performant than the original because
-    it uses less for-loops"""
-    # get the shape of the input
-    dimy = z.shape[-2]
-    dimx = z.shape[-1]
-
-    # calculate the decibel values from the input
-    db = decibel(z)
+    it uses less for-loops
 
-    # set up our output arrays
-    r = np.zeros(z.shape)
-    si = np.zeros(z.shape)
-
-    # calculate difference fields in x and y direction
-    #  mainly for performance reasons, so that we can use numpy's efficient
-    #  array operations and avoid calculating a difference more than once
-    diffx = np.abs(db[..., :, :-1] - db[..., :, 1:])
-    diffy = np.abs(db[..., :-1, :] - db[..., 1:, :])
-
-    # if the reflectivity is larger than 44dBZ, then there is no need to
-    # calculate the shower index
-    gt44 = db > 44.
-    r[gt44] = z2r(z[gt44], a=77, b=1.9)
-    si[gt44] = -1
-    # the same is true for values between 36.5 and 44 dBZ
-    bt3644 = (db >= 36.5) & (db <= 44.)
-    r[bt3644] = z2r(z[bt3644], a=200, b=1.6)
-    si[bt3644] = -1
-
-    # now iterate only over remaining pixels
-    wlt36 = np.where(db < 36.5)
-    # nlt36 = len(wlt36[0])
-    for indices in zip(*wlt36):
-        # x and y-indices
-        i = indices[-2]
-        j = indices[-1]
-        # all remaining dimensional indices
-        ridx = indices[:-2]
-        # calculate the bounds of the region where we have to consider
-        # the respective difference
-        xmin = max(0, j - 1)
-        xmax = min(dimx, j + 1)
-        ymin = max(0, i - 1)
-        ymax = min(dimy, i + 1)
-        # in fact python is quite forgiving with upper indices
-        # ours might go one index too far, so don't try to port this
-        # to another programming language straigt away!
-        diffxcut = diffx[ridx, ymin:ymax + 1, xmin:xmax]
-        diffycut = diffy[ridx, ymin:ymax, xmin:xmax + 1]
-        # calculate the mean for the current pixel
-        mn = (np.sum(diffxcut) + np.sum(diffycut)) / \
-             (diffxcut.size + diffycut.size)
-        # apply the three different Z/R relations
-        if mn < 3.5:
-            r[ridx, i, j] = z2r(z[ridx, i, j], a=125, b=1.4)
-        elif mn <= 7.5:
-            r[ridx, i, j] = z2r(z[ridx, i, j], a=200, b=1.6)
-        else:
-            r[ridx, i, j] = z2r(z[ridx, i, j], a=320, b=1.4)
-        # save the shower index
-        si[ridx, i, j] = mn
-    # return the results
-    return r, si
+    Now identical to :func:`_z2rEnhanced`, which handles any number of
+    dimensions without loops.
+    """
+    return _z2rEnhanced(z)
 
 
 def z2rEsifilter(data):
@@ -270,23 +228,20 @@ def z2rEsifilter(data):
 def _z2rEnhanced_mdfilt(z):
     """multidimensional version
     assuming the two last dimensions represent a 2-D image
-    Uses scipy.ndimage.filters.generic_filter to reduce the number of for-loops
-    even more.
+    Gives the results of scipy.ndimage.filters.generic_filter with
+    :func:`z2rEsifilter` (reflected edges), computed with box sums.
     """
-    # get the shape of the input
-    # dimy = z.shape[-2]
-    # dimx = z.shape[-1]
-
     # calculate the decibel values from the input
     db = decibel(z)
 
     # set up our output arrays
     r = np.zeros(z.shape)
-    size = list(z.shape)
-    size[-2:] = [3, 3]
-    size[:-2] = [1] * len(size[:-2])
-    size = tuple(size)
-    si = filters.generic_filter(db, z2rEsifilter, size=size)
+    # reflect the image at its edges, so that every pixel has the full
+    # 3x3 neighbourhood
+    pad = [(0, 0)] * (db.ndim - 2) + [(1, 1), (1, 1)]
+    si = _shower_index(np.pad(db, pad, mode='symmetric'))
+    si = si[..., 1:-1, 1:-1].astype(db.dtype)
+    si[~(db < 36.5)] = -1.
 
     gt44 = db > 44.
     r[gt44] = z2r(z[gt44], a=77, b=1.9)
@@ -377,14 +332,15 @@ def z2rEnhanced(z):
     three-part Z-R-relationship used by the DWD (as of 2009)
 
     To be used with polar representations so that one dimension is cyclical.
-    i.e. z should be of shape (nazimuths, nbins) --> the first dimension
-    is the cyclical one. For DWD DX-Data z's shape is (360,128).
+    i.e. z should be of shape (..., nazimuths, nbins) --> the azimuth
+    dimension is the cyclical one. For DWD DX-Data z's shape is (360,128).
 
     Parameters
     ----------
     z : a float or an array of floats
         Corresponds to reflectivity Z in mm**6/m**3
-        **must** be a 2-D array
+        **must** be an array of at least two dimensions,
+        i.e. (..., nazimuths, nbins)
 
     Returns
     -------
@@ -395,20 +351,150 @@ def z2rEnhanced(z):
         for control purposes. May be omitted in later versions
 
     """
-    # create a padded version of the input array
-    padz = np.zeros((z.shape[0] + 2, z.shape[1]))
-    # fill the center with the original data
-    padz[1:-1, :] = z
-    # add the last beam before the first one
-    padz[0, :] = z[-1, :]
-    # add the first beam after the last one
-    padz[-1, :] = z[0, :]
+    # create a padded version of the input array, the last beam is added
+    # before the first one and the first beam after the last one
+    z = np.asarray(z, dtype=np.float64)
+    padz = np.concatenate([z[..., -1:, :], z, z[..., :1, :]], axis=-2)
 
     # do the actual calculation
     padr, padsi = _z2rEnhanced(padz)
 
     # return the unpadded field
-    return padr[1:-1, :], padsi[1:-1, :]
+    return padr[..., 1:-1, :], padsi[..., 1:-1, :]
+
+
+def rvp2r_lookup(a=200., b=1.6, interval=None, dtype=np.float64):
+    """Lookup table of rain rates (or depths) for all DWD RVP6 codes.
+
+    The table holds the result of :func:`~wradlib.zr.z2r` (and
+    :func:`~wradlib.trafo.r2depth`) for the reflectivities of all 12 bit
+    RVP6 codes (see :func:`~wradlib.trafo.rvp2dBZ`), i.e. ``table[codes]``
+    converts RVP6 coded products (e.g. DX or RX) without any floating point
+    computation. Tables are cached per parameter set and read-only.
+
+    .. versionadded:: 0.11.0
+
+    Parameters
+    ----------
+    a : float
+        Parameter a of the Z/R relationship
+    b : float
+        Parameter b of the Z/R relationship
+    interval : number
+        If given, the table holds rainfall depths (mm) for this time
+        interval (s) instead of rain rates (mm/h)
+    dtype : data-type
+        data type of the table
+
+    Returns
+    -------
+    table : :func:`numpy:numpy.array`
+        of shape (4096,)
+
+    Examples
+    --------
+    >>> from wradlib.zr import rvp2r_lookup
+    >>> table = rvp2r_lookup(a=256., b=1.42)
+    >>> print(table[65])  # 0 dBZ  # doctest: +ELLIPSIS
+    0.0201...
+    """
+    key = (float(a), float(b), interval, np.dtype(dtype).str)
+    try:
+        return _rvp_tables[key]
+    except KeyError:
+        pass
+    # all 12 bit RVP6 codes
+    table = z2r(idecibel(rvp2dBZ(np.arange(4096))), a=a, b=b)
+    if interval is not None:
+        table = r2depth(table, interval)
+    table = table.astype(dtype)
+    table.flags.writeable = False
+    _rvp_tables[key] = table
+    return table
+
+
+def rvp2r(x, a=200., b=1.6, interval=None, dtype=np.float64):
+    """Conversion from DWD RVP6 codes to rain rates (or depths) by table
+    lookup.
+
+    Gives the same result as ``z2r(idecibel(rvp2dBZ(x)), a, b)`` without
+    creating floating point temporaries, see
+    :func:`~wradlib.zr.rvp2r_lookup`.
+
+    .. versionadded:: 0.11.0
+
+    Parameters
+    ----------
+    x : array of integers
+        RVP6 codes (8 or 12 bit, e.g. of DX or RX products)
+    a : float
+        Parameter a of the Z/R relationship
+    b : float
+        Parameter b of the Z/R relationship
+    interval : number
+        If given, rainfall depths (mm) for this time interval (s) are returned
+        instead of rain rates (mm/h)
+    dtype : data-type
+        data type of the output
+
+    Returns
+    -------
+    output : :func:`numpy:numpy.array`
+        of shape x.shape, rain rates in mm/h (or rainfall depths in mm)
+
+    """
+    return rvp2r_lookup(a=a, b=b, interval=interval, dtype=dtype)[x]
+
+
+def rvp2rEnhanced(x, interval=None, dtype=np.float64):
+    """Enhanced three-part Z-R-relationship of the DWD for RVP6 codes.
+
+    Gives the same result as ``z2rEnhanced(idecibel(rvp2dBZ(x)))``, the
+    rain rates are taken from lookup tables of the single Z-R relations
+    (see :func:`~wradlib.zr.rvp2r_lookup`), selected by the shower index.
+
+    .. versionadded:: 0.11.0
+
+    Parameters
+    ----------
+    x : array of integers
+        RVP6 codes of shape (..., nazimuths, nbins), the azimuth dimension
+        is the cyclical one (see :func:`~wradlib.zr.z2rEnhanced`)
+    interval : number
+        If given, rainfall depths (mm) for this time interval (s) are returned
+        instead of rain rates (mm/h)
+    dtype : data-type
+        data type of the rain rates
+
+    Returns
+    -------
+    r : array
+        r  - array of shape x.shape - calculated rain rates
+    si : array
+        si - array of shape x.shape - calculated shower index
+
+    """
+    x = np.asarray(x)
+    # the reflectivities as seen by z2rEnhanced
+    db = decibel(idecibel(rvp2dBZ(np.arange(4096))))[x]
+    paddb = np.concatenate([db[..., -1:, :], db, db[..., :1, :]], axis=-2)
+    si = _shower_index(paddb)[..., 1:-1, :]
+
+    # select the Z-R relation of each pixel, the order of the checks
+    # follows _z2rEnhanced
+    relations = [(125., 1.4), (200., 1.6), (320., 1.4), (77., 1.9)]
+    idx = np.full(x.shape, 2, dtype=np.uint8)
+    idx[si <= 7.5] = 1
+    idx[si < 3.5] = 0
+    ge36 = db >= 36.5
+    idx[ge36] = 1
+    idx[db > 44.] = 3
+    si[ge36] = -1
+
+    tables = np.vstack([rvp2r_lookup(a=a, b=b, interval=interval,
+                                     dtype=dtype)
+                        for a, b in relations])
+    return tables[idx, x], si
 
 
 if __name__ == '__main__':